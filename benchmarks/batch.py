@@ -0,0 +1,73 @@
+"""
+    Compares running many games of dummy players one at a time with the FastDealer to running them in lockstep with
+    the BatchSimulation.
+
+    Every game uses its own shuffle of the deck, chosen with a fixed seed. Both variants play the same games and
+    must reach the same rankings. Requires NumPy.
+
+    Usage: python3 benchmarks/batch.py [--games N] [--players N] [--seed N]
+    Prints a JSON object with the time of each variant and how often each seat won.
+
+"""
+
+import os
+import sys
+import json
+import time
+
+from argparse import ArgumentParser
+
+import numpy as np
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+sys.path.insert(0, PROJECT_ROOT)
+
+from evolution.dealer.batch_simulation import BatchSimulation
+from evolution.dealer.fast_dealer import FastDealer, CARDS
+from evolution.player.fast_dummy_player import FastDummyPlayer
+
+
+def run_fast_dealers(decks, players):
+    """ Runs one game per deck with the FastDealer
+    :return: list of rankings
+    """
+    rankings = []
+    for deck in decks:
+        dealer = FastDealer()
+        dealer.add_external_players([FastDummyPlayer() for _ in range(players)])
+        dealer.run_game(deck)
+        rankings.append(list(dealer.ranking()))
+    return rankings
+
+
+def main(games, players, seed):
+    rng = np.random.default_rng(seed)
+    decks = np.array([rng.permutation(len(CARDS)) for _ in range(games)])
+
+    start = time.perf_counter()
+    simulation = BatchSimulation(games, players, decks)
+    simulation.run()
+    batch = time.perf_counter() - start
+
+    start = time.perf_counter()
+    rankings = run_fast_dealers(decks.tolist(), players)
+    fast = time.perf_counter() - start
+
+    assert rankings == [simulation.ranking(game) for game in range(games)], \
+        "batch simulation differs from the FastDealer"
+
+    wins = np.bincount(simulation.winners(), minlength=players + 1)[1:]
+    results = {"games": games, "players": players, "fast_dealer": fast, "batch": batch, "speedup": fast / batch,
+               "wins": {idx + 1: int(count) for idx, count in enumerate(wins)}}
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser(description="Benchmarks the FastDealer and the BatchSimulation")
+    parser.add_argument("--games", type=int, default=2000, help="number of games")
+    parser.add_argument("--players", type=int, default=5, help="number of players per game")
+    parser.add_argument("--seed", type=int, default=4500, help="seed for the decks")
+    args = parser.parse_args()
+
+    main(args.games, args.players, args.seed)
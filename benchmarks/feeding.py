@@ -0,0 +1,113 @@
+"""
+    Compares the feeding step with feeding choices computed from scratch on every feed1 to the feeding step with
+    the incremental FeedingEngine.
+
+    The boards are dense 8-player configurations: every player owns MAX_SPECIES species with random traits,
+    body, population and food, chosen with a fixed seed. Both variants run the same feeding steps from the same
+    configurations and must end in the same state. The dealers are built before every repetition and are not part
+    of the timings.
+
+    Most of the time of a feeding step goes to the DummyPlayers, which decode the whole State sent to them every
+    time they have to choose a feeding; with remote players, that time is spent by the clients. Every dealer is
+    instrumented, see instrumentation.py, and the time of the calls to the players is subtracted from the time of
+    the feedings to get the time spent by the dealer itself, which is what the FeedingEngine reduces.
+
+    Usage: python3 benchmarks/feeding.py [--boards N] [--repeat N] [--seed N]
+    Prints a JSON object with, for each variant, the best time of the feeding steps and of the dealer's share of
+    them over the repetitions.
+
+"""
+
+import os
+import sys
+import json
+import random
+import time
+
+from argparse import ArgumentParser
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+sys.path.insert(0, PROJECT_ROOT)
+
+from evolution.common.instrumentation import Instrumentation, EXTERNAL_PLAYER_CALL, FEED1
+from evolution.dealer.dealer import Dealer
+from evolution.player.player import Player
+from evolution.random_states import random_species
+
+
+PLAYERS = 8
+MAX_SPECIES = 7
+WATERING_HOLE = 60
+
+
+def dense_configuration(rng):
+    """ Returns a Configuration with PLAYERS players owning MAX_SPECIES species each """
+    players = [Player(idx + 1, species=[random_species(rng, hungry=True) for _ in range(MAX_SPECIES)])
+               for idx in range(PLAYERS)]
+    return Dealer(players, WATERING_HOLE).serialize()
+
+
+def instrumented_dealers(configurations, incremental_feeding):
+    """ Builds the dealers of the given configurations
+    :param configurations: list of Configurations
+    :param incremental_feeding: whether the Dealers use the FeedingEngine
+    :return: list of Dealers, each with an Instrumentation of its own
+    """
+    dealers = []
+    for configuration in configurations:
+        dealer = Dealer.deserialize(configuration)
+        dealer.incremental_feeding = incremental_feeding
+        dealer.instrument(Instrumentation())
+        dealers.append(dealer)
+    return dealers
+
+
+def run_feeding_steps(dealers):
+    """ Runs the feeding step of every dealer
+    :param dealers: list of Dealers
+    :return: (seconds taken by the feeding steps, seconds spent by the dealers themselves in the feedings) tuple
+    """
+    start = time.perf_counter()
+    for dealer in dealers:
+        dealer.feeding_step()
+    seconds = time.perf_counter() - start
+
+    microseconds = 0
+    for dealer in dealers:
+        histograms = dealer.instrumentation.histograms
+        external = histograms.get(EXTERNAL_PLAYER_CALL)
+        microseconds += histograms[FEED1].total - (external.total if external is not None else 0)
+    return seconds, microseconds / 1000000
+
+
+def main(boards, repeat, seed):
+    rng = random.Random(seed)
+    configurations = [dense_configuration(rng) for _ in range(boards)]
+
+    final = {}
+    for incremental_feeding in [False, True]:
+        dealers = instrumented_dealers(configurations, incremental_feeding)
+        run_feeding_steps(dealers)
+        final[incremental_feeding] = [dealer.serialize() for dealer in dealers]
+    assert final[False] == final[True], "incremental feeding step differs from the full feeding step"
+
+    results = {"boards": boards, "players": PLAYERS, "species": MAX_SPECIES, "repeat": repeat}
+    for name, incremental_feeding in [("full", False), ("incremental", True)]:
+        times = [run_feeding_steps(instrumented_dealers(configurations, incremental_feeding)) for _ in range(repeat)]
+        results[name] = min(seconds for seconds, _ in times)
+        results[name + "_dealer"] = min(dealer for _, dealer in times)
+    results["speedup"] = results["full"] / results["incremental"]
+    results["dealer_speedup"] = results["full_dealer"] / results["incremental_dealer"]
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser(description="Benchmarks the full and incremental feeding step")
+    parser.add_argument("--boards", type=int, default=20, help="number of configurations")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions")
+    parser.add_argument("--seed", type=int, default=4500, help="seed for the configurations")
+    args = parser.parse_args()
+
+    main(args.boards, args.repeat, args.seed)
@@ -0,0 +1,159 @@
+"""
+    Measures the memory allocated for the core model objects of an 8-player late-game state.
+
+    The state is taken from a game of DummyPlayers, at the beginning of the feeding of the turn with the most
+    species on the boards. DummyPlayers play all their cards, so every player is given the hand it would be dealt at
+    the beginning of a turn, drawn from the deck, which keeps some cards. Every measurement builds objects while
+    tracemalloc is tracing and reports the memory retained by them and the number of live allocations, once with the
+    slotted model classes and once with equivalent objects that keep their attributes in a per-instance __dict__, as
+    the classes did before.
+
+    Usage: python3 benchmarks/memory.py
+    Prints a JSON object with the measurements.
+
+"""
+
+import os
+import sys
+import json
+import tracemalloc
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+sys.path.insert(0, PROJECT_ROOT)
+
+from evolution.data_definitions import DataDefinitions
+from evolution.dealer.dealer import Dealer
+from evolution.dealer.deck import Deck
+from evolution.player.dummy_player import DummyPlayer
+
+
+PLAYERS = 8
+
+
+def deal_hands(configuration):
+    """ Returns the given Configuration with every player holding the cards it is dealt at the beginning of a turn,
+      drawn from the deck
+    :param configuration: Configuration
+    :return: Configuration
+    """
+    dealer = Dealer.deserialize(configuration)
+    for player in dealer.players:
+        player.add_cards(dealer.deal_cards(dealer.num_cards_to_deal(player)))
+    return dealer.serialize()
+
+
+def late_game_configuration(players=PLAYERS):
+    """ Plays a game of DummyPlayers and returns the Configuration at the beginning of the feeding of the turn
+      with the most species on the boards whose deck can deal a hand to every player and keep some cards, with
+      these hands dealt, see deal_hands
+    :param players: number of players
+    :return: Configuration
+    """
+    dealer = Dealer()
+    dealer.add_external_players([DummyPlayer(idx + 1) for idx in range(players)])
+    dealer.deck = Deck(sorted(DataDefinitions.deck()))
+
+    best, best_species = None, -1
+    while dealer.players and sum(dealer.num_cards_to_deal(p) for p in dealer.players) <= len(dealer.deck):
+        dealer.step1()
+        for player_idx, actions in enumerate(dealer.step2_3()):
+            dealer.apply_actions(player_idx, actions)
+        dealer.auto_traits()
+
+        species = sum(len(p.species) for p in dealer.players)
+        hands = sum(dealer.num_cards_to_deal(p) for p in dealer.players)
+        if species >= best_species and hands < len(dealer.deck):
+            best, best_species = deal_hands(dealer.serialize()), species
+
+        dealer.feeding_step()
+        dealer.end_turn()
+        dealer.players = dealer.players[1:] + dealer.players[:1]
+
+    return best
+
+
+class DictObject:
+    """ Object with a per-instance __dict__, holding the same attributes as a slotted object """
+
+    def __init__(self, slotted):
+        for cls in type(slotted).__mro__:
+            for attribute in getattr(cls, "__slots__", ()):
+                setattr(self, attribute, getattr(slotted, attribute))
+
+
+def measure(build):
+    """ Measures the memory retained by the objects returned by build
+    :param build: function without arguments returning the objects to measure
+    :return: {"bytes": Natural, "allocations": Natural}
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        objects = build()
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    statistics = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in statistics)
+    count = sum(stat.count_diff for stat in statistics)
+    del objects
+    return {"bytes": size, "allocations": count}
+
+
+def model_objects(configuration):
+    """ Returns a function building all Species and TraitCards of the given configuration as the DummyPlayers do
+      in update_state, plus all fat tissue feedings including suboptimal ones
+    :param configuration: Configuration
+    """
+    dealer = Dealer.deserialize(configuration)
+    player_states = [player.to_player_state() for player in dealer.players]
+
+    def build():
+        players = []
+        for player_state in player_states:
+            external = DummyPlayer()
+            external.update_state(player_state)
+            players.append(external)
+        feedings = [p.get_possible_fat_tissue_feedings(dealer.watering_hole or 1, include_suboptimal=True)
+                    for p in players]
+        return [(p.species, p.cards) for p in players], feedings
+
+    return build
+
+
+def as_dict_objects(build):
+    """ Returns a function building the same objects as build, converted to DictObjects """
+    def build_dict():
+        species_cards, feedings = build()
+        converted = ([([DictObject(s) for s in species], [DictObject(c) for c in cards])
+                      for species, cards in species_cards],
+                     [[DictObject(f) for f in fs] for fs in feedings])
+        del species_cards, feedings
+        return converted
+
+    return build_dict
+
+
+def main():
+    configuration = late_game_configuration()
+    dealer = Dealer.deserialize(configuration)
+
+    build = model_objects(configuration)
+    slotted = measure(build)
+    with_dict = measure(as_dict_objects(build))
+
+    results = {
+        "players": len(dealer.players),
+        "species": sum(len(p.species) for p in dealer.players),
+        "cards": sum(len(p.cards) for p in dealer.players),
+        "deck": len(dealer.deck),
+        "slots": slotted,
+        "dict": with_dict,
+        "reduction": 1 - slotted["bytes"] / with_dict["bytes"] if with_dict["bytes"] else 0,
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
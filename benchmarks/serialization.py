@@ -0,0 +1,88 @@
+"""
+    Compares full games with the serialization of every species built on every call to full games with the
+    serialized species cached until they change.
+
+    Every game is played by 8 dummy players through Dealer.run_game. Both variants play the same games, the cached
+    variant must end in the same state.
+
+    Usage: python3 benchmarks/serialization.py [--games N] [--repeat N]
+    Prints a JSON object with the best time of each variant over the repetitions and the number of serializations
+    answered from the cache.
+
+"""
+
+import os
+import sys
+import json
+import timeit
+
+from argparse import ArgumentParser
+from unittest.mock import patch
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+sys.path.insert(0, PROJECT_ROOT)
+
+from evolution.common.species import Species
+from evolution.dealer.dealer import Dealer
+from evolution.player.dummy_player import DummyPlayer
+
+
+PLAYERS = 8
+
+
+def run_games(games):
+    """ Plays the given number of games
+    :return: Configurations of the dealers at the end of the games
+    """
+    configurations = []
+    for _ in range(games):
+        dealer = Dealer()
+        dealer.add_external_players([DummyPlayer() for _ in range(PLAYERS)])
+        dealer.run_game()
+        configurations.append(dealer.serialize())
+    return configurations
+
+
+def count_cache_hits(games):
+    """ Plays the given number of games, counting the calls to Species.serialize
+    :return: (calls, calls answered from the cache) tuple
+    """
+    serialize = Species.serialize
+    counts = [0, 0]
+
+    def counting_serialize(species):
+        counts[0] += 1
+        counts[1] += species._serialized_version == species.version
+        return serialize(species)
+
+    with patch.object(Species, "serialize", counting_serialize):
+        run_games(games)
+    return tuple(counts)
+
+
+def main(games, repeat):
+    with patch.object(Species, "serialize", Species.build_json):
+        uncached = run_games(games)
+    assert run_games(games) == uncached, "cached serialization changed the games"
+
+    results = {"games": games, "players": PLAYERS, "repeat": repeat}
+    with patch.object(Species, "serialize", Species.build_json):
+        results["uncached"] = min(timeit.repeat(lambda: run_games(games), number=1, repeat=repeat))
+    results["cached"] = min(timeit.repeat(lambda: run_games(games), number=1, repeat=repeat))
+    results["speedup"] = results["uncached"] / results["cached"]
+
+    calls, hits = count_cache_hits(games)
+    results["serialize_calls"] = calls
+    results["cache_hits"] = hits
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser(description="Benchmarks full games with and without the species serialization cache")
+    parser.add_argument("--games", type=int, default=20, help="number of games per repetition")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions")
+    args = parser.parse_args()
+
+    main(args.games, args.repeat)
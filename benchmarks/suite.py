@@ -0,0 +1,293 @@
+"""
+    Times the main operations of the game engine, to track their performance from one release to the next.
+
+    The cases are:
+
+        run_game_N              complete games of N dummy players, for N from 3 to 8
+        feeding_step            feeding steps on dense 8-player boards, see feeding.py; the dealers are built
+                                before the timings, the timings include the dummy players decoding the State
+                                sent to them when they have to choose a feeding
+        actions_validate        Actions.validate of random actions using large hands of cards
+        carnivore_feedings      get_possible_carnivore_feedings of a player whose species are all hungry carnivores,
+                                against 7 other players, every player owning MAX_SPECIES species
+        serialize_round_trip    Dealer.deserialize and Dealer.serialize of late-game 8-player Configurations, see
+                                memory.py
+
+    All inputs are built with a fixed seed. Every case is timed over the given number of repetitions and the
+    results are written to a JSON file with the Python version, so that the results of two releases can be
+    compared; with --baseline, every case is compared to the same case in an earlier results file.
+
+    Inputs that are modified by a case, such as the dealers of the feeding steps, are built before every repetition
+    and are not part of the timings.
+
+    With --profile, every case runs once under cProfile instead and the functions taking the most time are printed.
+
+    Usage: python3 benchmarks/suite.py [--cases NAME ...] [--repeat N] [--seed N] [--output FILE] [--baseline FILE]
+           python3 benchmarks/suite.py --profile [--cases NAME ...] [--top N] [--sort KEY]
+    Prints a JSON object with the best time of every case over the repetitions, and the time per operation.
+
+"""
+
+import os
+import sys
+import json
+import random
+import time
+import cProfile
+import platform
+import pstats
+
+from argparse import ArgumentParser
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+sys.path.insert(0, PROJECT_ROOT)
+
+from evolution.common.actions import Actions, GrowPopulation, GrowBody, BoardTransfer, ReplaceTrait
+from evolution.common.species import Species
+from evolution.common.trait import Trait
+from evolution.data_definitions import DataDefinitions
+from evolution.dealer.dealer import Dealer
+from evolution.player.dummy_player import DummyPlayer
+from evolution.player.player import Player
+from evolution.random_states import random_species
+
+from feeding import dense_configuration, MAX_SPECIES, PLAYERS
+from memory import late_game_configuration
+
+
+# number of cards in the hands of the actions_validate case
+HAND_SIZE = 40
+
+
+class Case:
+    """ A timed operation: a function that performs a given number of operations, on inputs that are built anew
+      before every call and outside of the timed region if the operations modify them
+    """
+
+    def __init__(self, name, function, operations, setup=None, **parameters):
+        """
+        :param name: name of the case
+        :param function: function performing the operations, called with the result of setup if given, else with
+                         no arguments
+        :param operations: number of operations performed by one call of the function
+        :param setup: function of no arguments building the inputs of one call of the function, or None
+        :param parameters: description of the inputs, reported with the results
+        """
+        self.name = name
+        self.function = function
+        self.operations = operations
+        self.setup = setup
+        self.parameters = parameters
+
+    def arguments(self):
+        """ Returns the arguments of the next call of the function """
+        return (self.setup(),) if self.setup is not None else ()
+
+    def time(self, repeat):
+        """ Times the function
+        :param repeat: number of repetitions
+        :return: JSON-compatible dictionary with the best and median time of a call in seconds and the best time
+                 per operation in microseconds
+        """
+        times = []
+        for _ in range(repeat):
+            arguments = self.arguments()
+            start = time.perf_counter()
+            self.function(*arguments)
+            times.append(time.perf_counter() - start)
+        times.sort()
+        return dict(
+            self.parameters,
+            operations=self.operations,
+            best=times[0],
+            median=times[len(times) // 2],
+            per_operation_us=1000000 * times[0] / self.operations,
+        )
+
+
+def run_game_case(players, games):
+    """ Complete games of dummy players """
+    def run_games():
+        for _ in range(games):
+            dealer = Dealer()
+            dealer.add_external_players([DummyPlayer() for _ in range(players)])
+            dealer.run_game()
+
+    return Case("run_game_{}".format(players), run_games, games, players=players)
+
+
+def feeding_step_case(rng, boards):
+    """ Feeding steps on dense boards """
+    configurations = [dense_configuration(rng) for _ in range(boards)]
+
+    def dealers():
+        return [Dealer.deserialize(configuration) for configuration in configurations]
+
+    def feeding_steps(dealers):
+        for dealer in dealers:
+            dealer.feeding_step()
+
+    return Case("feeding_step", feeding_steps, boards, setup=dealers, players=PLAYERS, species=MAX_SPECIES)
+
+
+def random_actions(rng, player):
+    """ Returns random Actions with indices in range for the given player, using up to all of its cards """
+    cards = list(range(len(player.cards)))
+    rng.shuffle(cards)
+    cards = cards[:rng.randint(1, len(cards))]
+    species = len(player.species)
+
+    discard = cards.pop()
+    board_transfer, grow_population, grow_body, replace_trait = [], [], [], []
+    while cards:
+        kind = rng.randrange(4)
+        if kind == 0 or not species:
+            traits = [cards.pop() for _ in range(min(len(cards), rng.randint(0, Species.MAXIMUM_TRAITS)))]
+            if cards:
+                board_transfer.append(BoardTransfer(cards.pop(), traits))
+                species += 1
+        elif kind == 1:
+            grow_population.append(GrowPopulation(rng.randrange(species), cards.pop()))
+        elif kind == 2:
+            grow_body.append(GrowBody(rng.randrange(species), cards.pop()))
+        else:
+            replace_trait.append(ReplaceTrait(rng.randrange(species), rng.randrange(Species.MAXIMUM_TRAITS),
+                                              cards.pop()))
+    return Actions(discard, grow_population, grow_body, board_transfer, replace_trait)
+
+
+def actions_validate_case(rng, players):
+    """ Actions.validate of random actions of players with large hands """
+    deck = DataDefinitions.deck()
+    inputs = []
+    for _ in range(players):
+        player = Player(1, species=[random_species(rng, hungry=True) for _ in range(MAX_SPECIES)], cards=rng.sample(deck, HAND_SIZE))
+        inputs.append((player, random_actions(rng, player)))
+
+    def validate():
+        for player, actions in inputs:
+            actions.validate(player)
+
+    valid = sum(actions.validate(player) for player, actions in inputs)
+    return Case("actions_validate", validate, players, cards=HAND_SIZE, species=MAX_SPECIES, valid=valid)
+
+
+def carnivore_feedings_case(rng, boards):
+    """ get_possible_carnivore_feedings with every species of the feeding player a hungry carnivore """
+    inputs = []
+    for _ in range(boards):
+        dealer = Dealer.deserialize(dense_configuration(rng))
+        attacker, others = dealer.players[0], dealer.players[1:]
+        for species in attacker.species:
+            if not species.is_carnivore():
+                traits = species.traits[:Species.MAXIMUM_TRAITS - 1]
+                species.traits = traits + [Trait.CARNIVORE]
+        inputs.append((attacker, others))
+
+    def carnivore_feedings():
+        for attacker, others in inputs:
+            attacker.get_possible_carnivore_feedings(others + [attacker])
+
+    feedings = sum(len(attacker.get_possible_carnivore_feedings(others + [attacker])) for attacker, others in inputs)
+    return Case("carnivore_feedings", carnivore_feedings, boards, players=PLAYERS, species=MAX_SPECIES,
+                feedings=feedings)
+
+
+def serialize_round_trip_case(configurations):
+    """ Dealer.deserialize followed by Dealer.serialize """
+    configuration = late_game_configuration()
+    assert Dealer.deserialize(configuration).serialize() == configuration, "round trip changed the configuration"
+
+    def round_trips():
+        for _ in range(configurations):
+            Dealer.deserialize(configuration).serialize()
+
+    species = sum(len(player[1][1]) for player in configuration[0])
+    return Case("serialize_round_trip", round_trips, configurations, players=len(configuration[0]), species=species,
+                deck=len(configuration[2]))
+
+
+def build_cases(seed, scale):
+    """ Builds all cases
+    :param seed: seed for the random inputs
+    :param scale: multiplies the number of operations of every case
+    :return: list of Cases
+    """
+    rng = random.Random(seed)
+    cases = [run_game_case(players, 5 * scale) for players in range(Dealer.CONFIGURATION_PLAYERS_MIN,
+                                                                    Dealer.CONFIGURATION_PLAYERS_MAX + 1)]
+    cases.append(feeding_step_case(rng, 5 * scale))
+    cases.append(actions_validate_case(rng, 200 * scale))
+    cases.append(carnivore_feedings_case(rng, 20 * scale))
+    cases.append(serialize_round_trip_case(20 * scale))
+    return cases
+
+
+def compare(results, baseline):
+    """ Adds the ratio of the best time of every case to the best time of the same case in the baseline
+      Effect: sets "baseline_ratio" in the results of the cases found in the baseline, above 1 is slower
+    :param results: results of this run
+    :param baseline: results of an earlier run
+    """
+    for name, result in results["cases"].items():
+        previous = baseline.get("cases", {}).get(name)
+        if previous is not None and previous.get("operations") == result["operations"]:
+            result["baseline_ratio"] = result["best"] / previous["best"]
+
+
+def profile(cases, top, sort):
+    """ Runs every case once under cProfile and prints the functions taking the most time
+    :param cases: list of Cases
+    :param top: number of functions to print per case
+    :param sort: pstats sort key
+    """
+    for case in cases:
+        arguments = case.arguments()
+        profiler = cProfile.Profile()
+        profiler.runcall(case.function, *arguments)
+        print("=== {} ===".format(case.name))
+        pstats.Stats(profiler, stream=sys.stdout).strip_dirs().sort_stats(sort).print_stats(top)
+
+
+def main(cases, repeat, seed, scale, output, baseline):
+    results = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "seed": seed,
+        "scale": scale,
+        "repeat": repeat,
+        "cases": {case.name: case.time(repeat) for case in cases},
+    }
+    if baseline is not None:
+        with open(baseline) as f:
+            compare(results, json.load(f))
+
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser(description="Benchmarks the main operations of the game engine")
+    parser.add_argument("--cases", nargs="+", help="names of the cases to run, all by default")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions")
+    parser.add_argument("--seed", type=int, default=4500, help="seed for the inputs")
+    parser.add_argument("--scale", type=int, default=1, help="multiplies the number of operations of every case")
+    parser.add_argument("--output", default="benchmark-results.json", help="file to write the results to")
+    parser.add_argument("--baseline", help="results file of an earlier run to compare to")
+    parser.add_argument("--profile", action="store_true", help="profile every case once instead of timing it")
+    parser.add_argument("--top", type=int, default=15, help="number of functions printed per profiled case")
+    parser.add_argument("--sort", default="tottime", help="pstats sort key of the profiled functions")
+    args = parser.parse_args()
+
+    all_cases = build_cases(args.seed, args.scale)
+    unknown = set(args.cases or []) - {case.name for case in all_cases}
+    if unknown:
+        parser.error("unknown cases: {}".format(", ".join(sorted(unknown))))
+    selected = [case for case in all_cases if not args.cases or case.name in args.cases]
+
+    if args.profile:
+        profile(selected, args.top, args.sort)
+    else:
+        main(selected, args.repeat, args.seed, args.scale, args.output, args.baseline)
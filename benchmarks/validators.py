@@ -0,0 +1,73 @@
+"""
+    Compares the data definitions checked with the generic unpack interpreter to the compiled data definitions.
+
+    The inputs are the Configurations of the xstep test harness, with the players and species they contain, and the
+    Action4s of the xstep4 test harness. Both variants must accept and reject the same inputs.
+
+    Usage: python3 benchmarks/validators.py [--number N] [--repeat N]
+    Prints a JSON object with the best time of each variant over the repetitions, per data definition.
+
+"""
+
+import os
+import sys
+import glob
+import json
+import timeit
+
+from argparse import ArgumentParser
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+sys.path.insert(0, PROJECT_ROOT)
+
+from evolution.data_definitions import DataDefinitions
+
+
+HARNESSES = os.path.join(PROJECT_ROOT, "test_harnesses")
+
+
+def load_inputs(harness):
+    """ Returns the inputs of the tests of the given harness """
+    inputs = []
+    for path in sorted(glob.glob(os.path.join(HARNESSES, harness, "*-in.json"))):
+        with open(path) as f:
+            inputs.append(json.load(f))
+    return inputs
+
+
+def main(number, repeat):
+    configurations = load_inputs("xstep_tests")
+    players = [player for configuration in configurations for player in configuration[0]]
+    species = [s for player in players for s in player[1][1]]
+    action4s = [action4 for _, step4 in load_inputs("xstep4_tests") for action4 in step4]
+
+    cases = [
+        ("dealer", configurations, DataDefinitions.interpret_dealer, DataDefinitions.dealer),
+        ("player", players, DataDefinitions.interpret_player, DataDefinitions.player),
+        ("species", species, DataDefinitions.interpret_species, DataDefinitions.species),
+        ("action4", action4s, DataDefinitions.interpret_action4, DataDefinitions.action4),
+    ]
+
+    results = {"number": number, "repeat": repeat}
+    for name, values, interpreted, compiled in cases:
+        assert [interpreted(v) for v in values] == [compiled(v) for v in values], \
+            "compiled {} differs from the interpreted definition".format(name)
+
+        result = {"inputs": len(values)}
+        for variant, predicate in [("interpreted", interpreted), ("compiled", compiled)]:
+            times = timeit.repeat(lambda: [predicate(v) for v in values], number=number, repeat=repeat)
+            result[variant] = min(times)
+        result["speedup"] = result["interpreted"] / result["compiled"]
+        results[name] = result
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser(description="Benchmarks the interpreted and compiled data definitions")
+    parser.add_argument("--number", type=int, default=20, help="number of passes over the inputs per repetition")
+    parser.add_argument("--repeat", type=int, default=5, help="number of repetitions")
+    args = parser.parse_args()
+
+    main(args.number, args.repeat)
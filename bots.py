@@ -0,0 +1,57 @@
+"""
+    Runs many Evolution bots against a server from one process, e.g. to load-test a long-running server.
+    Every bot connects, signs up and plays the given number of games with its own player, all bots share one event
+    loop, see BotHost. Prints the games, number of messages and message latencies of every bot as JSON.
+"""
+
+import json
+
+from argparse import ArgumentParser
+
+from evolution.dealer.bot_host import Bot, BotHost
+from evolution.player.dummy_player import DummyPlayer
+from evolution.player.strategy_player import StrategyPlayer
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 45679
+
+FACTORIES = {
+    "dummy": DummyPlayer,
+    "strategy": StrategyPlayer,
+}
+
+
+def main(host, port, bots, player, games, binary, delta):
+    """ Runs the given number of bots against an Evolution server on the given host/port and prints their reports.
+    :param host: evolution host
+    :param port: evolution port
+    :param bots: number of bots
+    :param player: key of FACTORIES, the strategy of the bots
+    :param games: number of games every bot plays
+    :param binary: if true, the bots use the binary encoding
+    :param delta: if true, the bots receive delta updates with feed_next
+    """
+    factory = FACTORIES[player]
+    bots = [Bot("{}{}".format(player, i), factory(i + 1), games, binary, delta) for i in range(bots)]
+    bot_host = BotHost(host, port, bots)
+    print(json.dumps(bot_host.run(), indent=2))
+
+
+def parse_args():
+    """ Parses command-line arguments. """
+    parser = ArgumentParser(description="Runs many Evolution bots in one process against the given server")
+    parser.add_argument("-i", "--host", help="server host to connect to", default=DEFAULT_HOST)
+    parser.add_argument("-p", "--port", help="server port to connect to", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-n", "--bots", help="number of bots", type=int, default=24)
+    parser.add_argument("--player", help="strategy of the bots", choices=sorted(FACTORIES), default="dummy")
+    parser.add_argument("-g", "--games", help="number of games every bot plays", type=int, default=1)
+    parser.add_argument("-b", "--binary", help="use the binary encoding instead of JSON", action="store_true")
+    parser.add_argument("-d", "--delta", help="receive only the changes of the state during a turn",
+                        action="store_true")
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    main(args.host, args.port, args.bots, args.player, args.games, args.binary, args.delta)
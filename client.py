@@ -1,13 +1,15 @@
 """
     Implements an Evolution client with the silly player strategy.
     The client connects to an evolution server on the given host and port and listens for, processes and
-    responds to messages.
+    responds to messages. With --persistent, the client keeps playing game after game over the same connection,
+    reconnecting when the connection is lost, see PersistentClient.
 """
 
 import socket
 
 from argparse import ArgumentParser
 
+from evolution.dealer.persistent_client import PersistentClient
 from evolution.dealer.remote_dealer import RemoteDealer
 from evolution.player.dummy_player import DummyPlayer
 
@@ -17,11 +19,13 @@ DEFAULT_PORT = 45679
 HELLO_MESSAGE = "hi"
 
 
-def main(host, port):
+def main(host, port, binary=False, delta=False):
     """ Connects to an Evolution server on the given host/port, performs the sign up sequence and
       then continuously listens for messages from the server and responds accordingly.
     :param host: evolution host
     :param port: evolution port
+    :param binary: if true, asks the server to use the binary encoding
+    :param delta: if true, asks the server to send delta updates with feed_next
     """
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     s.connect((host, port))
@@ -30,21 +34,47 @@ def main(host, port):
     dealer = RemoteDealer(s, player)
 
     print("Sending hello message: \"{}\"".format(HELLO_MESSAGE))
-    dealer.send(HELLO_MESSAGE)
-    print("Response received: {}".format(dealer.receive()))
+    print("Response received: {}".format(dealer.sign_up(HELLO_MESSAGE, binary, delta)))
 
     dealer.main()
 
 
+def main_persistent(host, port, games, binary=False, delta=False):
+    """ Plays games with the same player on an Evolution server on the given host/port until the given number of
+      games were played or the process is interrupted.
+    :param host: evolution host
+    :param port: evolution port
+    :param games: number of games to play, None for no limit
+    :param binary: if true, asks the server to use the binary encoding
+    :param delta: if true, asks the server to send delta updates with feed_next
+    """
+    client = PersistentClient(host, port, DummyPlayer(1), HELLO_MESSAGE, max_games=games, binary=binary,
+                              delta=delta)
+    try:
+        client.run()
+    except KeyboardInterrupt:
+        pass
+    print("Played {} games over {} connections".format(client.games_played, client.connections))
+
+
 def parse_args():
     """ Parses command-line arguments. """
     parser = ArgumentParser(description="Launches a new Evolution client, which tries to connect to the given server")
     parser.add_argument("-i", "--host", help="server host to connect to", default=DEFAULT_HOST)
     parser.add_argument("-p", "--port", help="server port to connect to", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--persistent", help="play consecutive games and reconnect when the connection is lost",
+                        action="store_true")
+    parser.add_argument("-b", "--binary", help="use the binary encoding instead of JSON", action="store_true")
+    parser.add_argument("-d", "--delta", help="receive only the changes of the state during a turn",
+                        action="store_true")
+    parser.add_argument("-g", "--games", help="number of games to play with --persistent", type=int, default=None)
 
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    main(args.host, args.port)
+    if args.persistent:
+        main_persistent(args.host, args.port, args.games, args.binary, args.delta)
+    else:
+        main(args.host, args.port, args.binary, args.delta)
@@ -8,6 +8,7 @@ from itertools import chain
 from collections import Counter
 
 from .species import Species
+from ..data_definitions import is_natural
 
 
 class Actions:
@@ -18,6 +19,8 @@ class Actions:
     Constraints: The embedded arrays may be empty.
     """
 
+    __slots__ = ("discard", "grow_population", "grow_body", "board_transfer", "replace_trait")
+
     def __init__(self, discard, grow_population=None, grow_body=None, board_transfer=None, replace_trait=None):
         """
         :param discard: index of the card to discard
@@ -107,6 +110,85 @@ class Actions:
 
         return cls(discard, grow_population, grow_body, board_transfer, replace_trait)
 
+    @classmethod
+    def parse(cls, data, player):
+        """ Creates Actions from Action4 JSON if it is well-formed and legal for the given player, in a single pass
+          over the data: same as checking DataDefinitions.action4, deserialize and validate, without building the
+          intermediate lists of used cards and traits.
+        :param data: Action4 JSON returned by an external player
+        :param player: player who requested the actions
+        :return: Actions, or None if the data is not a valid Action4 for the player
+        """
+        if not isinstance(data, list) or len(data) != 5:
+            return None
+        discard, gp, gb, bt, rt = data
+        if not (isinstance(gp, list) and isinstance(gb, list) and isinstance(bt, list) and isinstance(rt, list)):
+            return None
+
+        cards = player.cards
+        used = bytearray(len(cards))
+
+        def use(card_index):
+            if not is_natural(card_index) or card_index >= len(used) or used[card_index]:
+                return False
+            used[card_index] = 1
+            return True
+
+        if not use(discard):
+            return None
+
+        # board transfers come first: they determine the species the other actions can refer to
+        board_transfer = []
+        for board in bt:
+            if not isinstance(board, list) or not board:
+                return None
+            # the first card pays for the board, the other cards are traits that must be distinct
+            traits = set()
+            for position, card_index in enumerate(board):
+                if not use(card_index):
+                    return None
+                if position:
+                    trait = cards[card_index].trait
+                    if trait in traits:
+                        return None
+                    traits.add(trait)
+            board_transfer.append(BoardTransfer(board[0], board[1:]))
+
+        species = player.species
+        available_species = len(species) + len(board_transfer)
+
+        grow_population = GrowPopulation.parse_all(gp, species, available_species, use)
+        grow_body = GrowBody.parse_all(gb, species, available_species, use)
+        if grow_population is None or grow_body is None:
+            return None
+
+        replace_trait = []
+        # species index -> traits of the species after the replacements so far
+        replaced_traits = {}
+        for replacement in rt:
+            if not isinstance(replacement, list) or len(replacement) != 3:
+                return None
+            species_index, trait_slot, card_index = replacement
+            if not (is_natural(species_index) and is_natural(trait_slot) and species_index < available_species and
+                    use(card_index)):
+                return None
+            traits = replaced_traits.get(species_index)
+            if traits is None:
+                if species_index < len(species):
+                    traits = list(species[species_index].traits)
+                else:
+                    traits = board_transfer[species_index - len(species)].get_traits(player)
+                replaced_traits[species_index] = traits
+            if trait_slot >= len(traits):
+                return None
+            traits[trait_slot] = cards[card_index].trait
+            replace_trait.append(ReplaceTrait(species_index, trait_slot, card_index))
+
+        if any(len(set(traits)) != len(traits) for traits in replaced_traits.values()):
+            return None
+
+        return cls(discard, grow_population, grow_body, board_transfer, replace_trait)
+
     def used_cards(self):
         """ Returns the list of all indices of cards used in the actions
         """
@@ -118,7 +200,9 @@ class Actions:
 
 
 class Action:
-    """ Represents a part of actions4 """
+    """ Represents a part of actions4. Actions declare __slots__ to keep the many small instances compact. """
+
+    __slots__ = ()
 
     @staticmethod
     def extract_actions(action4):
@@ -186,6 +270,8 @@ class Action:
 class SpeciesAction(Action):
     """ Baseclass for all Actions that can be performed on an individual species """
 
+    __slots__ = ("species_index",)
+
     def __init__(self, species_index):
         """ Creates a new SpeciesAction
         :param species_index: index of the species to perform the action on
@@ -201,6 +287,8 @@ class SpeciesAction(Action):
 class GrowAction(SpeciesAction):
     """ Represents a grow body or grow population action """
 
+    __slots__ = ("card_index",)
+
     NAME = None
 
     def __init__(self, species_index, card_index):
@@ -217,6 +305,39 @@ class GrowAction(SpeciesAction):
         """
         return Counter(ga.species_index for ga in actions)
 
+    @classmethod
+    def parse_all(cls, data, species, available_species, use):
+        """ Creates the grow actions from their JSON if they are well-formed and legal, see Actions.parse
+        :param data: list of grow actions as JSON
+        :param species: list of the player's species
+        :param available_species: number of species including the species added by board transfers
+        :param use: function marking a card index as used, false if the card cannot be used
+        :return: list of GrowActions, or None if any action is invalid
+        """
+        actions = []
+        grow_counter = Counter()
+        for action in data:
+            if not isinstance(action, list) or len(action) != 3:
+                return None
+            name, species_index, card_index = action
+            if not (name == cls.NAME and is_natural(species_index) and species_index < available_species and
+                    use(card_index)):
+                return None
+            grow_counter[species_index] += 1
+            actions.append(cls(species_index, card_index))
+
+        existing_species_count = len(species)
+        for species_index, grow_amount in grow_counter.items():
+            target_species = species[species_index] if species_index < existing_species_count else Species()
+            if not cls.can_grow(target_species, grow_amount):
+                return None
+        return actions
+
+    @staticmethod
+    def can_grow(species, n):
+        """ Returns true if the given species can grow n times """
+        raise NotImplementedError("This method must be implemented by a subclass.")
+
     def serialize(self):
         return [self.NAME, self.species_index, self.card_index]
 
@@ -236,8 +357,14 @@ class GrowPopulation(GrowAction):
         board i by one.
     """
 
+    __slots__ = ()
+
     NAME = "population"
 
+    @staticmethod
+    def can_grow(species, n):
+        return species.can_grow_population(n)
+
     @staticmethod
     def extract_actions(action4):
         return action4.grow_population
@@ -265,8 +392,14 @@ class GrowBody(GrowAction):
         board i by one.
     """
 
+    __slots__ = ()
+
     NAME = "body"
 
+    @staticmethod
+    def can_grow(species, n):
+        return species.can_grow_body(n)
+
     @staticmethod
     def extract_actions(action4):
         return action4.grow_body
@@ -300,6 +433,8 @@ class BoardTransfer(Action):
         Constraint Once a player has added a species board, it becomes impossible to add a trait.
     """
 
+    __slots__ = ("card_index", "trait_card_indices")
+
     def __init__(self, card_index, trait_card_indices):
         """
         :param card_index: card index to use to create the species
@@ -347,6 +482,8 @@ class ReplaceTrait(SpeciesAction):
         specifies that board b’s i’s trait card is replaced with the j’s card from the player’s card sequence.
     """
 
+    __slots__ = ("trait_slot", "card_index")
+
     def __init__(self, species_index, trait_slot, card_index):
         """
         :param species_index: index of the species whose trait should be replaced
@@ -0,0 +1,72 @@
+"""
+    Implements an index of which species a carnivore can attack.
+
+    Whether a species is attackable only depends on a few values of the attacker, the defender and the defender's
+    neighbors (see Species.is_attackable). The index stores the attackable positions of a whole board of species
+    for every attacker it was asked about, keyed by signatures of these values. Since the keys are made of values
+    and not of species objects, an entry is never stale: once a species involved changes, its signature changes
+    and the next lookup computes and stores a new entry. A Dealer keeps one index per feeding step, so that the
+    repeated enumerations of carnivore feedings during a feeding cycle become lookups.
+
+"""
+
+from .species import WARNING_CALL
+
+
+class AttackabilityIndex:
+    """ Caches the attackable species of boards of species by attacker and board signature """
+
+    def __init__(self):
+        """ Creates a new empty index """
+        # (attacker signature, board signature) -> tuple of indices of attackable species
+        self.targets = {}
+
+    def __len__(self):
+        return len(self.targets)
+
+    @staticmethod
+    def attacker_signature(attacker):
+        """ Returns the values of the attacking species that determine which species it can attack
+        :param attacker: attacking Species
+        :return: hashable signature
+        """
+        return attacker.trait_mask, attacker.body, attacker.population
+
+    @staticmethod
+    def board_signature(species_list):
+        """ Returns the values of each species and its neighbors that determine whether the species can be attacked
+        :param species_list: list of Species of a player, in order
+        :return: hashable signature, a tuple with one entry per species
+        """
+        last = len(species_list) - 1
+        signature = []
+        for index, species in enumerate(species_list):
+            left = species_list[index - 1] if index > 0 else None
+            right = species_list[index + 1] if index < last else None
+            warned = bool((left is not None and left.trait_mask & WARNING_CALL) or
+                          (right is not None and right.trait_mask & WARNING_CALL))
+            signature.append((species.trait_mask, species.food, species.body, species.population,
+                              warned, right.body if right is not None else None))
+        return tuple(signature)
+
+    def attackable_indices(self, attacker, species_list, board_signature=None):
+        """ Returns the indices of the species in the given list that are attackable by the given attacker. The
+          attacker itself is not excluded if it is part of the list.
+        :param attacker: attacking Species
+        :param species_list: list of Species of a player, in order
+        :param board_signature: signature of species_list as returned by board_signature, if already known
+        :return: tuple of indices into species_list
+        """
+        if board_signature is None:
+            board_signature = self.board_signature(species_list)
+        key = self.attacker_signature(attacker), board_signature
+
+        targets = self.targets.get(key)
+        if targets is None:
+            last = len(species_list) - 1
+            targets = tuple(index for index, species in enumerate(species_list)
+                            if species.is_attackable(attacker,
+                                                     left=species_list[index - 1] if index > 0 else None,
+                                                     right=species_list[index + 1] if index < last else None))
+            self.targets[key] = targets
+        return targets
@@ -0,0 +1,259 @@
+"""
+    Implements the binary encoding of the messages exchanged with remote players, an alternative to JSON that is
+    negotiated when a player signs up.
+
+    A player asks for the binary encoding by signing up with [info message, BINARY_ENCODING] instead of the info
+    message alone. The server then answers with the ok message in a binary frame and both sides use binary frames
+    for every following message. A server that does not support the binary encoding closes the connection.
+
+    Every message is a frame: kind (1 byte) | length of the payload (4 bytes) | payload, big-endian. The start,
+    choose and feed_next messages have their own kinds and compact payloads, all other messages, such as the
+    responses of the player, are JSON_FRAMEs holding the message in JSON. In the compact payloads:
+
+        Species: food | body | population | fat food | trait ids of the 3 trait slots (1 byte each)
+        TraitCard: food value (signed byte) | trait id (1 byte)
+        LOS, LOC: count (1 byte) | records
+        LOB: count (1 byte) | LOS for every player
+
+    where the id of a trait is its position in trait.traits plus one, 0 for an empty slot. The traits of a species
+    are stored in order, not as a trait mask, since replacing a trait refers to its position.
+
+        start: watering hole (2 bytes) | bag (4 bytes) | LOS | LOC
+        choose: LOB before | LOB after
+        feed_next: bag (4 bytes) | LOS | LOC | watering hole (2 bytes) | LOB
+
+    Decoding a message yields the same JSON values as the JSON encoding, so the players are not aware of the
+    encoding.
+
+"""
+
+import json
+import struct
+
+from .trait import traits
+from ..data_definitions import DataDefinitions
+
+
+BINARY_ENCODING = "binary"
+
+FRAME_HEADER = struct.Struct(">BI")
+
+JSON_FRAME = 0
+START_FRAME = 1
+CHOOSE_FRAME = 2
+FEED_NEXT_FRAME = 3
+
+SPECIES_RECORD = struct.Struct(">BBBB3B")
+CARD_RECORD = struct.Struct(">bB")
+COUNT = struct.Struct(">B")
+BAG = struct.Struct(">I")
+WATERING_HOLE = struct.Struct(">H")
+START_HEADER = struct.Struct(">HI")
+
+TRAIT_SLOTS = 3
+TRAIT_IDS = {trait: idx + 1 for idx, trait in enumerate(traits)}
+
+FOOD = DataDefinitions.SPECIES_JSON_KEY_FOOD
+BODY = DataDefinitions.SPECIES_JSON_KEY_BODY
+POPULATION = DataDefinitions.SPECIES_JSON_KEY_POPULATION
+TRAITS = DataDefinitions.SPECIES_JSON_KEY_TRAITS
+FAT_FOOD = DataDefinitions.SPECIES_JSON_KEY_FAT_FOOD
+
+
+def encode_species(species, out):
+    """ Appends the record of the given species
+    :param species: JSONSpecies
+    :param out: bytearray
+    """
+    fields = dict(species)
+    trait_ids = [TRAIT_IDS[trait] for trait in fields[TRAITS]]
+    trait_ids += [0] * (TRAIT_SLOTS - len(trait_ids))
+    out += SPECIES_RECORD.pack(fields[FOOD], fields[BODY], fields[POPULATION], fields.get(FAT_FOOD, 0), *trait_ids)
+
+
+def encode_species_list(species_list, out):
+    """ Appends the given LOS
+    :param species_list: list of JSONSpecies
+    :param out: bytearray
+    """
+    out += COUNT.pack(len(species_list))
+    for species in species_list:
+        encode_species(species, out)
+
+
+def encode_cards(cards, out):
+    """ Appends the given LOC
+    :param cards: list of JSON TraitCards
+    :param out: bytearray
+    """
+    out += COUNT.pack(len(cards))
+    for value, trait in cards:
+        out += CARD_RECORD.pack(value, TRAIT_IDS[trait])
+
+
+def encode_boards(boards, out):
+    """ Appends the given LOB
+    :param boards: list of LOS
+    :param out: bytearray
+    """
+    out += COUNT.pack(len(boards))
+    for species_list in boards:
+        encode_species_list(species_list, out)
+
+
+def decode_species_list(data, offset):
+    """ Decodes a LOS
+    :param data: bytes-like object
+    :param offset: offset of the LOS
+    :return: (list of JSONSpecies, offset after the LOS) tuple
+    """
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    species_list = []
+    for _ in range(count):
+        food, body, population, fat_food, *trait_ids = SPECIES_RECORD.unpack_from(data, offset)
+        offset += SPECIES_RECORD.size
+        species = [
+            [FOOD, food],
+            [BODY, body],
+            [POPULATION, population],
+            [TRAITS, [traits[trait_id - 1] for trait_id in trait_ids if trait_id]],
+        ]
+        if fat_food:
+            species.append([FAT_FOOD, fat_food])
+        species_list.append(species)
+    return species_list, offset
+
+
+def decode_cards(data, offset):
+    """ Decodes a LOC
+    :param data: bytes-like object
+    :param offset: offset of the LOC
+    :return: (list of JSON TraitCards, offset after the LOC) tuple
+    """
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    cards = []
+    for _ in range(count):
+        value, trait_id = CARD_RECORD.unpack_from(data, offset)
+        offset += CARD_RECORD.size
+        cards.append([value, traits[trait_id - 1]])
+    return cards, offset
+
+
+def decode_boards(data, offset):
+    """ Decodes a LOB
+    :param data: bytes-like object
+    :param offset: offset of the LOB
+    :return: (list of LOS, offset after the LOB) tuple
+    """
+    count, = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    boards = []
+    for _ in range(count):
+        species_list, offset = decode_species_list(data, offset)
+        boards.append(species_list)
+    return boards, offset
+
+
+def encode_payload(data, kind):
+    """ Encodes the payload of a message
+    :param data: message as JSON value
+    :param kind: kind of the frame, see the *_FRAME constants
+    :return: bytearray
+    """
+    out = bytearray()
+    if kind == START_FRAME:
+        watering_hole, bag, species, cards = data
+        out += START_HEADER.pack(watering_hole, bag)
+        encode_species_list(species, out)
+        encode_cards(cards, out)
+    elif kind == CHOOSE_FRAME:
+        preceding, following = data
+        encode_boards(preceding, out)
+        encode_boards(following, out)
+    elif kind == FEED_NEXT_FRAME:
+        bag, species, cards, watering_hole, players = data
+        out += BAG.pack(bag)
+        encode_species_list(species, out)
+        encode_cards(cards, out)
+        out += WATERING_HOLE.pack(watering_hole)
+        encode_boards(players, out)
+    else:
+        out += json.dumps(data).encode("utf-8")
+    return out
+
+
+def decode_payload(kind, payload):
+    """ Decodes the payload of a message
+    :param kind: kind of the frame
+    :param payload: bytes-like object
+    :return: message as JSON value
+    :raise: ValueError if the frame kind is unknown or the payload is malformed
+    """
+    try:
+        if kind == START_FRAME:
+            watering_hole, bag = START_HEADER.unpack_from(payload, 0)
+            species, offset = decode_species_list(payload, START_HEADER.size)
+            cards, _ = decode_cards(payload, offset)
+            return [watering_hole, bag, species, cards]
+        if kind == CHOOSE_FRAME:
+            preceding, offset = decode_boards(payload, 0)
+            following, _ = decode_boards(payload, offset)
+            return [preceding, following]
+        if kind == FEED_NEXT_FRAME:
+            bag, = BAG.unpack_from(payload, 0)
+            species, offset = decode_species_list(payload, BAG.size)
+            cards, offset = decode_cards(payload, offset)
+            watering_hole, = WATERING_HOLE.unpack_from(payload, offset)
+            players, _ = decode_boards(payload, offset + WATERING_HOLE.size)
+            return [bag, species, cards, watering_hole, players]
+    except (struct.error, IndexError) as e:
+        raise ValueError("malformed frame: {}".format(e))
+    if kind == JSON_FRAME:
+        return json.loads(bytes(payload).decode("utf-8"))
+    raise ValueError("unknown frame kind {}".format(kind))
+
+
+def encode_frame(data, kind=JSON_FRAME):
+    """ Encodes the given message as a frame
+    :param data: message as JSON value
+    :param kind: kind of the frame, see the *_FRAME constants
+    :return: bytes to send
+    """
+    payload = encode_payload(data, kind)
+    return FRAME_HEADER.pack(kind, len(payload)) + payload
+
+
+class BinaryStreamDecoder:
+    """ Decodes frames from a stream of bytes, with the same interface as JSONStreamDecoder """
+
+    def __init__(self):
+        """ Creates a new stream decoder """
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """ Appends the given bytes to the buffer
+        :param data: bytes received from the stream
+        """
+        self.buffer += data
+
+    def decode(self, final=False, peek=False):
+        """ Decodes the next complete frame from the buffer. Frames are never ambiguous, so final has no effect.
+          Effect: removes the frame from the buffer
+        :param final: ignored
+        :param peek: if True, the buffer is left unchanged
+        :return: (complete, value) tuple, where value is None if complete is False
+        :raise: ValueError if the frame is malformed
+        """
+        if len(self.buffer) < FRAME_HEADER.size:
+            return False, None
+        kind, length = FRAME_HEADER.unpack_from(self.buffer, 0)
+        end = FRAME_HEADER.size + length
+        if len(self.buffer) < end:
+            return False, None
+
+        value = decode_payload(kind, self.buffer[FRAME_HEADER.size:end])
+        if not peek:
+            del self.buffer[:end]
+        return True, value
@@ -0,0 +1,159 @@
+"""
+    Implements deadlines for limiting the execution time of calls to external players.
+
+    A Deadline is a point in time on the monotonic clock. Deadlines are per thread: the deadline activated by a
+    thread is used by blocking operations of that thread, e.g. RemoteActor limits its socket timeouts to the time
+    remaining until the current deadline.
+
+    Code that does not block on a socket, such as a player running in the same process, is interrupted by the
+    Watchdog, which raises TimeoutError in the thread whose deadline passed. Raising an exception asynchronously
+    can interrupt any Python code of the thread, so code that cleans up after itself, such as RemoteActor restoring
+    its socket timeout, is instead watched with a function of its own, e.g. one shutting down the socket.
+
+"""
+
+import ctypes
+import functools
+import heapq
+import itertools
+import threading
+import time
+
+
+class Deadline:
+    """ Represents a deadline on the monotonic clock """
+
+    _local = threading.local()
+
+    def __init__(self, timeout):
+        """ Creates a deadline timeout seconds from now
+        :param timeout: number of seconds until the deadline, can be a float
+        """
+        self.timeout = timeout
+        self.time = time.monotonic() + timeout
+
+    def __repr__(self):
+        return "Deadline(timeout={}, remaining={:.3f})".format(self.timeout, self.remaining())
+
+    def remaining(self):
+        """ Returns the number of seconds until the deadline, 0 if it already passed
+        :return: number of seconds remaining
+        """
+        return max(0.0, self.time - time.monotonic())
+
+    def expired(self):
+        """ Returns True if the deadline passed
+        :return: true if the deadline passed
+        """
+        return time.monotonic() >= self.time
+
+    def limit(self, timeout):
+        """ Limits the given timeout to the time remaining until this deadline
+        :param timeout: timeout in seconds or None for no timeout
+        :return: the smaller of timeout and the remaining time
+        """
+        remaining = self.remaining()
+        return remaining if timeout is None else min(timeout, remaining)
+
+    @classmethod
+    def current(cls):
+        """ Returns the deadline active in the current thread
+        :return: Deadline or None
+        """
+        return getattr(cls._local, "deadline", None)
+
+    @classmethod
+    def activate(cls, deadline):
+        """ Makes the given deadline the current deadline of the current thread
+        :param deadline: Deadline or None
+        :return: the previously active deadline, used to restore it
+        """
+        previous = cls.current()
+        cls._local.deadline = deadline
+        return previous
+
+
+class Watchdog:
+    """ Interrupts threads whose deadline passed, by default by raising TimeoutError in them. A single daemon
+      thread watches all deadlines.
+    """
+
+    def __init__(self):
+        """ Creates a new watchdog, the watching thread is started on first use """
+        self.condition = threading.Condition()
+        self.heap = []
+        # token -> function interrupting the watched thread, for every deadline that is being watched
+        self.watched = {}
+        self.tokens = itertools.count()
+        self.thread = None
+
+    def watch(self, deadline, thread_ident=None, on_expired=None):
+        """ Starts watching the given deadline for the given thread
+        :param deadline: Deadline
+        :param thread_ident: ident of the thread to interrupt, defaults to the current thread
+        :param on_expired: function of no arguments called from the watching thread when the deadline passes,
+                           instead of raising TimeoutError in the watched thread; it must not block
+        :return: token used to cancel the watch
+        """
+        if on_expired is None:
+            thread_ident = thread_ident if thread_ident is not None else threading.get_ident()
+            on_expired = functools.partial(self.interrupt, thread_ident, TimeoutError)
+        with self.condition:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, name="watchdog", daemon=True)
+                self.thread.start()
+
+            token = next(self.tokens)
+            self.watched[token] = on_expired
+            heapq.heappush(self.heap, (deadline.time, token))
+            # the watching thread only needs to wake up if the new deadline is the earliest
+            if self.heap[0][1] == token:
+                self.condition.notify()
+        return token
+
+    def cancel(self, token):
+        """ Stops watching the deadline with the given token, must be called from the watched thread. If the
+          watchdog already raised TimeoutError in the thread and the exception was not raised yet, the exception is
+          discarded.
+        :param token: token returned by watch
+        :return: True if the deadline was cancelled before it passed, False if the watchdog fired
+        """
+        with self.condition:
+            on_expired = self.watched.pop(token, None)
+            if on_expired is None:
+                self.interrupt(threading.get_ident(), None)
+                return False
+            return True
+
+    def run(self):
+        """ Watches the deadlines, interrupting threads as their deadlines pass """
+        with self.condition:
+            while True:
+                while self.heap and self.heap[0][1] not in self.watched:
+                    heapq.heappop(self.heap)
+
+                if not self.heap:
+                    self.condition.wait()
+                    continue
+
+                deadline_time, token = self.heap[0]
+                remaining = deadline_time - time.monotonic()
+                if remaining > 0:
+                    self.condition.wait(remaining)
+                    continue
+
+                heapq.heappop(self.heap)
+                self.watched.pop(token)()
+
+    @staticmethod
+    def interrupt(thread_ident, exception):
+        """ Asynchronously raises the given exception in the thread with the given ident. The exception is raised
+          the next time the thread executes Python code.
+        :param thread_ident: ident of the thread
+        :param exception: exception class or None to clear a pending exception
+        """
+        exception = ctypes.py_object(exception) if exception is not None else None
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread_ident), exception)
+
+
+WATCHDOG = Watchdog()
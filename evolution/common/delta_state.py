@@ -0,0 +1,99 @@
+"""
+    Implements delta updates of the State sent to a remote player with feed_next, an opt-in mode negotiated when a
+    player signs up.
+
+    A player asks for delta updates by signing up with [info message, DELTA_UPDATES], possibly along with other
+    options, see RemotePlayer.parse_hello. In every turn, the first feed_next message is the full State. Every
+    following feed_next message of the turn only holds the changes to the last State the player responded to:
+
+        DeltaMessage: [DELTA_TAG, Nat, [Change, ...]]
+            the watering hole and the changes to the State
+
+        Change is one of:
+            ["bag", Natural], the new food bag of the player
+            ["cards", LOC], the new cards of the player
+            [[Nat], LOS], the new species of a board
+            [[Nat, Nat], JSONSpecies], the new species at an index of a board, the board has as many species as
+                                       before
+
+    where board 0 is the player's own species and board p + 1 the species of the player at index p of the players
+    of the State. When the number of other players changes, the full State is sent instead.
+
+"""
+
+
+DELTA_UPDATES = "delta"
+DELTA_TAG = "delta"
+DELTA_MESSAGE_LEN = 3
+
+BAG = "bag"
+CARDS = "cards"
+
+
+def is_delta_message(message):
+    """ Returns True if the given message is a DeltaMessage """
+    return isinstance(message, list) and len(message) == DELTA_MESSAGE_LEN and message[0] == DELTA_TAG
+
+
+def boards(state):
+    """ Returns the boards of the given State
+    :param state: State, [bag, LOS, LOC, watering hole, LOB]
+    :return: list of LOS, the player's own species first
+    """
+    _, species, _, _, players = state
+    return [species] + players
+
+
+def diff_state(previous, state):
+    """ Computes the DeltaMessage that turns one State into another
+    :param previous: last State the player responded to
+    :param state: new State
+    :return: DeltaMessage, or None if the number of players changed and the full State has to be sent
+    """
+    bag, _, cards, watering_hole, players = state
+    previous_bag, _, previous_cards, _, previous_players = previous
+    if len(players) != len(previous_players):
+        return None
+
+    changes = []
+    if bag != previous_bag:
+        changes.append([BAG, bag])
+    if cards != previous_cards:
+        changes.append([CARDS, cards])
+
+    for board, (species_list, previous_list) in enumerate(zip(boards(state), boards(previous))):
+        if len(species_list) != len(previous_list):
+            changes.append([[board], species_list])
+            continue
+        for index, (species, previous_species) in enumerate(zip(species_list, previous_list)):
+            if species != previous_species:
+                changes.append([[board, index], species])
+
+    return [DELTA_TAG, watering_hole, changes]
+
+
+def apply_delta(previous, message):
+    """ Applies a DeltaMessage to a State
+    :param previous: last State the player responded to, it is not modified
+    :param message: DeltaMessage
+    :return: new State
+    :raise: ValueError if a change does not apply to the State
+    """
+    _, watering_hole, changes = message
+    bag, _, cards, _, _ = previous
+    new_boards = [list(species_list) for species_list in boards(previous)]
+
+    for path, value in changes:
+        if path == BAG:
+            bag = value
+        elif path == CARDS:
+            cards = value
+        elif isinstance(path, list) and len(path) == 1 and 0 <= path[0] < len(new_boards):
+            new_boards[path[0]] = value
+        elif (isinstance(path, list) and len(path) == 2 and 0 <= path[0] < len(new_boards) and
+                0 <= path[1] < len(new_boards[path[0]])):
+            new_boards[path[0]][path[1]] = value
+        else:
+            raise ValueError("invalid change {}".format(path))
+
+    return [bag, new_boards[0], cards, watering_hole, new_boards[1:]]
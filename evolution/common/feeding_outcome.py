@@ -10,11 +10,16 @@
 
 """
 
+from ..data_definitions import is_natural
+
 
 class FeedingOutcome:
     """ Base feeding outcome class. Each feeding outcome must overwrite the given methods.
+      Feeding outcomes are created for every feeding choice, so they declare __slots__ to stay small.
     """
 
+    __slots__ = ()
+
     def serialize(self):
         """ Returns a JSON-friendly representation of the feeding outcome.
         :return: JSON-friendly representation of the outcome
@@ -52,11 +57,51 @@ class FeedingOutcome:
             return CarnivoreFeeding(*data)
         return CannotFeed()
 
+    @classmethod
+    def parse(cls, data, player, players, watering_hole):
+        """ Creates a FeedingOutcome from Feeding JSON if it is well-formed and legal for the given player, checking
+          only the species the feeding refers to: same as checking DataDefinitions.feeding_outcome, deserialize and
+          validate, without enumerating all possible feedings.
+        :param data: Feeding JSON returned by an external player
+        :param player: player whose turn it is to feed
+        :param players: other players in the game, in order starting after the player
+        :param watering_hole: number of food tokens left in the watering hole
+        :return: FeedingOutcome, or None if the data is not a valid feeding for the player
+        """
+        if data is False:
+            return NoFeeding()
+
+        if is_natural(data):
+            return VegetarianFeeding(data) if player.can_feed_vegetarian(data) else None
+
+        if not isinstance(data, list):
+            return None
+
+        if len(data) == 2:
+            species_index, food_tokens = data
+            if (is_natural(species_index) and is_natural(food_tokens) and
+                    player.can_store_fat_food(species_index, food_tokens, watering_hole)):
+                return FatTissueFeeding(species_index, food_tokens)
+            return None
+
+        if len(data) == 3:
+            species_index, player_index, defender_index = data
+            if not (is_natural(species_index) and is_natural(player_index) and is_natural(defender_index)):
+                return None
+            targets = players + [player]
+            if player_index < len(targets) and player.can_attack(species_index, targets[player_index], defender_index):
+                return CarnivoreFeeding(species_index, player_index, defender_index)
+            return None
+
+        return None
+
 
 class SpeciesFeedingOutcome(FeedingOutcome):
     """ Represents a feeding outcome where one of the player's species is involved.
     """
 
+    __slots__ = ("species_index",)
+
     def __init__(self, species_index):
         """ Creates a new species feeding outcome
         :param species_index: index of the species to feed in the Player's list of species
@@ -84,12 +129,14 @@ class VegetarianFeeding(SpeciesFeedingOutcome):
 
     """
 
+    __slots__ = ()
+
     def serialize(self):
         return self.species_index
 
     def validate(self, dealer):
         current_player = dealer.get_current_player()
-        return self in current_player.get_possible_vegetarian_feedings()
+        return current_player.can_feed_vegetarian(self.species_index)
 
     def apply(self, dealer):
         current_player = dealer.get_current_player()
@@ -107,6 +154,8 @@ class FatTissueFeeding(SpeciesFeedingOutcome):
 
     """
 
+    __slots__ = ("food_tokens",)
+
     def __init__(self, species_index, food_tokens):
         """ Creates a new fat tissue feeding
         :param species_index: index of the species to feed in the Player's list of species
@@ -123,7 +172,7 @@ class FatTissueFeeding(SpeciesFeedingOutcome):
 
     def validate(self, dealer):
         current_player = dealer.get_current_player()
-        return self in current_player.get_possible_fat_tissue_feedings(dealer.watering_hole, include_suboptimal=True)
+        return current_player.can_store_fat_food(self.species_index, self.food_tokens, dealer.watering_hole)
 
     def apply(self, dealer):
         # at this point if a fat tissue feeding is valid, the player request a valid number of
@@ -144,6 +193,8 @@ class CarnivoreFeeding(SpeciesFeedingOutcome):
 
     """
 
+    __slots__ = ("player_index", "defender_index")
+
     def __init__(self, species_index, player_index, defender_index):
         """ Creates a new carnivore feeding
         :param species_index: index of the carnivore species to feed in the Player's list of species
@@ -166,7 +217,9 @@ class CarnivoreFeeding(SpeciesFeedingOutcome):
         current_player = dealer.get_current_player()
         players = dealer.player_queue_all
         players = players[1:] + players[:1]
-        return self in current_player.get_possible_carnivore_feedings(players)
+        if not 0 <= self.player_index < len(players):
+            return False
+        return current_player.can_attack(self.species_index, players[self.player_index], self.defender_index)
 
     def apply(self, dealer):
         dealer.carnivore_feeding(self.species_index, self.player_index, self.defender_index)
@@ -183,6 +236,8 @@ class NoFeeding(FeedingOutcome):
 
     """
 
+    __slots__ = ()
+
     def __eq__(self, other):
         return isinstance(other, self.__class__)
 
@@ -204,6 +259,8 @@ class CannotFeed(FeedingOutcome):
 
     """
 
+    __slots__ = ()
+
     def __eq__(self, other):
         return isinstance(other, self.__class__)
 
@@ -0,0 +1,280 @@
+"""
+    Implements the instrumentation of games: where the wall time of a game goes and how much data is exchanged
+    with remote players.
+
+    A Dealer with an Instrumentation, see Dealer.instrument, records the duration of
+
+        game                        every game played by run_game
+        step1, step2_3, step4       every step of every turn, step4 includes the feeding step
+        feed1                       every feeding, including the call to the player if it has to choose
+        external_player_call        every call to an external player, also recorded per method as
+                                    external_player_call.start, external_player_call.choose and
+                                    external_player_call.feed_next, and per player
+
+    and every RemotePlayer counts the bytes and messages it sends and receives in a Traffic. The time spent in the
+    steps without the external player calls is the time spent by the dealer itself; for remote players, the calls
+    include the time spent on the network.
+
+    Durations are aggregated in LatencyHistograms, so an Instrumentation has the same size whatever the number of
+    games it records. Without an Instrumentation, a Dealer only checks that it has none at every step.
+
+"""
+
+import json
+import time
+
+from threading import Lock
+
+
+GAME = "game"
+STEP1 = "step1"
+STEP2_3 = "step2_3"
+STEP4 = "step4"
+FEED1 = "feed1"
+EXTERNAL_PLAYER_CALL = "external_player_call"
+
+# label of the Traffic of all remote players, when the traffic of every player is not kept, see merge
+ALL_PLAYERS = "all"
+
+
+class LatencyHistogram:
+    """ Counts durations in buckets whose width grows with the duration, in the manner of an HDR histogram.
+      Durations are counted in microseconds; a bucket holds the values that are equal in their SUB_BUCKET_BITS + 1
+      most significant bits, so every duration is known to within 1 / 2 ** SUB_BUCKET_BITS of its value.
+    """
+
+    SUB_BUCKET_BITS = 7
+    MICROSECONDS = 1000000
+
+    def __init__(self):
+        """ Creates a new empty histogram """
+        # lowest value of a bucket -> number of values in the bucket
+        self.counts = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    @classmethod
+    def shift(cls, value):
+        """ Returns the number of low bits of the given value that are ignored by its bucket
+        :param value: number of microseconds
+        :return: natural number
+        """
+        return max(0, value.bit_length() - cls.SUB_BUCKET_BITS - 1)
+
+    def record(self, seconds):
+        """ Records a duration
+        :param seconds: duration in seconds
+        """
+        value = round(seconds * self.MICROSECONDS)
+        shift = self.shift(value)
+        bucket = (value >> shift) << shift
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """ Adds the durations of the given histogram to this histogram
+        :param other: LatencyHistogram
+        """
+        for bucket, count in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, percentile):
+        """ Returns the duration below which the given percentage of the durations are
+        :param percentile: number between 0 and 100
+        :return: highest duration of the bucket of the percentile in microseconds, at most the maximum duration,
+                 or None if the histogram is empty
+        """
+        if not self.count:
+            return None
+
+        rank = max(1, -(-self.count * percentile // 100))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(bucket + (1 << self.shift(bucket)) - 1, self.max)
+        return self.max
+
+    def serialize(self):
+        """ Returns a JSON-compatible summary of the histogram, with its buckets so that histograms can be merged
+        :return: dictionary with the number of durations and their mean, minimum, percentiles and maximum in
+                 milliseconds, None if there are no durations, and the buckets as [microseconds, count] pairs
+        """
+        def milliseconds(value):
+            return value / 1000 if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean": milliseconds(self.total / self.count if self.count else None),
+            "min": milliseconds(self.min),
+            "p50": milliseconds(self.percentile(50)),
+            "p90": milliseconds(self.percentile(90)),
+            "p99": milliseconds(self.percentile(99)),
+            "p999": milliseconds(self.percentile(99.9)),
+            "max": milliseconds(self.max),
+            "buckets": sorted(self.counts.items()),
+        }
+
+
+class Traffic:
+    """ Counts the data sent and received by a RemoteActor """
+
+    def __init__(self):
+        """ Creates new counters """
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.messages_sent = 0
+        self.messages_received = 0
+
+    def merge(self, other):
+        """ Adds the counters of the given Traffic to these counters
+        :param other: Traffic
+        """
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.messages_sent += other.messages_sent
+        self.messages_received += other.messages_received
+
+    def serialize(self):
+        """ Returns the counters as a JSON-compatible dictionary """
+        return {
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "messages_sent": self.messages_sent,
+            "messages_received": self.messages_received,
+        }
+
+
+class Instrumentation:
+    """ Collects the durations and the traffic of games. Durations can be recorded from any thread; every Traffic
+      is only updated by the thread using its RemoteActor.
+    """
+
+    def __init__(self):
+        """ Creates a new empty instrumentation """
+        self.lock = Lock()
+        self.games = 0
+        # name -> LatencyHistogram
+        self.histograms = {}
+        # player id -> name -> LatencyHistogram
+        self.players = {}
+        # label -> Traffic
+        self.traffic = {}
+
+    @staticmethod
+    def histogram(histograms, name):
+        """ Returns the histogram with the given name, adding it if necessary
+        :param histograms: dictionary of LatencyHistograms
+        :param name: name of the histogram
+        :return: LatencyHistogram
+        """
+        histogram = histograms.get(name)
+        if histogram is None:
+            histogram = histograms[name] = LatencyHistogram()
+        return histogram
+
+    def record(self, name, seconds):
+        """ Records a duration
+        :param name: name of the timed operation, such as STEP1
+        :param seconds: duration in seconds
+        """
+        with self.lock:
+            self.histogram(self.histograms, name).record(seconds)
+
+    def external_player_call(self, player, method, seconds):
+        """ Records the duration of a call to an external player
+        :param player: id of the player
+        :param method: name of the method of the external player
+        :param seconds: duration in seconds
+        """
+        name = "{}.{}".format(EXTERNAL_PLAYER_CALL, method)
+        with self.lock:
+            self.histogram(self.histograms, EXTERNAL_PLAYER_CALL).record(seconds)
+            self.histogram(self.histograms, name).record(seconds)
+            player_histograms = self.players.setdefault(player, {})
+            self.histogram(player_histograms, EXTERNAL_PLAYER_CALL).record(seconds)
+            self.histogram(player_histograms, name).record(seconds)
+
+    def game_over(self):
+        """ Counts a game that was recorded """
+        with self.lock:
+            self.games += 1
+
+    def timed(self, name, function, *args):
+        """ Calls the given function and records the duration of the call, even if it raises an exception
+        :param name: name of the timed operation
+        :param function: function to call with the given arguments
+        :return: result of the function
+        """
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def traffic_of(self, label):
+        """ Returns the Traffic with the given label, adding it if necessary
+        :param label: label of a RemoteActor, such as a player id
+        :return: Traffic
+        """
+        with self.lock:
+            traffic = self.traffic.get(label)
+            if traffic is None:
+                traffic = self.traffic[label] = Traffic()
+            return traffic
+
+    def merge(self, other, players=True):
+        """ Adds everything recorded by the given Instrumentation to this Instrumentation, e.g. to aggregate the
+          instrumentations of many games.
+        :param other: Instrumentation, which is no longer updated
+        :param players: if false, the histograms of the players are left out and the traffic of all players is
+                        added to the traffic labelled ALL_PLAYERS, since player ids are only meaningful in a game
+        """
+        with self.lock:
+            self.games += other.games
+            for name, histogram in other.histograms.items():
+                self.histogram(self.histograms, name).merge(histogram)
+
+            if players:
+                for player, histograms in other.players.items():
+                    player_histograms = self.players.setdefault(player, {})
+                    for name, histogram in histograms.items():
+                        self.histogram(player_histograms, name).merge(histogram)
+
+            for label, traffic in other.traffic.items():
+                label = label if players else ALL_PLAYERS
+                self.traffic.setdefault(label, Traffic()).merge(traffic)
+
+    def serialize(self):
+        """ Returns a JSON-compatible representation of the instrumentation
+        :return: dictionary with the number of games, the histograms, the histograms of every player and the
+                 traffic of every RemoteActor
+        """
+        with self.lock:
+            return {
+                "games": self.games,
+                "timings": {name: histogram.serialize() for name, histogram in sorted(self.histograms.items())},
+                "players": {
+                    str(player): {name: histogram.serialize() for name, histogram in sorted(histograms.items())}
+                    for player, histograms in sorted(self.players.items())
+                },
+                "traffic": {str(label): traffic.serialize() for label, traffic in self.traffic.items()},
+            }
+
+    def dump(self, path):
+        """ Writes the instrumentation as JSON to the given file
+        :param path: path of the file
+        :raise: OSError if the file cannot be written
+        """
+        with open(path, "w") as f:
+            json.dump(self.serialize(), f, indent=2)
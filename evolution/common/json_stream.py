@@ -0,0 +1,72 @@
+"""
+    Implements an incremental decoder for a stream of concatenated JSON values.
+
+    Bytes are fed to the decoder in arbitrarily sized chunks as they arrive from a socket. Complete values
+    are decoded with JSONDecoder.raw_decode and any leftover data is kept for the next value, so every byte
+    is parsed a bounded number of times regardless of how the stream was split.
+
+"""
+
+import codecs
+import json
+
+
+class JSONStreamDecoder:
+    """ Decodes JSON values from a stream of bytes. """
+
+    DECODER = json.JSONDecoder()
+    WHITESPACE = " \t\n\r"
+    # characters that may continue a number which is at the end of the buffer
+    NUMBER_CONTINUATION = "0123456789.eE+-"
+
+    def __init__(self, encoding="utf-8"):
+        """ Creates a new stream decoder
+        :param encoding: encoding of the bytes fed to the decoder
+        """
+        self.text_decoder = codecs.getincrementaldecoder(encoding)()
+        self.buffer = ""
+
+    def feed(self, data):
+        """ Appends the given bytes to the buffer. Multi-byte characters split across chunks are
+          kept by the text decoder until they are complete.
+        :param data: bytes received from the stream
+        """
+        self.buffer += self.text_decoder.decode(data)
+
+    def decode(self, final=False, peek=False):
+        """ Decodes the next complete JSON value from the buffer.
+          A number at the very end of the buffer is ambiguous, since more digits may follow, so it is
+          only returned if final is True, i.e. no more data is expected at the moment.
+          Effect: removes the decoded value and its leading whitespace from the buffer
+        :param final: if True, values that might be continued by more data are decoded as they are
+        :param peek: if True, the buffer is left unchanged
+        :return: (complete, value) tuple, where value is None if complete is False
+        """
+        self.buffer = self.buffer.lstrip(self.WHITESPACE)
+        if not self.buffer:
+            return False, None
+
+        try:
+            value, end = self.DECODER.raw_decode(self.buffer)
+        except ValueError:
+            return False, None
+
+        if not final and self.is_number(value) and self.may_continue(end):
+            return False, None
+
+        if not peek:
+            self.buffer = self.buffer[end:]
+        return True, value
+
+    def may_continue(self, end):
+        """ Returns True if the value ending at the given position of the buffer could be extended by
+          data that has not been received yet.
+        :param end: index of the first character after the value
+        :return: true if more data could change the value
+        """
+        return end == len(self.buffer) or self.buffer[end] in self.NUMBER_CONTINUATION
+
+    @staticmethod
+    def is_number(value):
+        """ Returns True if the given decoded value is a JSON number """
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
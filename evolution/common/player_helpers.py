@@ -3,7 +3,9 @@
     that occur when calling an external player.
 """
 
-import signal
+import time
+
+from .deadline import Deadline, WATCHDOG
 
 
 def external_player_call():
@@ -31,26 +33,61 @@ class ExternalPlayerIssue(Exception):
 class ExternalPlayerCall:
     """ Context manager that limits the execution time of methods called on external player and
         checks for exceptions. If a timeout occurs or an exception is raised, raises an
-        ExternalPlayerIssue exception """
+        ExternalPlayerIssue exception.
 
-    TIMEOUT_THRESHOLD = 5
+        The limit is a Deadline that is active in the calling thread for the duration of the call, so calls can be
+        made from any thread and the timeout can be a fraction of a second. Remote players are limited through
+        their socket timeouts, players running in this process are interrupted by the watchdog. A player that
+        gives an interrupt function, such as RemoteActor.interrupt, is interrupted with that function instead of an
+        exception raised in the calling thread.
 
-    @staticmethod
-    def timeout_handler(signum, frame):
-        raise TimeoutError()
+        With an Instrumentation, the duration of the call is recorded, whether it succeeds or not. """
 
-    def __init__(self, timeout=None):
+    TIMEOUT_THRESHOLD = 5
+
+    def __init__(self, timeout=None, instrumentation=None, player=None, method=None, interrupt=None):
+        """ Creates a new external player call
+        :param timeout: maximum number of seconds the call may take, defaults to TIMEOUT_THRESHOLD
+        :param instrumentation: Instrumentation recording the duration of the call, or None
+        :param player: id of the called player, only used with an instrumentation
+        :param method: name of the called method, only used with an instrumentation
+        :param interrupt: function called from the watchdog when the deadline passes, see Watchdog.watch, or None to
+                          raise TimeoutError in the calling thread
+        """
         self.timeout = timeout if timeout is not None else self.TIMEOUT_THRESHOLD
+        self.instrumentation = instrumentation
+        self.player = player
+        self.method = method
+        self.interrupt = interrupt
+        self.deadline = None
+        self.previous_deadline = None
+        self.watch_token = None
+        self.start = None
 
     def __enter__(self):
-        signal.signal(signal.SIGALRM, self.timeout_handler)
-        signal.alarm(self.timeout)
+        if self.instrumentation is not None:
+            self.start = time.perf_counter()
+        self.deadline = Deadline(self.timeout)
+        self.previous_deadline = Deadline.activate(self.deadline)
+        self.watch_token = WATCHDOG.watch(self.deadline, on_expired=self.interrupt)
+        return self.deadline
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
-        signal.alarm(0)
+        try:
+            in_time = WATCHDOG.cancel(self.watch_token)
+        except TimeoutError as timeout_error:
+            # the watchdog fired while the call was finishing
+            in_time, exc_type, exc_value = False, TimeoutError, timeout_error
+        finally:
+            Deadline.activate(self.previous_deadline)
+            if self.instrumentation is not None:
+                self.instrumentation.external_player_call(self.player, self.method, time.perf_counter() - self.start)
+
         # if an exception was raised
         if exc_type is not None:
             raise ExternalPlayerIssue() from exc_value
+        if not in_time:
+            raise ExternalPlayerIssue() from TimeoutError()
 
 
 class PlayerResponse:
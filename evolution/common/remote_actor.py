@@ -3,57 +3,161 @@
 """
 
 import json
-import signal
+import socket
+
+from contextlib import contextmanager
+
+from .binary_protocol import BinaryStreamDecoder, encode_frame, JSON_FRAME
+from .deadline import Deadline
+from .json_stream import JSONStreamDecoder
 
 
 class RemoteActor:
 
     ENCODING = "utf-8"
     TIMEOUT = 5
+    # maximum number of bytes read from the socket at once
+    BUFFER_SIZE = 65536
+    # sent after every message, so that a number at the end of a message is not ambiguous
+    MESSAGE_SEPARATOR = "\n"
+    # seconds to wait for more data when the buffer ends with a number that may not be complete yet
+    SETTLE_TIME = 0.05
 
     def __init__(self, socket):
         """ Creates a new remote actor able to send and receive from the given socket
         :param socket: socket connection
         """
         self.socket = socket
+        self.decoder = JSONStreamDecoder(self.ENCODING)
+        # whether messages are binary frames instead of JSON, see binary_protocol
+        self.binary = False
+        # Traffic counting the data sent and received, or None, see instrumentation
+        self.traffic = None
 
-    def send(self, data):
+    @classmethod
+    def encode(cls, data):
+        """ Encodes the given JSON object as a message
+        :param data: JSON object
+        :return: bytes to send
+        """
+        return (json.dumps(data) + cls.MESSAGE_SEPARATOR).encode(cls.ENCODING)
+
+    def encode_message(self, data, kind=JSON_FRAME):
+        """ Encodes the given JSON object as a message in the encoding of this actor
+        :param data: JSON object
+        :param kind: kind of the binary frame, see binary_protocol; only used with the binary encoding
+        :return: bytes to send
+        """
+        return encode_frame(data, kind) if self.binary else self.encode(data)
+
+    def use_binary(self):
+        """ Switches to the binary encoding, for all messages sent and received from now on.
+          Effect: replaces the decoder, no data may be buffered in the JSON decoder
+        """
+        self.binary = True
+        self.decoder = BinaryStreamDecoder()
+
+    def send(self, data, deadline=None, kind=JSON_FRAME):
         """ Sends the given JSON object to the socket
         :param data: JSON object
+        :param deadline: Deadline for sending, defaults to the deadline active in the current thread
+        :param kind: kind of the binary frame, see binary_protocol; only used with the binary encoding
+        :raise: socket.timeout
         """
-        encoded = json.dumps(data).encode(self.ENCODING)
-        print("sent", data)
-        self.socket.send(encoded)
+        message = self.encode_message(data, kind)
+        with self.socket_timeout(deadline):
+            self.socket.sendall(message)
+        if self.traffic is not None:
+            self.traffic.bytes_sent += len(message)
+            self.traffic.messages_sent += 1
 
-    def receive(self):
-        """ Continuously receives bytes until a JSON object can be deserialized, at which point
-          the deserialized object is returned. It is up to the caller to restrict the execution time.
+    def receive(self, deadline=None):
+        """ Receives data until a JSON object can be deserialized, at which point the deserialized object
+          is returned. Data received after the object is kept for the next call. The execution time is limited by
+          the socket's timeout and the given deadline.
+          If no more data arrives and the buffered data is a complete JSON value, such as a number that is not
+          followed by any other character, the value is returned.
+        :param deadline: Deadline for receiving, defaults to the deadline active in the current thread
         :return: deserialized JSON object
+        :raise: socket.timeout, ConnectionError
         """
-        data = bytes()
+        deadline = deadline if deadline is not None else Deadline.current()
         while True:
-            data += self.socket.recv(1)
+            complete, decoded = self.decoder.decode()
+            if complete:
+                return self.received(decoded)
+
+            # a number is buffered, but more digits may follow: only wait a short time for them
+            pending_number, _ = self.decoder.decode(final=True, peek=True)
+
             try:
-                decoded = data.decode(self.ENCODING).strip()
-                decoded = json.loads(decoded)
-                print("received", decoded)
-                return decoded
-            except (ValueError, UnicodeDecodeError):
-                continue
+                with self.socket_timeout(deadline, self.SETTLE_TIME if pending_number else None):
+                    data = self.socket.recv(self.BUFFER_SIZE)
+            except socket.timeout:
+                complete, decoded = self.decoder.decode(final=True)
+                if complete:
+                    return self.received(decoded)
+                raise
+
+            if not data:
+                raise ConnectionError("connection closed by the remote side")
+
+            if self.traffic is not None:
+                self.traffic.bytes_received += len(data)
+            self.decoder.feed(data)
+
+    def received(self, message):
+        """ Counts a received message in the traffic of this actor, if any
+        :param message: decoded message
+        :return: the given message
+        """
+        if self.traffic is not None:
+            self.traffic.messages_received += 1
+        return message
+
+    def interrupt(self):
+        """ Shuts down the connection, so that a call blocked on the socket returns at once, e.g. when the deadline
+          of a call passed, see Watchdog.watch. Can be called from any thread.
+        """
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    @contextmanager
+    def socket_timeout(self, deadline, timeout=None):
+        """ Limits the timeout of the socket to the time remaining until the given deadline and to the given
+          timeout, for the duration of the context. The socket's own timeout is restored afterwards.
+        :param deadline: Deadline or None
+        :param timeout: number of seconds or None
+        :raise: socket.timeout if the deadline already passed
+        """
+        if deadline is None and timeout is None:
+            yield
+            return
+
+        socket_timeout = self.socket.gettimeout()
+        limited = socket_timeout if timeout is None else timeout
+        if socket_timeout is not None and limited is not None:
+            limited = min(socket_timeout, limited)
+        if deadline is not None:
+            if deadline.expired():
+                raise socket.timeout("deadline passed")
+            limited = deadline.limit(limited)
+
+        self.socket.settimeout(limited)
+        try:
+            yield
+        finally:
+            self.socket.settimeout(socket_timeout)
 
     def receive_restricted(self, timeout=TIMEOUT):
         """ Same as receive, but with execution time limited to timeout
-        :param timeout: maximum number of seconds to receive for
+        :param timeout: maximum number of seconds to receive for, can be a float
         :return: received data
+        :raise: socket.timeout, ConnectionError
         """
-        def timeout_handler(signum, frame):
-            raise TimeoutError()
-
-        signal.signal(signal.SIGALRM, timeout_handler)
-        signal.alarm(timeout)
-        message = self.receive()
-        signal.alarm(0)
-        return message
+        return self.receive(Deadline(timeout))
 
     def receive_iterator(self):
         """ Continuously receives data and deserializes JSON objects as they come in """
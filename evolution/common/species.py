@@ -18,13 +18,37 @@
 """
 
 from ..data_definitions import DataDefinitions
-from .trait import Trait, HARD_SHELL_THRESHOLD
+from .trait import Trait, HARD_SHELL_THRESHOLD, trait_mask
+
+# trait bits checked when feeding, see Species.trait_mask
+AMBUSH = Trait.AMBUSH.bit
+BURROWING = Trait.BURROWING.bit
+CARNIVORE = Trait.CARNIVORE.bit
+CLIMBING = Trait.CLIMBING.bit
+FAT_TISSUE = Trait.FAT_TISSUE.bit
+HARD_SHELL = Trait.HARD_SHELL.bit
+HERDING = Trait.HERDING.bit
+PACK_HUNTING = Trait.PACK_HUNTING.bit
+SCAVENGER = Trait.SCAVENGER.bit
+SYMBIOSIS = Trait.SYMBIOSIS.bit
+WARNING_CALL = Trait.WARNING_CALL.bit
 
 
 class Species:
     """ Represents a species board
+
+    Besides the list of traits, a species keeps a trait mask with the bit of each of its traits set, so that
+    checking for a trait is a single AND. The traits must only be changed through add_trait, replace_trait or
+    by assigning a new list to traits, which keep the mask in sync.
+
+    Every method changing the species increments its version, and serialize returns the same JSONSpecies until
+    the version changes. The food, body, population and fat food must therefore only be changed through the
+    methods of the species.
     """
 
+    __slots__ = ("food", "body", "population", "fat_food", "_traits", "trait_mask", "version", "_serialized",
+                 "_serialized_version")
+
     MINIMUM_BODY = 0
     MAXIMUM_BODY = 7
 
@@ -67,13 +91,27 @@ class Species:
         self.body = body if body is not None else self.DEFAULT_BODY
         self.population = population if population is not None else self.DEFAULT_POPULATION
         self.fat_food = fat_food if fat_food is not None else self.DEFAULT_FAT_FOOD
+        self.version = 0
+        self._serialized = None
+        self._serialized_version = None
         self.traits = traits.copy() if traits is not None else []
 
+    @property
+    def traits(self):
+        """ List of Traits belonging to this species """
+        return self._traits
+
+    @traits.setter
+    def traits(self, traits):
+        self._traits = traits
+        self.trait_mask = trait_mask(traits)
+        self.version += 1
+
     def __repr__(self):
         traits_repr = "[{}]".format(", ".join([repr(trait) for trait in self.traits]))
         arguments = [self.food, self.body, self.population, traits_repr]
 
-        if Trait.FAT_TISSUE in self.traits and self.fat_food > self.DEFAULT_FAT_FOOD:
+        if self.trait_mask & FAT_TISSUE and self.fat_food > self.DEFAULT_FAT_FOOD:
             arguments.append(self.fat_food)
             return "Species(food={}, body={}, population={}, traits={}, fat_food={})".format(*arguments)
         else:
@@ -99,27 +137,35 @@ class Species:
         :param right: right neighbor of this species or None
         :return: true if this species is attackable by the attacker, else false
         """
-        prevent_attack_conditions = [
-            # warning call
-            lambda: (((left and left.has_trait(Trait.WARNING_CALL)) or
-                     (right and right.has_trait(Trait.WARNING_CALL))) and
-                     not attacker.has_trait(Trait.AMBUSH)),
-            # other traits
-            lambda: (self.has_trait(Trait.BURROWING) and self.food == self.population),
-            lambda: (self.has_trait(Trait.CLIMBING) and not attacker.has_trait(Trait.CLIMBING)),
-            lambda: (self.has_trait(Trait.HARD_SHELL) and (attacker.attacking_body - self.body) < HARD_SHELL_THRESHOLD),
-            lambda: (self.has_trait(Trait.HERDING) and attacker.population <= self.population),
-            lambda: (self.has_trait(Trait.SYMBIOSIS) and right and right.body > self.body),
-        ]
-
-        return not any(condition() for condition in prevent_attack_conditions)
+        attacker_mask = attacker.trait_mask
+
+        # warning call
+        if (((left is not None and left.trait_mask & WARNING_CALL) or
+                (right is not None and right.trait_mask & WARNING_CALL)) and
+                not attacker_mask & AMBUSH):
+            return False
+
+        # other traits
+        mask = self.trait_mask
+        if mask & BURROWING and self.food == self.population:
+            return False
+        if mask & CLIMBING and not attacker_mask & CLIMBING:
+            return False
+        if mask & HARD_SHELL and (attacker.attacking_body - self.body) < HARD_SHELL_THRESHOLD:
+            return False
+        if mask & HERDING and attacker.population <= self.population:
+            return False
+        if mask & SYMBIOSIS and right is not None and right.body > self.body:
+            return False
+
+        return True
 
     @property
     def attacking_body(self):
         """ Returns the body size of this species when it is attacking another species.
         :return: body size when attacking another species
         """
-        return self.body + self.population if self.has_trait(Trait.PACK_HUNTING) else self.body
+        return self.body + self.population if self.trait_mask & PACK_HUNTING else self.body
 
     def add_trait(self, trait):
         """ Add the given Trait to the species
@@ -129,12 +175,14 @@ class Species:
         if len(self.traits) == self.MAXIMUM_TRAITS:
             raise ValueError("A species can have at most {} traits.".format(self.MAXIMUM_TRAITS))
         self.traits.append(trait)
+        self.trait_mask |= trait.bit
+        self.version += 1
 
     def has_trait(self, trait):
         """ Returns True if this species has the given trait.
         :return: true if this species has the given trait
         """
-        return trait in self.traits
+        return self.trait_mask & trait.bit != 0
 
     def replace_trait(self, slot, trait):
         """ Replaces the trait at the given slot by the given trait. If the existing trait is fat tissue
@@ -147,18 +195,22 @@ class Species:
             self.fat_food = self.MINIMUM_FAT_FOOD
 
         self.traits[slot] = trait
+        self.trait_mask = trait_mask(self.traits)
+        self.version += 1
 
     def grow_population(self):
         """ Grows population of the species once.
           Effect: modifies the species population
         """
         self.population += self.POPULATION_GROWTH
+        self.version += 1
 
     def grow_body(self):
         """ Grows body of the species once.
           Effect: modifies the species body
         """
         self.body += self.BODY_GROWTH
+        self.version += 1
 
     def can_grow_population(self, n=1):
         """ Determines whether this species can add any more population.
@@ -178,13 +230,13 @@ class Species:
         """ Returns true if this species is a carnivore
         :return: true if this species is a carnivore
         """
-        return self.has_trait(Trait.CARNIVORE)
+        return self.trait_mask & CARNIVORE != 0
 
     def is_scavenger(self):
         """ Returns true if this species is a scavenging species.
         :return: true if this species is a scanverger
         """
-        return self.has_trait(Trait.SCAVENGER)
+        return self.trait_mask & SCAVENGER != 0
 
     def is_hungry(self):
         """ Returns true if this species is hungry
@@ -203,7 +255,7 @@ class Species:
         """ Returns true if the species has the fat tissue trait and can store more food on its fat tissue card.
         :return: true if the species can store more food on fat tissue
         """
-        return self.has_trait(Trait.FAT_TISSUE) and self.fat_food < self.body
+        return self.trait_mask & FAT_TISSUE != 0 and self.fat_food < self.body
 
     def feed_one(self, watering_hole):
         """ Attempts to feed this species one bite of food from the watering hole. The species will only be fed
@@ -213,6 +265,7 @@ class Species:
         """
         if self.is_hungry() and watering_hole >= self.BITE_SIZE:
             self.food += self.BITE_SIZE
+            self.version += 1
             return self.BITE_SIZE
         return 0
 
@@ -251,14 +304,17 @@ class Species:
         :param food_tokens: number of food tokens to store
         """
         self.fat_food += food_tokens
+        self.version += 1
 
     def move_fat_tissue(self):
         """ Moves as much fat tissue as possible from the fat tissue storage to food.
         """
         food_need = self.population - self.food
         tokens_to_transfer = min(self.fat_food, food_need)
-        self.food += tokens_to_transfer
-        self.fat_food -= tokens_to_transfer
+        if tokens_to_transfer:
+            self.food += tokens_to_transfer
+            self.fat_food -= tokens_to_transfer
+            self.version += 1
 
     def hurt(self, damage):
         """ Removes `damage' population from this species. If the species has more food than
@@ -269,6 +325,7 @@ class Species:
         self.population -= damage
         if self.food > self.population:
             self.food = self.population
+        self.version += 1
         return self.is_extinct(), self.has_trait(Trait.HORNS)
 
     def end_turn(self):
@@ -279,6 +336,7 @@ class Species:
         :return: (extinct, food tokens to store in bag) tuple, if extinct is true, food tokens value is meaningless
         """
         self.population = min(self.food, self.population)
+        self.version += 1
         if self.is_extinct():
             return True, None
 
@@ -287,7 +345,17 @@ class Species:
         return False, food_tokens
 
     def serialize(self):
-        """ Returns a JSON-compatible representation of the Species
+        """ Returns a JSON-compatible representation of the Species. The representation is cached until the species
+          changes, so it is shared by the callers and must not be modified.
+        :return: JSONSpecies
+        """
+        if self._serialized_version != self.version:
+            self._serialized = self.build_json()
+            self._serialized_version = self.version
+        return self._serialized
+
+    def build_json(self):
+        """ Builds a new JSON-compatible representation of the Species, see serialize
         :return: JSONSpecies
         """
         data = [
@@ -297,7 +365,7 @@ class Species:
             [DataDefinitions.SPECIES_JSON_KEY_TRAITS, [trait.value for trait in self.traits]],
         ]
 
-        if Trait.FAT_TISSUE in self.traits and self.fat_food > self.DEFAULT_FAT_FOOD:
+        if self.trait_mask & FAT_TISSUE and self.fat_food > self.DEFAULT_FAT_FOOD:
             data.append([DataDefinitions.SPECIES_JSON_KEY_FAT_FOOD, self.fat_food])
 
         return data
@@ -328,7 +396,7 @@ class Species:
             self.DISPLAY_KEY_TRAITS: [trait.value for trait in self.traits],
         }
 
-        if Trait.FAT_TISSUE in self.traits and self.fat_food > self.DEFAULT_FAT_FOOD:
+        if self.trait_mask & FAT_TISSUE and self.fat_food > self.DEFAULT_FAT_FOOD:
             data[self.DISPLAY_KEY_FAT_FOOD] = self.fat_food
 
         return data
@@ -1,3 +1,5 @@
+import random
+
 from unittest import TestCase
 
 from .actions import Actions, GrowPopulation, GrowBody, BoardTransfer, ReplaceTrait
@@ -6,7 +8,20 @@ from .species import Species
 from .trait import Trait
 from .trait_card import TraitCard
 
+from ..data_definitions import DataDefinitions
 from ..player.player import Player
+from ..random_states import random_action4, random_player
+
+
+def validates(data, player):
+    """ Checks the given Action4 JSON as before Actions.parse: data definition, deserialize, then validate """
+    if not DataDefinitions.interpret_action4(data):
+        return False
+    try:
+        actions = Actions.deserialize(data)
+    except ValueError:
+        return False
+    return actions.validate(player)
 
 
 class ActionsTestCase(TestCase):
@@ -74,6 +89,26 @@ class ActionsTestCase(TestCase):
         for msg, (actions, species, cards, expected) in cases:
             player = Player(0, species=species, cards=cards)
             self.assertIs(actions.validate(player), expected, msg)
+            self.assertIs(Actions.parse(actions.serialize(), player) is not None, expected, msg)
+
+    def test_parse_same_as_validate(self):
+        rng = random.Random(4506)
+        valid = 0
+        for _ in range(5000):
+            player = random_player(rng)
+            data = random_action4(rng, player)
+            try:
+                expected = validates(data, player)
+            except (ValueError, TypeError):
+                expected = False
+
+            actions = Actions.parse(data, player)
+            self.assertIs(actions is not None, expected, (data, player.serialize()))
+            if actions is not None:
+                self.assertEqual(actions.serialize(), data)
+                valid += 1
+        # the random actions must cover legal actions too
+        self.assertGreater(valid, 100)
 
     def test_serialize_deserialize(self):
         data = [
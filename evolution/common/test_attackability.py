@@ -0,0 +1,70 @@
+import random
+
+from unittest import TestCase
+
+from .attackability import AttackabilityIndex
+from .species import Species
+from .trait import Trait
+from ..random_states import random_species
+
+
+def attackable_indices(attacker, species_list):
+    """ Reference implementation without the index """
+    indices = []
+    for index, species in enumerate(species_list):
+        left = species_list[index - 1] if index > 0 else None
+        right = species_list[index + 1] if index < len(species_list) - 1 else None
+        if species.is_attackable(attacker, left=left, right=right):
+            indices.append(index)
+    return tuple(indices)
+
+
+class AttackabilityIndexTestCase(TestCase):
+
+    def test_attackable_indices(self):
+        attacker = Species(population=4, traits=[Trait.CARNIVORE])
+        board = [Species(), Species(traits=[Trait.WARNING_CALL]), Species(), Species(traits=[Trait.CLIMBING])]
+
+        index = AttackabilityIndex()
+        self.assertEqual(index.attackable_indices(attacker, board), (1,))
+        self.assertEqual(index.attackable_indices(attacker, []), ())
+
+    def test_lookup(self):
+        attacker = Species(population=4, traits=[Trait.CARNIVORE])
+        board = [Species(), Species(traits=[Trait.HERDING], population=3)]
+
+        index = AttackabilityIndex()
+        self.assertEqual(index.attackable_indices(attacker, board), (0, 1))
+        self.assertEqual(len(index), 1)
+
+        # equal species share the entry
+        same_attacker = Species(population=4, traits=[Trait.CARNIVORE])
+        same_board = [Species(), Species(traits=[Trait.HERDING], population=3)]
+        self.assertEqual(index.attackable_indices(same_attacker, same_board), (0, 1))
+        self.assertEqual(len(index), 1)
+
+    def test_species_changed(self):
+        attacker = Species(population=4, traits=[Trait.CARNIVORE])
+        board = [Species(), Species(traits=[Trait.HERDING], population=3)]
+
+        index = AttackabilityIndex()
+        self.assertEqual(index.attackable_indices(attacker, board), (0, 1))
+
+        board[1].grow_population()
+        self.assertEqual(index.attackable_indices(attacker, board), (0,))
+
+        board[1].add_trait(Trait.WARNING_CALL)
+        self.assertEqual(index.attackable_indices(attacker, board), ())
+
+        attacker.add_trait(Trait.AMBUSH)
+        self.assertEqual(index.attackable_indices(attacker, board), (0,))
+        self.assertEqual(len(index), 4)
+
+    def test_random_boards(self):
+        rng = random.Random(4500)
+        index = AttackabilityIndex()
+
+        for _ in range(2000):
+            attacker = random_species(rng)
+            board = [random_species(rng) for _ in range(rng.randint(0, 5))]
+            self.assertEqual(index.attackable_indices(attacker, board), attackable_indices(attacker, board))
@@ -0,0 +1,86 @@
+import json
+import random
+
+from unittest import TestCase
+
+from .binary_protocol import BinaryStreamDecoder, encode_frame, FRAME_HEADER, START_HEADER, JSON_FRAME, \
+    START_FRAME, CHOOSE_FRAME, FEED_NEXT_FRAME
+from ..data_definitions import DataDefinitions
+from ..player.remote_player import RemotePlayer
+from ..random_states import random_species
+
+
+def random_messages(rng):
+    """ Returns random start, choose and feed_next messages as (kind, JSON message) tuples """
+    def los():
+        return [random_species(rng).serialize() for _ in range(rng.randint(0, 5))]
+
+    def lob():
+        return [los() for _ in range(rng.randint(0, 7))]
+
+    def loc():
+        return [card.serialize() for card in rng.sample(DataDefinitions.deck(), rng.randint(0, 10))]
+
+    return [
+        (START_FRAME, [rng.randint(0, 100), rng.randint(0, 1000), los(), loc()]),
+        (CHOOSE_FRAME, [lob(), lob()]),
+        (FEED_NEXT_FRAME, [rng.randint(0, 1000), los(), loc(), rng.randint(0, 100), lob()]),
+        (JSON_FRAME, [rng.randint(0, 5), [["population", 0, 1]], [], [[0, 1]], []]),
+        (JSON_FRAME, "game over"),
+    ]
+
+
+class BinaryProtocolTestCase(TestCase):
+
+    def test_round_trip(self):
+        rng = random.Random(21)
+        decoder = BinaryStreamDecoder()
+        for _ in range(300):
+            for kind, message in random_messages(rng):
+                decoder.feed(encode_frame(message, kind))
+                self.assertEqual(decoder.decode(), (True, message))
+        self.assertEqual(decoder.decode(), (False, None))
+
+    def test_split_stream(self):
+        rng = random.Random(21)
+        messages = [message for _ in range(20) for message in random_messages(rng)]
+        stream = b"".join(encode_frame(message, kind) for kind, message in messages)
+
+        decoder = BinaryStreamDecoder()
+        decoded = []
+        offset = 0
+        while offset < len(stream):
+            size = rng.randint(1, 64)
+            decoder.feed(stream[offset:offset + size])
+            offset += size
+            self.assertEqual(decoder.decode(final=True, peek=True)[0], decoder.decode(peek=True)[0])
+            complete, value = decoder.decode()
+            while complete:
+                decoded.append(value)
+                complete, value = decoder.decode()
+        self.assertEqual(decoded, [message for _, message in messages])
+
+    def test_smaller_than_json(self):
+        rng = random.Random(21)
+        for kind, message in random_messages(rng)[:3]:
+            self.assertLess(len(encode_frame(message, kind)), len(json.dumps(message)) / 4)
+
+    def test_malformed_frame(self):
+        decoder = BinaryStreamDecoder()
+        # a list of one species without its record
+        decoder.feed(FRAME_HEADER.pack(START_FRAME, START_HEADER.size + 1) + START_HEADER.pack(1, 2) + b"\x01")
+        with self.assertRaises(ValueError):
+            decoder.decode()
+
+        decoder = BinaryStreamDecoder()
+        decoder.feed(b"\x09\x00\x00\x00\x00")
+        with self.assertRaises(ValueError):
+            decoder.decode()
+
+    def test_parse_hello(self):
+        self.assertEqual(RemotePlayer.parse_hello("hi"), ("hi", set()))
+        self.assertEqual(RemotePlayer.parse_hello(["hi", "binary"]), ("hi", {"binary"}))
+        self.assertEqual(RemotePlayer.parse_hello(["hi", "delta", "binary"]), ("hi", {"binary", "delta"}))
+        for message in [["hi", "json"], [1, "binary"], ["hi", "binary", 1], ["hi"], 1, None,
+                        ["hi", ["binary"]], ["hi", {"binary": 1}]]:
+            self.assertIsNone(RemotePlayer.parse_hello(message))
@@ -0,0 +1,58 @@
+import threading
+import time
+
+from unittest import TestCase
+
+from .deadline import Deadline, Watchdog
+
+
+class DeadlineTestCase(TestCase):
+
+    def test_remaining(self):
+        deadline = Deadline(10)
+        self.assertFalse(deadline.expired())
+        self.assertTrue(9 < deadline.remaining() <= 10)
+        self.assertEqual(deadline.limit(1), 1)
+        self.assertTrue(9 < deadline.limit(None) <= 10)
+
+        deadline = Deadline(0)
+        self.assertTrue(deadline.expired())
+        self.assertEqual(deadline.remaining(), 0)
+        self.assertEqual(deadline.limit(5), 0)
+
+    def test_activate(self):
+        deadline = Deadline(1)
+        previous = Deadline.activate(deadline)
+        self.assertIs(Deadline.current(), deadline)
+        self.assertIs(Deadline.activate(previous), deadline)
+        self.assertIs(Deadline.current(), previous)
+
+
+class WatchdogTestCase(TestCase):
+
+    def test_fires(self):
+        watchdog = Watchdog()
+        token = watchdog.watch(Deadline(0.05))
+        with self.assertRaises(TimeoutError):
+            while True:
+                pass
+        self.assertFalse(watchdog.cancel(token))
+
+    def test_cancel(self):
+        watchdog = Watchdog()
+        tokens = [watchdog.watch(Deadline(0.05)) for _ in range(10)]
+        for token in tokens:
+            self.assertTrue(watchdog.cancel(token))
+        # busy wait past the deadlines, nothing may be raised
+        end = time.monotonic() + 0.1
+        while time.monotonic() < end:
+            pass
+        self.assertEqual(watchdog.watched, {})
+
+    def test_on_expired(self):
+        watchdog = Watchdog()
+        expired = threading.Event()
+        token = watchdog.watch(Deadline(0.05), on_expired=expired.set)
+        # nothing is raised in this thread
+        self.assertTrue(expired.wait(5))
+        self.assertFalse(watchdog.cancel(token))
@@ -0,0 +1,69 @@
+import json
+
+from unittest import TestCase
+
+from .delta_state import diff_state, apply_delta, is_delta_message
+from ..dealer.dealer import Dealer
+from ..player.dummy_player import DummyPlayer
+
+
+class RecordingPlayer(DummyPlayer):
+    """ Dummy player keeping the States it receives with feed_next, grouped by turn """
+
+    def __init__(self):
+        super().__init__()
+        self.turns = []
+
+    def start(self, watering_hole, player_state):
+        self.turns.append([])
+        return super().start(watering_hole, player_state)
+
+    def feed_next(self, player_state, players, watering_hole):
+        species, bag, cards = player_state
+        self.turns[-1].append(json.loads(json.dumps([bag, species, cards, watering_hole, players])))
+        return super().feed_next(player_state, players, watering_hole)
+
+
+class DeltaStateTestCase(TestCase):
+
+    def test_game_states(self):
+        players = [RecordingPlayer() for _ in range(8)]
+        dealer = Dealer()
+        dealer.add_external_players(players)
+        dealer.run_game()
+
+        full_size = delta_size = deltas = 0
+        for player in players:
+            for states in player.turns:
+                for previous, state in zip(states, states[1:]):
+                    delta = diff_state(previous, state)
+                    if delta is None:
+                        self.assertNotEqual(len(previous[4]), len(state[4]))
+                        continue
+                    self.assertTrue(is_delta_message(delta))
+                    self.assertEqual(apply_delta(previous, delta), state)
+                    full_size += len(json.dumps(state))
+                    delta_size += len(json.dumps(delta))
+                    deltas += 1
+        self.assertGreater(deltas, 0)
+        self.assertLess(delta_size, full_size / 2)
+
+    def test_changes(self):
+        species = [["food", 0], ["body", 0], ["population", 1], ["traits", []]]
+        fed = [["food", 1], ["body", 0], ["population", 1], ["traits", []]]
+        previous = [0, [species, species], [[1, "carnivore"]], 5, [[species], []]]
+
+        self.assertEqual(diff_state(previous, previous), ["delta", 5, []])
+
+        state = [2, [species, fed], [], 4, [[], [fed]]]
+        delta = diff_state(previous, state)
+        self.assertEqual(delta, ["delta", 4, [["bag", 2], ["cards", []], [[0, 1], fed], [[1], []], [[2], [fed]]]])
+        self.assertEqual(apply_delta(previous, delta), state)
+        self.assertEqual(previous, [0, [species, species], [[1, "carnivore"]], 5, [[species], []]])
+
+        self.assertIsNone(diff_state(previous, [0, [species], [], 5, [[species]]]))
+        with self.assertRaises(ValueError):
+            apply_delta(previous, ["delta", 5, [[[3], []]]])
+        with self.assertRaises(ValueError):
+            apply_delta(previous, ["delta", 5, [[[2, 0], species]]])
+        self.assertFalse(is_delta_message([1, 2, 3]))
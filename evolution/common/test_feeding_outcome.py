@@ -1,10 +1,29 @@
+import random
+
 from unittest import TestCase
 
 from .feeding_outcome import FeedingOutcome, VegetarianFeeding, CarnivoreFeeding, FatTissueFeeding, NoFeeding, CannotFeed
 from ..common.trait import Trait
 from ..common.species import Species
+from ..data_definitions import DataDefinitions
 from ..dealer.dealer import Dealer
 from ..player.player import Player
+from ..random_states import random_board
+
+
+def random_feeding(rng):
+    """ Returns a random Feeding JSON, sometimes malformed """
+    def index():
+        return rng.choice([-1, True, "0", 1.0]) if rng.random() < 0.05 else rng.randrange(5)
+
+    return rng.choice([
+        lambda: False,
+        lambda: None,
+        index,
+        lambda: [index(), rng.randrange(8)],
+        lambda: [index(), index(), index()],
+        lambda: [index()] * rng.choice([0, 1, 4]),
+    ])()
 
 
 class FeedingOutcomeTestCase(TestCase):
@@ -70,3 +89,30 @@ class FeedingOutcomeTestCase(TestCase):
         self.assertFalse(FatTissueFeeding(1, 1).validate(dealer))
         self.assertFalse(FatTissueFeeding(2, 5).validate(dealer))
         self.assertFalse(FatTissueFeeding(2, 6).validate(dealer))
+
+    def test_parse_same_as_validate(self):
+        rng = random.Random(17)
+        valid = 0
+        for _ in range(5000):
+            player = Player(1, species=random_board(rng))
+            others = [Player(name, species=random_board(rng)) for name in range(2, rng.randint(2, 5))]
+            watering_hole = rng.randint(1, 10)
+            data = random_feeding(rng)
+
+            expected = None
+            if DataDefinitions.feeding_outcome(data):
+                feeding = FeedingOutcome.deserialize(data)
+                legal = [NoFeeding()]
+                legal += player.get_possible_vegetarian_feedings()
+                legal += player.get_possible_fat_tissue_feedings(watering_hole, include_suboptimal=True)
+                legal += player.get_possible_carnivore_feedings(others + [player])
+                if feeding in legal:
+                    expected = feeding
+
+            parsed = FeedingOutcome.parse(data, player, others, watering_hole)
+            self.assertEqual(parsed, expected, data)
+            if parsed is not None:
+                self.assertEqual(parsed.serialize(), data)
+                valid += 1
+        # the random feedings must cover legal feedings too
+        self.assertGreater(valid, 500)
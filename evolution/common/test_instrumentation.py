@@ -0,0 +1,114 @@
+import json
+import math
+import os
+import random
+import tempfile
+
+from unittest import TestCase
+
+from .instrumentation import Instrumentation, LatencyHistogram, Traffic, ALL_PLAYERS, EXTERNAL_PLAYER_CALL, STEP1
+
+
+class LatencyHistogramTestCase(TestCase):
+
+    def test_empty(self):
+        summary = LatencyHistogram().serialize()
+        self.assertEqual(summary["count"], 0)
+        self.assertIsNone(summary["mean"])
+        self.assertIsNone(summary["p99"])
+        self.assertEqual(summary["buckets"], [])
+
+    def test_small_values_exact(self):
+        histogram = LatencyHistogram()
+        for microseconds in range(1, 101):
+            histogram.record(microseconds / 1000000)
+
+        self.assertEqual(histogram.count, 100)
+        self.assertEqual(histogram.min, 1)
+        self.assertEqual(histogram.max, 100)
+        self.assertEqual(histogram.percentile(50), 50)
+        self.assertEqual(histogram.percentile(99), 99)
+        self.assertEqual(histogram.percentile(100), 100)
+
+    def test_relative_error(self):
+        rng = random.Random(24)
+        values = sorted(rng.randint(1, 10 ** 8) for _ in range(5000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value / 1000000)
+
+        # every bucket holds far fewer values than the histogram
+        self.assertLess(len(histogram.counts), len(values) // 2)
+        for percentile in [1, 25, 50, 90, 99, 99.9]:
+            exact = values[math.ceil(len(values) * percentile / 100) - 1]
+            estimate = histogram.percentile(percentile)
+            self.assertLessEqual(abs(estimate - exact), exact / 2 ** LatencyHistogram.SUB_BUCKET_BITS)
+
+    def test_merge(self):
+        rng = random.Random(7)
+        first, second, both = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for _ in range(1000):
+            seconds = rng.random()
+            (first if rng.random() < 0.3 else second).record(seconds)
+            both.record(seconds)
+
+        first.merge(second)
+        first.merge(LatencyHistogram())
+        self.assertEqual(first.serialize(), both.serialize())
+
+
+class InstrumentationTestCase(TestCase):
+
+    def test_external_player_call(self):
+        instrumentation = Instrumentation()
+        instrumentation.external_player_call(1, "choose", 0.002)
+        instrumentation.external_player_call(2, "feed_next", 0.001)
+        instrumentation.external_player_call(2, "feed_next", 0.003)
+
+        self.assertEqual(instrumentation.histograms[EXTERNAL_PLAYER_CALL].count, 3)
+        self.assertEqual(instrumentation.histograms[EXTERNAL_PLAYER_CALL + ".feed_next"].count, 2)
+        self.assertEqual(instrumentation.players[1][EXTERNAL_PLAYER_CALL + ".choose"].count, 1)
+        self.assertEqual(instrumentation.players[2][EXTERNAL_PLAYER_CALL].max, 3000)
+
+    def test_timed(self):
+        instrumentation = Instrumentation()
+        self.assertEqual(instrumentation.timed(STEP1, max, 1, 2), 2)
+        with self.assertRaises(ValueError):
+            instrumentation.timed(STEP1, int, "x")
+        self.assertEqual(instrumentation.histograms[STEP1].count, 2)
+
+    def test_merge_without_players(self):
+        game = Instrumentation()
+        game.game_over()
+        game.record(STEP1, 0.01)
+        game.external_player_call(1, "start", 0.001)
+        game.traffic_of(1).bytes_sent = 10
+        game.traffic_of(2).bytes_sent = 5
+
+        total = Instrumentation()
+        total.merge(game, players=False)
+        total.merge(game, players=False)
+
+        self.assertEqual(total.games, 2)
+        self.assertEqual(total.histograms[STEP1].count, 2)
+        self.assertEqual(total.players, {})
+        self.assertEqual(list(total.traffic), [ALL_PLAYERS])
+        self.assertEqual(total.traffic[ALL_PLAYERS].bytes_sent, 30)
+
+    def test_dump(self):
+        instrumentation = Instrumentation()
+        instrumentation.record(STEP1, 0.5)
+        instrumentation.external_player_call(3, "start", 0.25)
+        traffic = instrumentation.traffic_of(3)
+        traffic.merge(Traffic())
+        traffic.messages_sent += 1
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "stats.json")
+            instrumentation.dump(path)
+            with open(path) as f:
+                data = json.load(f)
+
+        self.assertEqual(data["timings"][STEP1]["p50"], 500)
+        self.assertEqual(data["players"]["3"][EXTERNAL_PLAYER_CALL]["count"], 1)
+        self.assertEqual(data["traffic"]["3"]["messages_sent"], 1)
@@ -0,0 +1,82 @@
+import json
+
+from unittest import TestCase
+
+from .json_stream import JSONStreamDecoder
+
+
+class JSONStreamDecoderTestCase(TestCase):
+
+    values = [
+        [],
+        None,
+        True,
+        False,
+        "test",
+        12346789,
+        0.00000001,
+        {},
+        [[["food", 0], ["body", 0], ["population", 1], ["traits", ["fat-tissue"]], ["fat-food", 1]]],
+        "ünicøde",
+    ]
+
+    def test_decode_empty(self):
+        decoder = JSONStreamDecoder()
+        self.assertEqual(decoder.decode(), (False, None))
+        self.assertEqual(decoder.decode(final=True), (False, None))
+        decoder.feed(b"  \n ")
+        self.assertEqual(decoder.decode(), (False, None))
+
+    def test_decode_single(self):
+        for value in self.values:
+            decoder = JSONStreamDecoder()
+            decoder.feed(json.dumps(value).encode("utf-8"))
+            self.assertEqual(decoder.decode(final=True), (True, value))
+            self.assertEqual(decoder.buffer, "")
+
+    def test_decode_byte_by_byte(self):
+        data = " ".join(json.dumps(value) for value in self.values).encode("utf-8")
+        decoder = JSONStreamDecoder()
+        received = []
+        for i in range(len(data)):
+            decoder.feed(data[i:i + 1])
+            complete, value = decoder.decode()
+            if complete:
+                received.append(value)
+
+        complete, value = decoder.decode(final=True)
+        if complete:
+            received.append(value)
+
+        self.assertEqual(received, self.values)
+
+    def test_decode_leftover(self):
+        decoder = JSONStreamDecoder()
+        decoder.feed(b'[1, 2] {"a": [')
+        self.assertEqual(decoder.decode(), (True, [1, 2]))
+        self.assertEqual(decoder.decode(), (False, None))
+        decoder.feed(b'3]}"rest')
+        self.assertEqual(decoder.decode(), (True, {"a": [3]}))
+        self.assertEqual(decoder.decode(final=True), (False, None))
+        decoder.feed(b'"')
+        self.assertEqual(decoder.decode(), (True, "rest"))
+
+    def test_decode_number(self):
+        decoder = JSONStreamDecoder()
+        decoder.feed(b"12")
+        self.assertEqual(decoder.decode(), (False, None))
+        decoder.feed(b"3.")
+        self.assertEqual(decoder.decode(), (False, None))
+        decoder.feed(b"5e")
+        self.assertEqual(decoder.decode(), (False, None))
+        self.assertEqual(decoder.decode(final=True, peek=True), (True, 123.5))
+        decoder.feed(b"2\n")
+        self.assertEqual(decoder.decode(), (True, 12350.0))
+
+    def test_decode_split_character(self):
+        data = json.dumps("ü", ensure_ascii=False).encode("utf-8")
+        decoder = JSONStreamDecoder()
+        for i in range(len(data)):
+            self.assertEqual(decoder.decode(), (False, None))
+            decoder.feed(data[i:i + 1])
+        self.assertEqual(decoder.decode(), (True, "ü"))
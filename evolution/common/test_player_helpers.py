@@ -1,6 +1,8 @@
 import time
 
+from threading import Thread
 from unittest import TestCase
+from .deadline import Deadline
 from .player_helpers import ExternalPlayerCall, ExternalPlayerIssue
 
 
@@ -35,3 +37,49 @@ class ExternalPlayerCallTestCase(TestCase):
             value = 1234
 
         self.assertEqual(value, 1234)
+
+    def test_timeout_fraction(self):
+        start = time.monotonic()
+        with self.assertRaises(ExternalPlayerIssue):
+            with ExternalPlayerCall(0.05):
+                while True:
+                    pass
+        self.assertLess(time.monotonic() - start, 1)
+
+    def test_timeout_after_return(self):
+        # a call that finishes late is a timeout even if it could not be interrupted
+        with self.assertRaises(ExternalPlayerIssue):
+            with ExternalPlayerCall(0.01):
+                time.sleep(0.05)
+
+    def test_timeout_threads(self):
+        results = {}
+
+        def call(name, timeout, duration):
+            try:
+                with ExternalPlayerCall(timeout):
+                    end = time.monotonic() + duration
+                    while time.monotonic() < end:
+                        pass
+                results[name] = True
+            except ExternalPlayerIssue:
+                results[name] = False
+
+        threads = [Thread(target=call, args=("slow", 0.05, 10)),
+                   Thread(target=call, args=("fast", 1, 0.1)),
+                   Thread(target=call, args=("slow2", 0.1, 10))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, {"slow": False, "fast": True, "slow2": False})
+
+    def test_nested_deadline(self):
+        self.assertIsNone(Deadline.current())
+        with ExternalPlayerCall(2) as outer:
+            self.assertIs(Deadline.current(), outer)
+            with ExternalPlayerCall(1) as inner:
+                self.assertIs(Deadline.current(), inner)
+            self.assertIs(Deadline.current(), outer)
+        self.assertIsNone(Deadline.current())
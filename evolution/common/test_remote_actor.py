@@ -1,9 +1,13 @@
 import json
 import socket
+import time
 
 from unittest import TestCase
 from unittest.mock import MagicMock
 
+from .deadline import Deadline
+from .instrumentation import Traffic
+from .player_helpers import ExternalPlayerCall, ExternalPlayerIssue
 from .remote_actor import RemoteActor
 
 
@@ -71,3 +75,68 @@ class RemoteActorTestCase(TestCase):
         self.assertEqual(len(values), len(received))
         for expected, actual in zip(values, received):
             self.assertEqual(expected, actual)
+
+    def test_receive_chunks(self):
+        sock = MagicMock()
+        sock.gettimeout.return_value = 5
+        ra = RemoteActor(sock)
+
+        sock.recv.side_effect = [b'[1, [2', b', 3]] "a', b'b" 4', b'5\n', b'']
+        self.assertEqual(ra.receive(), [1, [2, 3]])
+        self.assertEqual(ra.receive(), "ab")
+        self.assertEqual(ra.receive(), 45)
+        with self.assertRaises(ConnectionError):
+            ra.receive()
+
+    def test_send_receive(self):
+        sender, receiver = socket.socketpair()
+        self.addCleanup(sender.close)
+        self.addCleanup(receiver.close)
+        receiver.settimeout(5)
+
+        values = [3, [0, [["population", 0, 1]], [], [[2, 3]], []], False, 12.5]
+        ra_sender, ra_receiver = RemoteActor(sender), RemoteActor(receiver)
+        for value in values:
+            ra_sender.send(value)
+        for value in values:
+            self.assertEqual(ra_receiver.receive(), value)
+
+    def test_traffic(self):
+        sender, receiver = socket.socketpair()
+        self.addCleanup(sender.close)
+        self.addCleanup(receiver.close)
+        receiver.settimeout(5)
+
+        values = [[1, 2], "ok", {"a": None}]
+        ra_sender, ra_receiver = RemoteActor(sender), RemoteActor(receiver)
+        ra_sender.traffic, ra_receiver.traffic = Traffic(), Traffic()
+        for value in values:
+            ra_sender.send(value)
+        for value in values:
+            ra_receiver.receive()
+
+        size = sum(len(RemoteActor.encode(value)) for value in values)
+        self.assertEqual(ra_sender.traffic.serialize(),
+                         {"bytes_sent": size, "bytes_received": 0, "messages_sent": 3, "messages_received": 0})
+        self.assertEqual(ra_receiver.traffic.serialize(),
+                         {"bytes_sent": 0, "bytes_received": size, "messages_sent": 0, "messages_received": 3})
+
+    def test_deadline_during_receive(self):
+        sender, receiver = socket.socketpair()
+        self.addCleanup(sender.close)
+        self.addCleanup(receiver.close)
+        receiver.settimeout(5)
+
+        ra = RemoteActor(receiver)
+        start = time.monotonic()
+        with self.assertRaises(ExternalPlayerIssue):
+            with ExternalPlayerCall(0.05, interrupt=ra.interrupt):
+                # a later deadline than the call's, so the watchdog fires while recv blocks
+                ra.receive(Deadline(5))
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(receiver.gettimeout(), 5)
+
+        # no exception is left pending in this thread
+        end = time.monotonic() + 0.1
+        while time.monotonic() < end:
+            pass
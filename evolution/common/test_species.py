@@ -1,7 +1,11 @@
 import unittest
 
+from unittest.mock import patch
+
 from .species import Species
 from .trait import Trait, HARD_SHELL_THRESHOLD
+from ..dealer.dealer import Dealer
+from ..player.dummy_player import DummyPlayer
 
 
 class TestSpeciesSerialize(unittest.TestCase):
@@ -33,6 +37,31 @@ class TestSpeciesSerialize(unittest.TestCase):
         self.assertTrue(species.has_trait(Trait.FAT_TISSUE))
         self.assertFalse(species.has_trait(Trait.LONG_NECK))
 
+    def test_trait_mask(self):
+        species = Species(traits=[Trait.CARNIVORE, Trait.AMBUSH])
+        self.assertEqual(species.trait_mask, Trait.CARNIVORE.bit | Trait.AMBUSH.bit)
+
+        species.add_trait(Trait.FAT_TISSUE)
+        self.assertTrue(species.has_trait(Trait.FAT_TISSUE))
+        self.assertEqual(species.trait_mask, Trait.CARNIVORE.bit | Trait.AMBUSH.bit | Trait.FAT_TISSUE.bit)
+
+        species.replace_trait(0, Trait.SCAVENGER)
+        self.assertFalse(species.has_trait(Trait.CARNIVORE))
+        self.assertFalse(species.is_carnivore())
+        self.assertTrue(species.is_scavenger())
+        self.assertEqual(species.trait_mask, Trait.SCAVENGER.bit | Trait.AMBUSH.bit | Trait.FAT_TISSUE.bit)
+
+        species.traits = [Trait.HORNS]
+        self.assertTrue(species.has_trait(Trait.HORNS))
+        self.assertFalse(species.has_trait(Trait.AMBUSH))
+        self.assertEqual(species.trait_mask, Trait.HORNS.bit)
+
+        # every trait has its own bit
+        self.assertEqual(len({trait.bit for trait in Trait}), len(Trait))
+        all_traits = Species()
+        all_traits.traits = list(Trait)
+        self.assertTrue(all(all_traits.has_trait(trait) for trait in Trait))
+
     def test_attacking_body(self):
         species = Species(body=3, population=4, traits=[])
         self.assertEqual(species.attacking_body, species.body)
@@ -202,3 +231,49 @@ class TestSpeciesSerialize(unittest.TestCase):
         self.assertEqual(species.display(), species_expected)
         self.assertEqual(species_fat.display(), species_fat_expected)
         self.assertEqual(species_fat_gt_1.display(), species_fat_gt_1_expected)
+
+    def test_serialize_cached(self):
+        species = Species(food=1, population=3, body=2, traits=[Trait.FAT_TISSUE, Trait.CARNIVORE])
+        self.assertIs(species.serialize(), species.serialize())
+
+        mutators = [
+            lambda: species.feed_one(5),
+            lambda: species.store_fat(1),
+            lambda: species.move_fat_tissue(),
+            lambda: species.grow_population(),
+            lambda: species.grow_body(),
+            lambda: species.hurt(1),
+            lambda: species.replace_trait(1, Trait.HORNS),
+            lambda: species.add_trait(Trait.COOPERATION),
+            lambda: species.end_turn(),
+        ]
+        for mutator in mutators:
+            serialized = species.serialize()
+            version = species.version
+            mutator()
+            self.assertGreater(species.version, version)
+            self.assertIsNot(species.serialize(), serialized)
+            self.assertEqual(species.serialize(), species.build_json())
+
+    def test_serialize_unchanged(self):
+        species = Species(food=2, population=2, traits=[Trait.FORAGING])
+        serialized = species.serialize()
+        self.assertEqual(species.feed_one(5), 0)
+        species.move_fat_tissue()
+        self.assertIs(species.serialize(), serialized)
+
+    def test_serialize_cache_consistent(self):
+        serialize = Species.serialize
+        calls = []
+
+        def checked_serialize(species):
+            data = serialize(species)
+            calls.append(species)
+            self.assertEqual(data, species.build_json())
+            return data
+
+        with patch.object(Species, "serialize", checked_serialize):
+            d = Dealer()
+            d.add_external_players([DummyPlayer() for _ in range(8)])
+            d.run_game()
+        self.assertTrue(calls)
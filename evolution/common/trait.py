@@ -30,6 +30,20 @@ traits = [
     "warning-call",
 ]
 
+# bit representing each trait in a trait mask
+TRAIT_BITS = {trait: 1 << idx for idx, trait in enumerate(traits)}
+
+
+def trait_mask(trait_list):
+    """ Returns the trait mask of the given traits, i.e. the bits of all traits combined
+    :param trait_list: iterable of Traits
+    :return: integer with the bit of every given trait set
+    """
+    mask = 0
+    for trait in trait_list:
+        mask |= trait.bit
+    return mask
+
 
 class TraitEnum(Enum):
 
@@ -48,5 +62,10 @@ class TraitEnum(Enum):
     def __hash__(self):
         return hash(self.value)
 
+    @property
+    def bit(self):
+        """ Returns the bit representing this trait in a trait mask """
+        return TRAIT_BITS[self.value]
+
 
 Trait = TraitEnum("Trait", names={trait.replace("-", "_").upper(): trait for trait in traits})
@@ -9,6 +9,8 @@ from .trait import Trait
 class TraitCard:
     """ Represents an Evolution trait card, containing a value and trait. """
 
+    __slots__ = ("value", "trait")
+
     # inclusive
     FOOD_VALUE_MIN = -3
     FOOD_VALUE_MAX = 3
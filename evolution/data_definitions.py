@@ -2,15 +2,157 @@
 
     Codifies Evolution data definitions.
 
+    The predicates of compound data (dealer, player, species, trait_card and action4) are specialized functions that
+    check each field directly, compiled from the Configs of the data, see compile_record. The interpret_* methods
+    check the same definitions with the generic unpack interpreter and serve as a reference.
+
 """
 
 from .common.trait import Trait
 from .common.trait_card import TraitCard
 
 
+OPTIONAL = "optional"
+
+
+def is_integer(value):
+    """ Same as DataDefinitions.integer """
+    return isinstance(value, int) and value is not True and value is not False
+
+
+def is_natural(value):
+    """ Same as DataDefinitions.natural """
+    return isinstance(value, int) and value is not True and value is not False and value >= 0
+
+
+def is_natural_plus(value):
+    """ Same as DataDefinitions.natural_plus """
+    return isinstance(value, int) and value is not True and value is not False and value >= 1
+
+
+def is_array(value):
+    """ Same as DataDefinitions.array """
+    return isinstance(value, list)
+
+
+# trait names and Traits -> Trait
+TRAITS = dict([(trait.value, trait) for trait in Trait] + [(trait, trait) for trait in Trait])
+# trait names and Traits -> range of the food values of their cards
+CARD_FOOD_VALUES = {key: TraitCard.FOOD_VALUE_CARNIVORE_RANGE if trait == Trait.CARNIVORE
+                    else TraitCard.FOOD_VALUE_RANGE for key, trait in TRAITS.items()}
+
+
+def is_trait(value):
+    """ Same as DataDefinitions.trait """
+    return isinstance(value, (str, Trait)) and value in TRAITS
+
+
+def is_trait_card(value):
+    """ Same as DataDefinitions.trait_card """
+    if not isinstance(value, list) or len(value) != 2:
+        return False
+    food_value, trait = value
+    food_values = CARD_FOOD_VALUES.get(trait) if isinstance(trait, (str, Trait)) else None
+    return food_values is not None and is_integer(food_value) and food_value in food_values
+
+
+def compile_array_of(predicate):
+    """ Compiles a predicate of arrays of items that all satisfy the given predicate
+    :param predicate: predicate of an item
+    :return: predicate of an array
+    """
+    def array_of(value):
+        return isinstance(value, list) and all(map(predicate, value))
+
+    return array_of
+
+
+def compile_record(config, fields=None):
+    """ Compiles a Config as used by unpack into a predicate accepting exactly the data unpack accepts, without
+      building a dictionary of values or raising exceptions
+    :param config: list of ConfigItems
+    :param fields: dictionary from an ObjectAttribute to a predicate replacing the predicate of its ConfigItem
+    :return: predicate of Evolution-style JSON data
+    """
+    fields = fields or {}
+    items = tuple((expected_key, fields.get(key, predicate),
+                   len(optional) == 1 and optional[0] is OPTIONAL)
+                  for expected_key, key, predicate, *optional in config)
+    required = sum(1 for _, _, optional in items if not optional)
+
+    def record(data):
+        if not isinstance(data, list):
+            return False
+        data_len = len(data)
+        if data_len < required:
+            return False
+
+        data_key = 0
+        for expected_key, predicate, optional in items:
+            if data_key == data_len:
+                if optional:
+                    continue
+                return False
+            item = data[data_key]
+            if not isinstance(item, list) or len(item) != 2:
+                return False
+            actual_key, value = item
+            if expected_key != actual_key:
+                if optional:
+                    continue
+                return False
+            if not predicate(value):
+                return False
+            data_key += 1
+        return True
+
+    return record
+
+
+def compile_action4():
+    """ Compiles the predicate of an Action4, same as DataDefinitions.interpret_action4 for JSON data """
+    def grow(name):
+        def grow_action(value):
+            return (isinstance(value, list) and len(value) == 3 and value[0] == name and
+                    is_natural(value[1]) and is_natural(value[2]))
+        return grow_action
+
+    grow_population = compile_array_of(grow("population"))
+    grow_body = compile_array_of(grow("body"))
+    board_transfer = compile_array_of(compile_array_of(is_natural))
+    replace_trait = compile_array_of(lambda value: isinstance(value, list) and len(value) == 3 and
+                                     all(map(is_natural, value)))
+
+    def action4(value):
+        if not isinstance(value, list) or len(value) != 5:
+            return False
+        discard, gp, gb, bt, rt = value
+        return (is_natural(discard) and grow_population(gp) and grow_body(gb) and board_transfer(bt) and
+                replace_trait(rt))
+
+    return action4
+
+
+def compile_dealer(player):
+    """ Compiles the predicate of a Dealer configuration
+    :param player: predicate of a player
+    :return: predicate of a Dealer
+    """
+    players = compile_array_of(player)
+    cards = compile_array_of(is_trait_card)
+
+    def dealer(value):
+        if not isinstance(value, list) or len(value) != 3:
+            return False
+        lop, watering_hole, loc = value
+        return players(lop) and is_natural(watering_hole) and cards(loc)
+
+    return dealer
+
+
 class DataDefinitions:
 
-    OPTIONAL = "optional"
+    OPTIONAL = OPTIONAL
     NAT_MAX = 7
 
     PLAYER_JSON_KEY_IDX = "id"
@@ -24,6 +166,30 @@ class DataDefinitions:
     SPECIES_JSON_KEY_TRAITS = "traits"
     SPECIES_JSON_KEY_FAT_FOOD = "fat-food"
 
+    # Configs of a player and a species, see unpack
+    PLAYER_CONFIG = [
+        [PLAYER_JSON_KEY_IDX, "idx", is_natural_plus],
+        [PLAYER_JSON_KEY_SPECIES, "species", is_array],
+        [PLAYER_JSON_KEY_BAG, "bag", is_natural],
+        [PLAYER_JSON_KEY_CARDS, "cards", is_array, OPTIONAL],
+    ]
+    SPECIES_CONFIG = [
+        [SPECIES_JSON_KEY_FOOD, "food", is_natural],
+        [SPECIES_JSON_KEY_BODY, "body", is_natural],
+        [SPECIES_JSON_KEY_POPULATION, "population", is_natural],
+        [SPECIES_JSON_KEY_TRAITS, "traits", is_array],
+        [SPECIES_JSON_KEY_FAT_FOOD, "fat_food", is_natural, OPTIONAL],
+    ]
+
+    # predicates of compound data, compiled into functions that check each field directly; the interpret_*
+    # methods check the same definitions with the generic unpack interpreter
+    trait_card = staticmethod(is_trait_card)
+    species = staticmethod(compile_record(SPECIES_CONFIG, {"traits": compile_array_of(is_trait)}))
+    player = staticmethod(compile_record(PLAYER_CONFIG, {"species": compile_array_of(species.__func__),
+                                                         "cards": compile_array_of(is_trait_card)}))
+    dealer = staticmethod(compile_dealer(player.__func__))
+    action4 = staticmethod(compile_action4())
+
     @staticmethod
     def null(value):
         return value is None
@@ -78,8 +244,8 @@ class DataDefinitions:
             return False
 
     @classmethod
-    def trait_card(cls, value):
-        """ Represents a TraitCard """
+    def interpret_trait_card(cls, value):
+        """ Represents a TraitCard, checked with the generic predicates """
         if not cls.array(value):
             return False
 
@@ -96,53 +262,38 @@ class DataDefinitions:
             return False
 
     @classmethod
-    def dealer(cls, value):
-        """ Represents a Dealer """
+    def interpret_dealer(cls, value):
+        """ Represents a Dealer, checked with the generic interpreter """
         try:
             assert DataDefinitions.array(value)
             assert len(value) == 3
             lop, watering_hole, loc = value
-            assert DataDefinitions.array(lop) and all(cls.player(p) for p in lop)
+            assert DataDefinitions.array(lop) and all(cls.interpret_player(p) for p in lop)
             assert DataDefinitions.natural(watering_hole) and cls.natural(watering_hole)
-            assert DataDefinitions.array(loc) and all(cls.trait_card(tc) for tc in loc)
+            assert DataDefinitions.array(loc) and all(cls.interpret_trait_card(tc) for tc in loc)
         except AssertionError:
             return False
         return True
 
     @classmethod
-    def player(cls, value):
-        """ Represents a player """
+    def interpret_player(cls, value):
+        """ Represents a player, checked with the generic interpreter """
         try:
-            data_config = [
-                [cls.PLAYER_JSON_KEY_IDX, "idx", cls.natural_plus],
-                [cls.PLAYER_JSON_KEY_SPECIES, "species", cls.array],
-                [cls.PLAYER_JSON_KEY_BAG, "bag", cls.natural],
-                [cls.PLAYER_JSON_KEY_CARDS, "cards", cls.array, cls.OPTIONAL],
-            ]
-
-            parameters = unpack(data_config, value)
-            assert all(cls.species(species) for species in parameters['species'])
+            parameters = unpack(cls.PLAYER_CONFIG, value)
+            assert all(cls.interpret_species(species) for species in parameters['species'])
 
             if "cards" in parameters:
-                assert all(cls.trait_card(card) for card in parameters['cards'])
+                assert all(cls.interpret_trait_card(card) for card in parameters['cards'])
 
         except AssertionError:
             return False
         return True
 
     @classmethod
-    def species(cls, value):
-        """ Represents a species """
+    def interpret_species(cls, value):
+        """ Represents a species, checked with the generic interpreter """
         try:
-            data_config = [
-                [cls.SPECIES_JSON_KEY_FOOD, "food", cls.natural],
-                [cls.SPECIES_JSON_KEY_BODY, "body", cls.natural],
-                [cls.SPECIES_JSON_KEY_POPULATION, "population", cls.natural],
-                [cls.SPECIES_JSON_KEY_TRAITS, "traits", cls.array],
-                [cls.SPECIES_JSON_KEY_FAT_FOOD, "fat_food", cls.natural, cls.OPTIONAL],
-            ]
-
-            parameters = unpack(data_config, value)
+            parameters = unpack(cls.SPECIES_CONFIG, value)
             assert all(cls.trait(trait) for trait in parameters['traits'])
 
         except AssertionError:
@@ -169,8 +320,8 @@ class DataDefinitions:
         return False
 
     @classmethod
-    def action4(cls, value):
-        """ Represents an Action4 """
+    def interpret_action4(cls, value):
+        """ Represents an Action4, checked with the generic predicates """
         if not (cls.array(value) and len(value) == 5):
             return False
 
@@ -275,3 +426,4 @@ def unpack(config, data):
         data_key += 1
 
     return values
+
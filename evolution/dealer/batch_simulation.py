@@ -0,0 +1,691 @@
+"""
+    Implements a simulation that advances many independent games in lockstep, with the whole state of all games in
+    NumPy arrays.
+
+    Every game starts from an empty board and is played by dummy players (see DummyPlayer) with the same rules as
+    Dealer.run_game. The games may differ in the order of their decks, and the rule constants of the BatchSimulation
+    can be overridden to evaluate rule variants. The state of a game g is:
+
+    * species columns food, body, population, fat_food and traits (a trait mask) of shape games x players x species,
+      where the species of seat p are the first count[g, p] entries of row [g, p]; the row grows when a seat gets more
+      species than the current number of species slots
+    * the seats in turn order (the first n_order[g] entries of order[g]) and the seats that can still feed in the
+      feeding step (the first n_active[g] entries of active[g])
+    * bag, a hand of shape games x players x cards with one flag per card code, the deck and the index of its top
+
+    Every step is a sequence of array operations over all games, looping in Python only over the turn order, the
+    species slots and the rounds of the feeding step. Steps are masked so games that are over, or whose feeding step
+    is over, are not modified.
+
+    The dummy players never give a species more than one trait, so the trait mask of a species identifies its
+    traits and their order.
+
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .fast_dealer import FastDealer, CARDS, CARD_VALUES, CARD_TRAITS, FAT_TISSUE, FERTILE, FORAGING, \
+    COOPERATION, LONG_NECK, SCAVENGER, CARNIVORE, AMBUSH, BURROWING, CLIMBING, HARD_SHELL, HERDING, HORNS, \
+    PACK_HUNTING, SYMBIOSIS, WARNING_CALL
+
+from ..data_definitions import DataDefinitions
+
+from ..common.species import Species
+from ..common.trait import HARD_SHELL_THRESHOLD, HORNS_DAMAGE, traits as TRAIT_NAMES
+
+
+# kinds of feeding of a feed1 round
+CANNOT_FEED = 0
+NO_FEEDING = 1
+VEGETARIAN = 2
+FAT_TISSUE_FEEDING = 3
+CARNIVORE_FEEDING = 4
+INVALID = 5
+
+# base of the keys combining several species attributes into one integer
+KEY_BASE = 1 << 8
+
+
+class BatchSimulation:
+    """ Contains the state of many games of dummy players and runs them in lockstep. """
+
+    WATERING_HOLE_MINIMUM = 0
+    CARNIVORE_ATTACK_POPULATION_DECREASE = 1
+    EXTINCT_SPECIES_PAYOUT = 2
+    CARDS_PER_TURN = 3
+    CARDS_PER_SPECIES = 1
+    MAXIMUM_POPULATION = Species.MAXIMUM_POPULATION
+    MINIMUM_POPULATION = Species.MINIMUM_POPULATION
+    HARD_SHELL_THRESHOLD = HARD_SHELL_THRESHOLD
+    HORNS_DAMAGE = HORNS_DAMAGE
+
+    # initial number of species slots of every seat
+    SPECIES_SLOTS = 8
+
+    def __init__(self, games, players, decks=None):
+        """ Creates the given number of games with the given number of players, before the first turn
+        :param games: number of games
+        :param players: number of players of every game
+        :param decks: array of shape games x cards with the card codes of every deck in the order they are dealt,
+          all cards in order by default
+        :raise: ImportError if NumPy is not available
+        """
+        if np is None:
+            raise ImportError("BatchSimulation requires NumPy")
+
+        self.games = games
+        self.players = players
+        self.games_index = np.arange(games)
+
+        self.card_values = np.array(CARD_VALUES)
+        self.card_traits = 1 << np.array(CARD_TRAITS)
+
+        if decks is None:
+            decks = np.tile(np.arange(len(CARDS)), (games, 1))
+        self.decks = np.asarray(decks)
+        self.top = np.zeros(games, dtype=int)
+
+        shape = (games, players, self.SPECIES_SLOTS)
+        self.food = np.zeros(shape, dtype=int)
+        self.body = np.zeros(shape, dtype=int)
+        self.population = np.zeros(shape, dtype=int)
+        self.fat_food = np.zeros(shape, dtype=int)
+        self.traits = np.zeros(shape, dtype=int)
+        self.count = np.zeros((games, players), dtype=int)
+
+        self.bag = np.zeros((games, players), dtype=int)
+        self.hand = np.zeros((games, players, len(CARDS)), dtype=bool)
+
+        self.order = np.tile(np.arange(players), (games, 1))
+        self.n_order = np.full(games, players)
+        self.active = self.order.copy()
+        self.n_active = self.n_order.copy()
+
+        self.watering_hole = np.full(games, self.WATERING_HOLE_MINIMUM)
+
+    @property
+    def columns(self):
+        """ Returns the species columns """
+        return self.food, self.body, self.population, self.fat_food, self.traits
+
+    @property
+    def slots(self):
+        """ Returns the number of species slots of every seat """
+        return self.food.shape[2]
+
+    def grow_slots(self):
+        """ Doubles the number of species slots of every seat """
+        padding = ((0, 0), (0, 0), (0, self.slots))
+        self.food, self.body, self.population, self.fat_food, self.traits = \
+            [np.pad(column, padding) for column in self.columns]
+
+    def add_species(self, mask, seats, traits):
+        """ Adds a species to the right of the species of the given seat of every masked game
+        :param mask: boolean array, one flag per game
+        :param seats: array with the seat of every game
+        :param traits: array with the trait mask of the new species of every game
+        :return: array with the index of the new species of every game
+        """
+        games = self.games_index[mask]
+        seats = seats[mask]
+        indices = self.count[games, seats]
+        if indices.size and indices.max() >= self.slots:
+            self.grow_slots()
+
+        self.food[games, seats, indices] = Species.DEFAULT_FOOD
+        self.body[games, seats, indices] = Species.DEFAULT_BODY
+        self.population[games, seats, indices] = Species.DEFAULT_POPULATION
+        self.fat_food[games, seats, indices] = Species.DEFAULT_FAT_FOOD
+        self.traits[games, seats, indices] = traits[mask]
+        self.count[games, seats] += 1
+
+        new_indices = np.zeros(self.games, dtype=int)
+        new_indices[mask] = indices
+        return new_indices
+
+    def compact(self, mask, seats, keep):
+        """ Removes the species of the given seat of every masked game that are not kept, shifting the remaining
+          species to the left
+        :param mask: boolean array, one flag per game
+        :param seats: array with the seat of every game
+        :param keep: boolean array of shape games x slots, the species of each seat to keep
+        """
+        games = self.games_index[mask]
+        seats = seats[mask]
+        keep = keep[mask]
+
+        # stable sort moving the kept species to the front, in order
+        source = np.argsort(~keep, axis=1, kind="stable")
+        cleared = np.arange(self.slots)[None, :] >= keep.sum(axis=1)[:, None]
+        for column in self.columns:
+            rows = np.take_along_axis(column[games, seats], source, axis=1)
+            rows[cleared] = 0
+            column[games, seats] = rows
+        self.count[games, seats] = keep.sum(axis=1)
+
+    def remove_species(self, mask, seats, indices):
+        """ Removes the species at the given index of the given seat of every masked game """
+        keep = np.arange(self.slots)[None, :] < self.count[self.games_index, seats][:, None]
+        keep[self.games_index, np.minimum(indices, self.slots - 1)] = False
+        self.compact(mask, seats, keep)
+
+    def deal(self, mask, seats, cards):
+        """ Moves cards from the top of the deck to the hand of the given seat of every masked game
+        :param mask: boolean array, one flag per game
+        :param seats: array with the seat of every game
+        :param cards: number of cards to deal, or array with the number of cards of every game
+        """
+        cards = np.broadcast_to(cards, (self.games,))
+        if not mask.any():
+            return
+        for card in range(cards[mask].max()):
+            dealt = mask & (card < cards) & (self.top < self.decks.shape[1])
+            games = self.games_index[dealt]
+            self.hand[games, seats[games], self.decks[games, self.top[games]]] = True
+            self.top[games] += 1
+
+    def species(self, seats, games=None):
+        """ Returns the species columns of the given seat of the given games
+        :param seats: array with the seat of every game
+        :param games: array of game indices, all games by default
+        :return: (valid, food, body, population, fat_food, traits) tuple of arrays of shape games x slots, valid
+          flags the slots holding a species
+        """
+        games = self.games_index if games is None else games
+        valid = np.arange(self.slots)[None, :] < self.count[games, seats][:, None]
+        return (valid,) + tuple(column[games, seats] for column in self.columns)
+
+    def scores(self):
+        """ Computes the score of every player, same as Player.score
+        :return: array of shape games x players, -1 for players removed from the game
+        """
+        valid = np.arange(self.slots)[None, None, :] < self.count[:, :, None]
+        traits = sum((self.traits >> code) & 1 for code in range(len(TRAIT_NAMES)))
+        scores = self.bag + (self.population * valid).sum(axis=2) + (traits * valid).sum(axis=2)
+        return np.where(self.in_game(), scores, -1)
+
+    def in_game(self):
+        """ Returns an array of shape games x players flagging the players still in the game """
+        in_game = np.zeros((self.games, self.players), dtype=bool)
+        turn = np.arange(self.players)[None, :] < self.n_order[:, None]
+        in_game[np.nonzero(turn)[0], self.order[turn]] = True
+        return in_game
+
+    def winners(self):
+        """ Returns the id of the first player of the ranking of every game, same as the first entry of
+          Dealer.ranking, 0 for games without players
+        """
+        scores = np.take_along_axis(self.scores(), self.order, axis=1)
+        scores[np.arange(self.players)[None, :] >= self.n_order[:, None]] = -1
+        winners = self.order[self.games_index, np.argmax(scores, axis=1)] + 1
+        return np.where(self.n_order > 0, winners, 0)
+
+    def ranking(self, game):
+        """ Computes the player ranking of the given game, same as Dealer.ranking
+        :return: list of (idx, score) for each player in order of the ranking
+        """
+        scores = self.scores()[game]
+        seats = sorted(self.order[game, :self.n_order[game]], key=lambda seat: scores[seat], reverse=True)
+        return [(int(seat) + 1, int(scores[seat])) for seat in seats]
+
+    def run(self):
+        """ Simulates all games to their end, same as Dealer.run_game for each game """
+        running = np.ones(self.games, dtype=bool)
+        positions = np.arange(self.players)[None, :]
+
+        while True:
+            turn = positions < self.n_order[:, None]
+            counts = np.take_along_axis(self.count, self.order, axis=1)
+            cards = ((self.CARDS_PER_TURN + self.CARDS_PER_SPECIES * np.maximum(1, counts)) * turn).sum(axis=1)
+            running &= cards <= self.decks.shape[1] - self.top
+            if not running.any():
+                break
+
+            self.take_turn(running)
+
+            running &= self.n_order > 0
+            self.order[running] = self.rotated(self.order, self.n_order, 1)[running]
+
+    def rotated(self, rows, lengths, shift):
+        """ Returns the rows with their first lengths entries rotated to the left by the given shift """
+        positions = np.arange(self.players)[None, :]
+        lengths = np.maximum(lengths, 1)[:, None]
+        source = np.where(positions < lengths, (positions + shift) % lengths, positions)
+        return np.take_along_axis(rows, source, axis=1)
+
+    def without(self, rows, lengths, positions):
+        """ Returns the rows without the entry at the given position of every row """
+        entries = np.arange(self.players)[None, :]
+        source = np.minimum(entries + (entries >= positions[:, None]), self.players - 1)
+        return np.take_along_axis(rows, source, axis=1), lengths - 1
+
+    def remove_players(self, mask, seats):
+        """ Removes the given seat of every masked game from the turn order """
+        positions = np.argmax(self.order == seats[:, None], axis=1)
+        order, n_order = self.without(self.order, self.n_order, positions)
+        self.order[mask] = order[mask]
+        self.n_order[mask] = n_order[mask]
+
+    def take_turn(self, running):
+        self.step1(running)
+        self.step2_4(running)
+        self.auto_traits(running)
+        self.feeding_step(running)
+        self.end_turn(running)
+
+    def step1(self, running):
+        """ Gives a species to every player without species and deals cards, same as Dealer.step1 """
+        for position in range(self.players):
+            mask = running & (position < self.n_order)
+            seats = self.order[:, position]
+            counts = self.count[self.games_index, seats]
+            self.deal(mask, seats, self.CARDS_PER_TURN + self.CARDS_PER_SPECIES * np.maximum(1, counts))
+            self.add_species(mask & (counts == 0), seats, np.zeros(self.games, dtype=int))
+
+    def step2_4(self, running):
+        """ Chooses the actions of every player as DummyPlayer.choose and applies them, same as Dealer.step2_3 and
+          the actions of Dealer.step4
+        """
+        bad_players = np.zeros((self.games, self.players), dtype=bool)
+        for position in range(self.players):
+            mask = running & (position < self.n_order)
+            seats = self.order[:, position]
+
+            # the dummy player uses its cards from smallest to largest: discard, board, trait of the new species,
+            # then population, body and replaced trait of the new species if it has enough cards
+            hand = self.hand[self.games_index, seats]
+            rank = np.cumsum(hand, axis=1)
+            size = rank[:, -1]
+            cards = [np.argmax(hand & (rank == r), axis=1) for r in range(1, 7)]
+            discard, _, trait, population, body, replaced = cards
+
+            bad_players[self.games_index, seats] |= mask & (size < 3)
+            mask &= size >= 3
+
+            new = self.add_species(mask, seats, self.card_traits[trait])
+            games = self.games_index
+            grow_population = mask & (size >= 4)
+            self.population[games[grow_population], seats[grow_population], new[grow_population]] += \
+                Species.POPULATION_GROWTH
+            grow_body = mask & (size >= 5)
+            self.body[games[grow_body], seats[grow_body], new[grow_body]] += Species.BODY_GROWTH
+            replace = mask & (size >= 6)
+            replace_games, replace_seats, replace_new = games[replace], seats[replace], new[replace]
+            fat_tissue = self.traits[replace_games, replace_seats, replace_new] & FAT_TISSUE != 0
+            self.fat_food[replace_games[fat_tissue], replace_seats[fat_tissue], replace_new[fat_tissue]] = \
+                Species.MINIMUM_FAT_FOOD
+            self.traits[replace_games, replace_seats, replace_new] = self.card_traits[replaced[replace]]
+
+            for r, card in enumerate(cards):
+                used = mask & (size > r)
+                self.hand[games[used], seats[used], card[used]] = False
+
+            watering_hole = np.maximum(self.watering_hole + self.card_values[discard], self.WATERING_HOLE_MINIMUM)
+            self.watering_hole = np.where(mask, watering_hole, self.watering_hole)
+
+        for seat in range(self.players):
+            self.remove_players(bad_players[:, seat], np.full(self.games, seat))
+
+    def auto_traits(self, running):
+        """ Activates fertile, long neck and fat tissue of all species, same as Dealer.auto_traits """
+        for position in range(self.players):
+            mask = running & (position < self.n_order)
+            seats = self.order[:, position]
+            for index in range(self.slots):
+                species = mask & (index < self.count[self.games_index, seats])
+                if not species.any():
+                    continue
+                games = self.games_index[species]
+                key = games, seats[species], index
+                traits = self.traits[key]
+
+                fertile = (traits & FERTILE != 0) & (self.population[key] + 1 <= self.MAXIMUM_POPULATION)
+                self.population[key] += fertile * Species.POPULATION_GROWTH
+
+                long_neck = np.zeros(self.games, dtype=bool)
+                long_neck[games] = traits & LONG_NECK != 0
+                indices = np.full(self.games, index)
+                self.watering_hole -= self.feed_species(long_neck, seats, indices, self.watering_hole)
+
+                tokens = np.minimum(self.fat_food[key], self.population[key] - self.food[key])
+                self.food[key] += tokens
+                self.fat_food[key] -= tokens
+
+    def feed_species(self, mask, seats, indices, watering_hole):
+        """ Feeds the species at the given index of the given seat of every masked game, with foraging and
+          cooperation, same as Player.feed_species
+        :param watering_hole: array with the food available to every game
+        :return: array with the number of food tokens consumed in every game
+        """
+        tokens = np.zeros(self.games, dtype=int)
+        if not mask.any():
+            return tokens
+
+        games = self.games_index[mask]
+        key = games, seats[mask], indices[mask]
+        available = watering_hole[mask]
+        traits = self.traits[key]
+
+        first = (self.population[key] > self.food[key]) & (available >= 1)
+        self.food[key] += first
+        foraging = (traits & FORAGING != 0) & (self.population[key] > self.food[key]) & (available - first >= 1)
+        self.food[key] += foraging
+        tokens[games] = first.astype(int) + foraging
+
+        cooperation = np.zeros(self.games, dtype=bool)
+        cooperation[games] = (traits & COOPERATION != 0) & (key[2] + 1 < self.count[games, key[1]])
+        times = tokens.copy()
+        for time in range(2):
+            feed = cooperation & (times > time)
+            if feed.any():
+                tokens += self.feed_species(feed, seats, indices + 1, watering_hole - tokens)
+        return tokens
+
+    def hurt_species(self, mask, seats, indices, damage):
+        """ Hurts the species at the given index of the given seat of every masked game, removing it and paying the
+          owner if it goes extinct
+        :return: (extinct, horns) tuple of boolean arrays
+        """
+        extinct = np.zeros(self.games, dtype=bool)
+        horns = np.zeros(self.games, dtype=bool)
+        games = self.games_index[mask]
+        key = games, seats[mask], indices[mask]
+
+        self.population[key] -= damage
+        self.food[key] = np.minimum(self.food[key], self.population[key])
+        extinct[games] = self.population[key] <= self.MINIMUM_POPULATION
+        horns[games] = self.traits[key] & HORNS != 0
+
+        self.remove_species(extinct, seats, indices)
+        self.deal(extinct, seats, self.EXTINCT_SPECIES_PAYOUT)
+        return extinct, horns
+
+    def feeding_step(self, running):
+        """ Feeds until the watering hole is empty or no player can feed, same as Dealer.feeding_step """
+        self.active[running] = self.order[running]
+        self.n_active[running] = self.n_order[running]
+
+        feeding = running & (self.watering_hole > self.WATERING_HOLE_MINIMUM) & (self.n_active > 0)
+        while feeding.any():
+            self.feed1(feeding)
+            feeding &= (self.watering_hole > self.WATERING_HOLE_MINIMUM) & (self.n_active > 0)
+
+    def feed1(self, mask):
+        """ Performs one step of the feeding of every masked game, same as Dealer.feed1 """
+        games = self.games_index[mask]
+        seats = self.active[games, 0]
+        order = self.order[games]
+        n_order = self.n_order[games]
+        positions = np.argmax(order == seats[:, None], axis=1)
+
+        # the other players in turn order followed by the current player, as in Player.feeding_choice
+        entries = np.arange(self.players)[None, :]
+        targets = np.take_along_axis(order, (positions[:, None] + 1 + entries) % np.maximum(n_order, 1)[:, None],
+                                     axis=1)
+        is_target = entries < n_order[:, None]
+        is_self = entries == n_order[:, None] - 1
+
+        choice = self.feeding_choice(games, seats, targets, is_target, is_self)
+        kind, index, tokens, target_player, target_index = [np.zeros(self.games, dtype=int) for _ in range(5)]
+        for column, values in zip((kind, index, tokens, target_player, target_index), choice):
+            column[games] = values
+        kind[~mask] = CANNOT_FEED
+
+        full_seats = np.zeros(self.games, dtype=int)
+        full_seats[games] = seats
+        full_positions = np.zeros(self.games, dtype=int)
+        full_positions[games] = positions
+        defenders = np.zeros(self.games, dtype=int)
+        defenders[games] = targets[np.arange(games.size), choice[3]]
+        self.apply_feeding(kind, full_seats, full_positions, index, tokens, defenders, target_index)
+
+        invalid = kind == INVALID
+        self.remove_players(invalid, full_seats)
+
+        done = mask & ((kind == CANNOT_FEED) | (kind == NO_FEEDING) | invalid)
+        rotate = mask & ~done
+        active, n_active = self.without(self.active, self.n_active, np.zeros(self.games, dtype=int))
+        self.active[done] = active[done]
+        self.n_active[done] = n_active[done]
+        self.active[rotate] = self.rotated(self.active, self.n_active, 1)[rotate]
+
+    def attackable(self, games, seats, targets, is_target, is_self):
+        """ Determines which species each species of the current player can attack, same as Species.is_attackable
+        :param games: array of game indices
+        :param seats: array with the current seat of every game
+        :param targets: array of shape games x players with the target seats of every game
+        :return: boolean array of shape games x slots x players x slots, flagging the hungry carnivores of the
+          current player that can attack each species of each target
+        """
+        valid, food, body, population, fat_food, traits = self.species(seats, games)
+        hungry_carnivore = valid & (population > food) & (traits & CARNIVORE != 0)
+        attackable = np.zeros((games.size, self.slots, self.players, self.slots), dtype=bool)
+
+        # only the games whose current player has a hungry carnivore can attack
+        rows = np.nonzero(hungry_carnivore.any(axis=1))[0]
+        if not rows.size:
+            return attackable
+        games, targets, is_target, is_self = games[rows], targets[rows], is_target[rows], is_self[rows]
+        body, population, traits = body[rows], population[rows], traits[rows]
+        attacker_traits = traits[:, :, None, None]
+        attacking_body = body + np.where(traits & PACK_HUNTING != 0, population, 0)
+
+        target_valid = is_target[:, :, None] & \
+            (np.arange(self.slots)[None, None, :] < self.count[games[:, None], targets][:, :, None])
+        target_food, target_body, target_population, _, target_traits = \
+            [column[games[:, None], targets] for column in self.columns]
+
+        warning_call = target_valid & (target_traits & WARNING_CALL != 0)
+        warned = np.zeros_like(warning_call)
+        warned[:, :, 1:] |= warning_call[:, :, :-1]
+        warned[:, :, :-1] |= warning_call[:, :, 1:]
+        right_body = np.full_like(target_body, -1)
+        right_body[:, :, :-1] = np.where(target_valid[:, :, 1:], target_body[:, :, 1:], -1)
+
+        protected = (
+            (warned[:, None] & (attacker_traits & AMBUSH == 0)) |
+            ((target_traits & BURROWING != 0) & (target_food == target_population))[:, None] |
+            ((target_traits & CLIMBING != 0)[:, None] & (attacker_traits & CLIMBING == 0)) |
+            ((target_traits & HARD_SHELL != 0)[:, None] &
+             (attacking_body[:, :, None, None] - target_body[:, None] < self.HARD_SHELL_THRESHOLD)) |
+            ((target_traits & HERDING != 0)[:, None] &
+             (population[:, :, None, None] <= target_population[:, None])) |
+            ((target_traits & SYMBIOSIS != 0) & (right_body > target_body))[:, None]
+        )
+        itself = np.eye(self.slots, dtype=bool)[None, :, None, :] & is_self[:, None, :, None]
+        attackable[rows] = hungry_carnivore[rows][:, :, None, None] & target_valid[:, None] & ~protected & ~itself
+        return attackable
+
+    def feeding_choice(self, games, seats, targets, is_target, is_self):
+        """ Determines the next feeding of the given games automatically if possible, otherwise as
+          DummyPlayer.feed_next, same as Player.feeding_choice
+        :param games: array of game indices
+        :return: (kind, index, tokens, target player, target index) tuple of arrays, one entry per game
+        """
+        rows = np.arange(games.size)
+        watering_hole = self.watering_hole[games]
+        valid, food, body, population, fat_food, traits = self.species(seats, games)
+        hungry = valid & (population > food)
+        carnivore = traits & CARNIVORE != 0
+        vegetarian = hungry & ~carnivore
+        fat_tissue = valid & (traits & FAT_TISSUE != 0) & (fat_food < body)
+        attackable = self.attackable(games, seats, targets, is_target, is_self)
+
+        n_vegetarian = vegetarian.sum(axis=1)
+        n_fat_tissue = fat_tissue.sum(axis=1)
+        flat = attackable.reshape(games.size, -1)
+        n_carnivore = flat.sum(axis=1)
+        first_index, first_player, first_target = np.unravel_index(np.argmax(flat, axis=1),
+                                                                   attackable.shape[1:])
+        others = is_target & ~is_self
+        n_carnivore_others = (attackable & others[:, None, :, None]).sum(axis=(1, 2, 3))
+
+        kind = np.full(games.size, CANNOT_FEED)
+        index = np.zeros(games.size, dtype=int)
+        tokens = np.zeros(games.size, dtype=int)
+        target_player = np.zeros(games.size, dtype=int)
+        target_index = np.zeros(games.size, dtype=int)
+        fat_need = body - fat_food
+
+        cannot_feed = (~hungry.any(axis=1) | ((n_vegetarian == 0) & (n_carnivore == 0))) & (n_fat_tissue == 0)
+        automatic_fat_tissue = ~cannot_feed & (n_fat_tissue == 1) & (n_vegetarian == 0) & (n_carnivore == 0)
+        automatic_vegetarian = ~cannot_feed & (n_vegetarian == 1) & (n_fat_tissue == 0) & (n_carnivore == 0)
+        automatic_carnivore = (~cannot_feed & (n_carnivore == 1) & (n_carnivore_others == 1) &
+                               (n_fat_tissue == 0) & (n_vegetarian == 0))
+        automatic = cannot_feed | automatic_fat_tissue | automatic_vegetarian | automatic_carnivore
+
+        # leftmost species equal to the chosen species as JSONSpecies, the index the dummy player reports
+        serialized_fat_food = np.where(traits & FAT_TISSUE != 0, fat_food, 0)
+        columns = food, body, population, traits, serialized_fat_food
+
+        def leftmost_equal(chosen, species_columns=columns, species_valid=valid):
+            equal = species_valid.copy()
+            for column in species_columns:
+                equal &= column == column[rows, chosen][:, None]
+            return np.argmax(equal, axis=1)
+
+        key = (population * KEY_BASE + food) * KEY_BASE + body
+
+        def first_max(candidates, candidate_key):
+            return np.argmax(np.where(candidates, candidate_key, -1), axis=-1)
+
+        # DummyPlayer.feed_next
+        dummy = ~automatic
+        dummy_fat_tissue = dummy & (n_fat_tissue > 0)
+        dummy_vegetarian = dummy & ~dummy_fat_tissue & (n_vegetarian > 0)
+        can_attack_others = (attackable & others[:, None, :, None]).any(axis=(2, 3))
+        dummy_carnivore = dummy & ~dummy_fat_tissue & ~dummy_vegetarian & can_attack_others.any(axis=1)
+        can_attack_itself = (attackable & is_self[:, None, :, None]).any(axis=(1, 2, 3))
+        dummy_no_feeding = dummy & ~dummy_fat_tissue & ~dummy_vegetarian & ~dummy_carnivore & can_attack_itself
+
+        fat_tissue_choice = first_max(fat_tissue, fat_need * KEY_BASE ** 3 + key)
+        vegetarian_choice = first_max(vegetarian, key)
+        attacker = first_max(can_attack_others, key)
+
+        target_columns = [column[games[:, None], targets] for column in self.columns]
+        target_food, target_body, target_population, target_fat_food, target_traits = target_columns
+        target_key = (target_population * KEY_BASE + target_food) * KEY_BASE + target_body
+        attacker_targets = attackable[rows, attacker] & others[:, :, None]
+        largest = first_max(attacker_targets.reshape(games.size, -1), target_key.reshape(games.size, -1))
+        largest_player, largest_target = np.unravel_index(largest, attacker_targets.shape[1:])
+        target_serialized_fat_food = np.where(target_traits & FAT_TISSUE != 0, target_fat_food, 0)
+        largest_player_columns = [column[rows, largest_player] for column in
+                                  (target_food, target_body, target_population, target_traits,
+                                   target_serialized_fat_food)]
+        largest_player_valid = np.arange(self.slots)[None, :] < \
+            self.count[games, targets[rows, largest_player]][:, None]
+
+        for choice, feeding_kind, feeding_index, feeding_tokens, feeding_player, feeding_target in [
+            (cannot_feed, CANNOT_FEED, 0, 0, 0, 0),
+            (automatic_fat_tissue, FAT_TISSUE_FEEDING, np.argmax(fat_tissue, axis=1),
+             np.minimum(watering_hole, fat_need[rows, np.argmax(fat_tissue, axis=1)]), 0, 0),
+            (automatic_vegetarian, VEGETARIAN, np.argmax(vegetarian, axis=1), 0, 0, 0),
+            (automatic_carnivore, CARNIVORE_FEEDING, first_index, 0, first_player, first_target),
+            (dummy & ~dummy_fat_tissue & ~dummy_vegetarian & ~dummy_carnivore & ~dummy_no_feeding, INVALID,
+             0, 0, 0, 0),
+            (dummy_no_feeding, NO_FEEDING, 0, 0, 0, 0),
+            (dummy_fat_tissue, FAT_TISSUE_FEEDING, leftmost_equal(fat_tissue_choice),
+             np.minimum(watering_hole, fat_need[rows, fat_tissue_choice]), 0, 0),
+            (dummy_vegetarian, VEGETARIAN, leftmost_equal(vegetarian_choice), 0, 0, 0),
+            (dummy_carnivore, CARNIVORE_FEEDING, leftmost_equal(attacker), 0, largest_player,
+             leftmost_equal(largest_target, largest_player_columns, largest_player_valid)),
+        ]:
+            kind = np.where(choice, feeding_kind, kind)
+            index = np.where(choice, feeding_index, index)
+            tokens = np.where(choice, feeding_tokens, tokens)
+            target_player = np.where(choice, feeding_player, target_player)
+            target_index = np.where(choice, feeding_target, target_index)
+
+        # the reported carnivore and target may be other species equal to the chosen ones, see
+        # FeedingOutcome.validate
+        carnivore_feeding = kind == CARNIVORE_FEEDING
+        kind[carnivore_feeding & ~attackable[rows, index, target_player, target_index]] = INVALID
+        return kind, index, tokens, target_player, target_index
+
+    def apply_feeding(self, kind, seats, positions, index, tokens, defenders, target_index):
+        """ Applies the feeding of every game, same as FeedingOutcome.apply and Dealer.carnivore_feeding """
+        games = self.games_index
+
+        vegetarian = kind == VEGETARIAN
+        self.watering_hole -= self.feed_species(vegetarian, seats, index, self.watering_hole)
+
+        fat_tissue = kind == FAT_TISSUE_FEEDING
+        self.fat_food[games[fat_tissue], seats[fat_tissue], index[fat_tissue]] += tokens[fat_tissue]
+        self.watering_hole -= np.where(fat_tissue, tokens, 0)
+
+        carnivore = kind == CARNIVORE_FEEDING
+        if not carnivore.any():
+            return
+        _, horns = self.hurt_species(carnivore, defenders, target_index, self.CARNIVORE_ATTACK_POPULATION_DECREASE)
+        attacker_died, _ = self.hurt_species(carnivore & horns, seats, index, self.HORNS_DAMAGE)
+
+        fed = carnivore & ~attacker_died
+        self.watering_hole -= self.feed_species(fed, seats, index, self.watering_hole)
+
+        # scavengers of the current player and then the other players in turn order
+        n_order = np.maximum(self.n_order, 1)
+        for offset in range(self.players):
+            scavenger_seats = self.order[games, (positions + offset) % n_order]
+            turn = fed & (offset < self.n_order)
+            for scavenger in range(self.slots):
+                scavengers = turn & (scavenger < self.count[games, scavenger_seats])
+                scavengers &= self.traits[games, scavenger_seats, min(scavenger, self.slots - 1)] & SCAVENGER != 0
+                indices = np.full(self.games, scavenger)
+                self.watering_hole -= self.feed_species(scavengers, scavenger_seats, indices, self.watering_hole)
+
+    def end_turn(self, running):
+        """ Reduces populations to their food, moves food to the bags and pays for extinct species, same as
+          Dealer.end_turn
+        """
+        for position in range(self.players):
+            mask = running & (position < self.n_order)
+            seats = self.order[:, position]
+            valid, food, _, population, _, _ = self.species(seats)
+
+            population = np.minimum(food, population)
+            extinct = valid & (population <= self.MINIMUM_POPULATION)
+            survivors = valid & ~extinct
+
+            games = self.games_index[mask]
+            self.population[games, seats[mask]] = np.where(valid, population, 0)[mask]
+            self.bag[games, seats[mask]] += (food * survivors).sum(axis=1)[mask]
+            self.food[games, seats[mask]] = np.where(survivors, Species.MINIMUM_FOOD, 0)[mask]
+
+            self.compact(mask, seats, survivors)
+            self.deal(mask, seats, extinct.sum(axis=1) * self.EXTINCT_SPECIES_PAYOUT)
+
+    def serialize_species(self, game, seat, index):
+        """ Returns the JSONSpecies of the given species of the given game """
+        traits = int(self.traits[game, seat, index])
+        data = [
+            [DataDefinitions.SPECIES_JSON_KEY_FOOD, int(self.food[game, seat, index])],
+            [DataDefinitions.SPECIES_JSON_KEY_BODY, int(self.body[game, seat, index])],
+            [DataDefinitions.SPECIES_JSON_KEY_POPULATION, int(self.population[game, seat, index])],
+            [DataDefinitions.SPECIES_JSON_KEY_TRAITS,
+             [name for code, name in enumerate(TRAIT_NAMES) if traits & (1 << code)]],
+        ]
+        if traits & FAT_TISSUE and self.fat_food[game, seat, index] > 0:
+            data.append([DataDefinitions.SPECIES_JSON_KEY_FAT_FOOD, int(self.fat_food[game, seat, index])])
+        return data
+
+    def serialize(self, game):
+        """ Returns the Configuration of the given game, with the cards of every player in order """
+        players = []
+        for seat in self.order[game, :self.n_order[game]]:
+            player = [
+                [DataDefinitions.PLAYER_JSON_KEY_IDX, int(seat) + 1],
+                [DataDefinitions.PLAYER_JSON_KEY_SPECIES,
+                 [self.serialize_species(game, seat, index) for index in range(self.count[game, seat])]],
+                [DataDefinitions.PLAYER_JSON_KEY_BAG, int(self.bag[game, seat])],
+            ]
+            cards = np.nonzero(self.hand[game, seat])[0]
+            if cards.size:
+                player.append([DataDefinitions.PLAYER_JSON_KEY_CARDS,
+                               [FastDealer.serialize_card(code) for code in cards]])
+            players.append(player)
+
+        deck = [FastDealer.serialize_card(code) for code in self.decks[game, self.top[game]:]]
+        return [players, int(self.watering_hole[game]), deck]
@@ -0,0 +1,185 @@
+"""
+    Implements a bot host that drives many remote players from one process, e.g. to load-test a GameHost.
+
+    Every bot has its own connection, ExternalPlayer and RemoteDealer, but instead of blocking on its socket with
+    RemoteDealer.main, all the connections are served by one asyncio event loop: the data received is fed to the
+    decoder of the bot, every complete message is processed and the responses of the bot are sent once the
+    message is processed. A bot plays the given number of games over its connection, answering the game over
+    message with a new game message until it played all of them.
+
+    The latency of a message is the time from the last response sent by the bot to the arrival of the message,
+    that is the time the server took to process the response, including the time the other players of the game
+    took to play in between.
+
+"""
+
+import asyncio
+import socket
+import time
+
+from .remote_dealer import RemoteDealer
+from ..common.binary_protocol import JSON_FRAME
+
+
+class Bot(RemoteDealer):
+    """ A RemoteDealer whose responses are buffered, to be sent by the event loop of a BotHost """
+
+    def __init__(self, name, player, games=1, binary=False, delta=False):
+        """ Creates a new bot, which is connected by a BotHost
+        :param name: info message the bot signs up with
+        :param player: ExternalPlayer of the bot
+        :param games: number of games to play before disconnecting
+        :param binary: if true, asks the server to use the binary encoding
+        :param delta: if true, asks the server to send delta updates with feed_next
+        """
+        super().__init__(None, player)
+        self.name = name
+        self.games = games
+
+        # encoded messages waiting to be sent
+        self.outgoing = []
+        # the sign-up message is sent in JSON, with the binary encoding every message after it in binary frames
+        self.send(self.hello_message(name, binary, delta))
+        if binary:
+            self.use_binary()
+
+        self.signed_up = False
+        self.games_played = 0
+        self.messages = 0
+        self.sent_at = None
+        # seconds from a response of the bot to the next message of the server
+        self.latencies = []
+        self.error = None
+
+    def send(self, data, deadline=None, kind=JSON_FRAME):
+        """ Encodes the given JSON object and buffers it until the message being processed is done """
+        self.outgoing.append(self.encode_message(data, kind))
+
+    def take_outgoing(self):
+        """ Returns the encoded messages buffered since the last call
+        :return: bytes to send
+        """
+        data = b"".join(self.outgoing)
+        self.outgoing = []
+        return data
+
+    def handle(self, message, received_at):
+        """ Processes a message received from the server
+          Effect: buffers the responses of the bot and records the latency of the message
+        :param message: decoded message
+        :param received_at: time.perf_counter() when the message arrived
+        :return: true if the bot expects more messages, false if it played all its games
+        """
+        self.messages += 1
+        if self.sent_at is not None:
+            self.latencies.append(received_at - self.sent_at)
+            self.sent_at = None
+
+        if not self.signed_up:
+            # response to the sign-up or new game message
+            self.signed_up = True
+        elif message == self.GAME_OVER_MESSAGE:
+            self.games_played += 1
+            if self.games_played >= self.games:
+                return False
+            self.signed_up = False
+            self.send(self.NEW_GAME_MESSAGE)
+        else:
+            self.process_message(message)
+        return True
+
+    def report(self):
+        """ Returns the statistics of the bot
+        :return: JSON-compatible dictionary
+        """
+        return {
+            "bot": self.name,
+            "games": self.games_played,
+            "messages": self.messages,
+            "latency_ms": latency_summary(self.latencies),
+            "error": self.error,
+        }
+
+
+def latency_summary(latencies):
+    """ Summarizes the given latencies
+    :param latencies: list of durations in seconds
+    :return: dictionary with the number of latencies and their mean, median, 99th percentile and maximum in
+             milliseconds, the statistics are None if there are no latencies
+    """
+    if not latencies:
+        return {"count": 0, "mean": None, "p50": None, "p99": None, "max": None}
+
+    ordered = sorted(latencies)
+    last = len(ordered) - 1
+    return {
+        "count": len(ordered),
+        "mean": 1000 * sum(ordered) / len(ordered),
+        "p50": 1000 * ordered[last // 2],
+        "p99": 1000 * ordered[last * 99 // 100],
+        "max": 1000 * ordered[last],
+    }
+
+
+class BotHost:
+    """ Runs many bots against a server in one event loop """
+
+    def __init__(self, host, port, bots):
+        """ Creates a new bot host
+        :param host: server host
+        :param port: server port
+        :param bots: list of Bots
+        """
+        self.host = host
+        self.port = port
+        self.bots = bots
+
+    def run(self):
+        """ Connects all bots and runs them until they played all their games or lost their connection
+        :return: list of the reports of the bots
+        """
+        asyncio.run(self.serve())
+        return self.report()
+
+    async def serve(self):
+        """ Runs all bots concurrently until they are done """
+        await asyncio.gather(*(self.run_bot(bot) for bot in self.bots))
+
+    async def run_bot(self, bot):
+        """ Connects the given bot and plays its games. Errors, such as a lost connection, a malformed message or
+          an exception raised by the player, only end the given bot and are kept in bot.error.
+        :param bot: Bot
+        """
+        loop = asyncio.get_running_loop()
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.setblocking(False)
+        bot.socket = s
+        try:
+            await loop.sock_connect(s, (self.host, self.port))
+            running = True
+            while running:
+                data = bot.take_outgoing()
+                if data:
+                    await loop.sock_sendall(s, data)
+                    bot.sent_at = time.perf_counter()
+
+                data = await loop.sock_recv(s, bot.BUFFER_SIZE)
+                if not data:
+                    raise ConnectionError("connection closed by the server")
+                received_at = time.perf_counter()
+                bot.decoder.feed(data)
+
+                complete, message = bot.decoder.decode()
+                while complete and running:
+                    running = bot.handle(message, received_at)
+                    complete, message = bot.decoder.decode()
+        except Exception as e:
+            bot.error = repr(e)
+        finally:
+            s.close()
+
+    def report(self):
+        """ Returns the reports of all bots
+        :return: list of JSON-compatible dictionaries
+        """
+        return [bot.report() for bot in self.bots]
@@ -0,0 +1,168 @@
+"""
+    Implements checkpoints of games in progress, so a game can be resumed after its process died.
+
+    A checkpoint is the Configuration of the Dealer at a turn boundary, after the players were rotated for the next
+    turn, together with the number of turns played. The Configuration holds the players in turn order, their
+    species, bags and cards, the watering hole and the remaining deck in order, which is all the state the Dealer
+    carries from one turn to the next.
+
+    On disk a checkpoint is a header followed by the Configuration as compact JSON compressed with zlib:
+
+        magic (4 bytes) | version (1 byte) | turns played (4 bytes, big-endian) | compressed Configuration
+
+    A checkpoint file holds a single checkpoint and is replaced atomically, so a crash while writing leaves the
+    previous checkpoint intact.
+
+"""
+
+import os
+import json
+import zlib
+import struct
+import threading
+
+
+MAGIC = b"EVCK"
+VERSION = 1
+HEADER = struct.Struct(">4sBI")
+
+
+def encode_checkpoint(turn, configuration):
+    """ Encodes a checkpoint
+    :param turn: number of turns played
+    :param configuration: Configuration of the Dealer
+    :return: bytes
+    """
+    data = json.dumps(configuration, separators=(",", ":")).encode()
+    return HEADER.pack(MAGIC, VERSION, turn) + zlib.compress(data)
+
+
+def decode_checkpoint(data):
+    """ Decodes a checkpoint encoded by encode_checkpoint
+    :param data: bytes
+    :return: (turn, Configuration) tuple
+    :raise: ValueError if the data is not a checkpoint
+    """
+    if len(data) < HEADER.size:
+        raise ValueError("checkpoint is truncated")
+    magic, version, turn = HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a checkpoint of version {}".format(VERSION))
+    try:
+        return turn, json.loads(zlib.decompress(data[HEADER.size:]).decode())
+    except zlib.error as e:
+        raise ValueError("checkpoint is corrupted") from e
+
+
+def write_checkpoint(path, turn, configuration):
+    """ Writes a checkpoint to the given path, replacing any previous checkpoint atomically
+    :param path: path of the checkpoint file
+    :param turn: number of turns played
+    :param configuration: Configuration of the Dealer
+    """
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(encode_checkpoint(turn, configuration))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary_path, path)
+
+
+def read_checkpoint(path):
+    """ Reads the checkpoint at the given path
+    :param path: path of the checkpoint file
+    :return: (turn, Configuration) tuple
+    :raise: OSError if the file cannot be read, ValueError if it is not a checkpoint
+    """
+    with open(path, "rb") as f:
+        return decode_checkpoint(f.read())
+
+
+class CheckpointWriter:
+    """ Writes checkpoints of a Dealer every few turns, see Dealer.run_game.
+
+    The turn loop only serializes the Dealer, encoding and writing happen in a background thread. Writes are
+    write-behind: if a checkpoint is still being written when the next one is saved, only the latest pending
+    checkpoint is written, so a slow disk never stalls the game.
+    """
+
+    def __init__(self, path, every=1):
+        """ Creates a writer and starts its background thread
+        :param path: path of the checkpoint file
+        :param every: number of turns between checkpoints
+        """
+        self.path = path
+        self.every = every
+        self.condition = threading.Condition()
+        self.pending = None
+        self.writing = False
+        self.closed = False
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="checkpoint-writer", daemon=True)
+        self.thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def save(self, dealer):
+        """ Schedules a checkpoint of the given dealer if a checkpoint is due at its turn
+        :param dealer: Dealer at a turn boundary
+        :raise: OSError if writing a previous checkpoint failed
+        """
+        if dealer.turn % self.every:
+            return
+        checkpoint = dealer.turn, dealer.serialize()
+        with self.condition:
+            self.raise_error()
+            self.pending = checkpoint
+            self.condition.notify_all()
+
+    def flush(self):
+        """ Waits until every scheduled checkpoint was written
+        :raise: OSError if writing a checkpoint failed
+        """
+        with self.condition:
+            while self.pending is not None or self.writing:
+                self.condition.wait()
+            self.raise_error()
+
+    def close(self):
+        """ Writes the pending checkpoint and stops the background thread
+        :raise: OSError if writing a checkpoint failed
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        self.thread.join()
+        with self.condition:
+            self.raise_error()
+
+    def raise_error(self):
+        """ Raises the error of the last failed write, must be called holding the condition """
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def run(self):
+        """ Writes pending checkpoints until the writer is closed """
+        while True:
+            with self.condition:
+                while self.pending is None and not self.closed:
+                    self.condition.wait()
+                if self.pending is None:
+                    return
+                (turn, configuration), self.pending = self.pending, None
+                self.writing = True
+
+            try:
+                write_checkpoint(self.path, turn, configuration)
+            except OSError as e:
+                with self.condition:
+                    self.error = e
+            finally:
+                with self.condition:
+                    self.writing = False
+                    self.condition.notify_all()
@@ -12,10 +12,18 @@
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+from .checkpoint import read_checkpoint
+from .deck import Deck
+from .feeding_engine import FeedingEngine
+
 from ..data_definitions import DataDefinitions
 
 from ..player.player import Player
 
+from ..common.attackability import AttackabilityIndex
+from ..common.instrumentation import GAME, STEP1, STEP2_3, STEP4, FEED1
 from ..common.trait import HORNS_DAMAGE
 from ..common.trait_card import TraitCard
 
@@ -35,6 +43,10 @@ class Dealer:
     CARDS_PER_SPECIES = 1
     # index of the starting player
     STARTING_PLAYER_IDX = 0
+    # compute feeding choices incrementally during the feeding step, see FeedingEngine
+    INCREMENTAL_FEEDING = True
+    # call start and choose of all players at the same time, see apply_to_all_players
+    CONCURRENT_PLAYER_CALLS = False
 
     # Configuration constants
     CONFIGURATION_PLAYERS_MIN = 3
@@ -54,10 +66,43 @@ class Dealer:
         """
         self.watering_hole = watering_hole if watering_hole is not None else self.WATERING_HOLE_MINIMUM
         self.players = players.copy() if players is not None else []
-        self.deck = deck.copy() if deck is not None else []
+        self.deck = Deck(deck)
+        # number of turns played by run_game
+        self.turn = 0
 
         # players who can still feed, set and used during step4
         self.active_players = self.players.copy()
+        # attackable species looked up during the feeding step, renewed at the start of every feeding step
+        self.attackability = AttackabilityIndex()
+        # if true, feeding choices are computed incrementally by a FeedingEngine during the feeding step
+        self.incremental_feeding = self.INCREMENTAL_FEEDING
+        self.feeding_engine = None
+        # if true, the external players are called at the same time in step1 and step2_3
+        self.concurrent_player_calls = self.CONCURRENT_PLAYER_CALLS
+        # EventRecorder logging every event of the games run by this dealer, or None
+        self.recorder = None
+        # Instrumentation timing the steps of the games run by this dealer, or None, see instrument
+        self.instrumentation = None
+
+    def instrument(self, instrumentation):
+        """ Records the durations of the steps, feedings and external player calls of the games run by this dealer
+          and the traffic of its remote players in the given Instrumentation, see instrumentation.py
+          Effect: sets the instrumentation of the dealer and of its players
+        :param instrumentation: Instrumentation, or None to stop recording
+        """
+        self.instrumentation = instrumentation
+        for player in self.players:
+            player.instrument(instrumentation)
+
+    def timed(self, name, function, *args):
+        """ Calls the given function, recording the duration of the call if the dealer has an instrumentation
+        :param name: name of the timed operation, see instrumentation.py
+        :param function: function to call with the given arguments
+        :return: result of the function
+        """
+        if self.instrumentation is None:
+            return function(*args)
+        return self.instrumentation.timed(name, function, *args)
 
     def add_external_players(self, players):
         """ Adds the given external players to the game. Any existing external players are replaced.
@@ -66,18 +111,32 @@ class Dealer:
         :return: list of ids assigned to each player, the ids correspond to each player in the given list
         """
         self.players = [Player(idx + 1, external=player) for idx, player in enumerate(players)]
+        if self.instrumentation is not None:
+            self.instrument(self.instrumentation)
         return [p.idx for p in self.players]
 
-    def run_game(self):
+    def run_game(self, checkpoints=None):
         """ Simulates an entire Evolution game
           * for determinism the dealer deals cards in their sorted order, smallest first
           * the turns repeat as long as there are enough cards to deal out to all player
+        :param checkpoints: CheckpointWriter saving the game at turn boundaries, or None
+        """
+        self.deck = Deck(sorted(DataDefinitions.deck()))
+        self.turn = 0
+        self.timed(GAME, self.resume_game, checkpoints)
+
+    def resume_game(self, checkpoints=None):
+        """ Plays the remaining turns of a game, from the start of a turn. Used by run_game and to continue a game
+          loaded with load_checkpoint.
+          Effect: counts the game in the instrumentation of the dealer, if any
+        :param checkpoints: CheckpointWriter saving the game at turn boundaries, or None
         """
-        self.deck = sorted(DataDefinitions.deck())
-
         def num_cards_to_deal():
             return sum(self.num_cards_to_deal(player) for player in self.players)
 
+        if self.recorder is not None:
+            self.recorder.game_start(self)
+
         while num_cards_to_deal() <= len(self.deck):
             self.take_turn()
             # if there are no more players stop the main loop
@@ -85,6 +144,32 @@ class Dealer:
                 break
             # the order of players is determined in round-robin fashion
             self.players = self.players[1:] + self.players[:1]
+            self.turn += 1
+            if self.recorder is not None:
+                self.recorder.end_turn(self)
+            if checkpoints is not None:
+                checkpoints.save(self)
+
+        if self.recorder is not None:
+            self.recorder.game_end(self)
+        if self.instrumentation is not None:
+            self.instrumentation.game_over()
+
+    @classmethod
+    def load_checkpoint(cls, path, external_players):
+        """ Creates a Dealer from a checkpoint written by a CheckpointWriter, ready for resume_game
+        :param path: path of the checkpoint file
+        :param external_players: list of external players in the order they were given to add_external_players,
+                                 the player with id n is external_players[n - 1]
+        :return: Dealer
+        :raise: OSError if the file cannot be read, ValueError if it is not a checkpoint
+        """
+        turn, configuration = read_checkpoint(path)
+        dealer = cls.deserialize(configuration)
+        dealer.turn = turn
+        for player in dealer.players:
+            player.external = external_players[player.idx - 1]
+        return dealer
 
     @classmethod
     def num_cards_to_deal(cls, player):
@@ -103,9 +188,9 @@ class Dealer:
           * step2/3: choose a card to discard along with cards to use for other purposes
           * step4: apply the chosen actions and feed
         """
-        self.step1()
-        action_list = self.step2_3()
-        self.step4(action_list)
+        self.timed(STEP1, self.step1)
+        action_list = self.timed(STEP2_3, self.step2_3)
+        self.timed(STEP4, self.step4, action_list)
         self.end_turn()
 
     def step1(self):
@@ -113,11 +198,17 @@ class Dealer:
           and then a specific number of cards along with an additional one for each species.
           Effect: if any issues occurred when calling the external player, the player is removed from the game
         """
+        # the cards are dealt in turn order before any player is called, so the deal does not depend on the order
+        # in which the calls finish
+        cards_to_give = {id(player): self.deal_cards(self.num_cards_to_deal(player)) for player in self.players}
+        if self.recorder is not None:
+            for player in self.players:
+                self.recorder.step1(player, not player.species, cards_to_give[id(player)])
+
         def start_step(player):
             has_any_species = len(player.species) > 0
             new_species = not has_any_species
-            cards_to_give = self.deal_cards(self.num_cards_to_deal(player))
-            return player.start(self.watering_hole, new_species, cards_to_give)
+            return player.start(self.watering_hole, new_species, cards_to_give[id(player)])
 
         self.apply_to_all_players(start_step)
 
@@ -126,13 +217,17 @@ class Dealer:
         :param n: number of cards to remove
         :return: up to n topmost cards from the deck
         """
-        cards_to_remove = min(n, len(self.deck))
-        return [self.deck.pop(0) for _ in range(cards_to_remove)]
+        return self.deck.draw(n)
 
     def apply_to_all_players(self, function):
         """ Applies the given function to all players in the game, in order. If there is an issue with the
           external player, the player is kicked out of the game.
 
+          If concurrent_player_calls is set, the function is applied to all players at the same time, each in its
+          own thread, and the responses are gathered in the order of the players. Every call to an external player
+          runs under its own deadline, see ExternalPlayerCall, so a slow player only delays the step until its own
+          deadline passes.
+
           Effect: modifies self.players, removing problematic players if necessary
           Invariant: len(response) == len(self.players)
 
@@ -140,10 +235,15 @@ class Dealer:
         :return: result of the executions of the given function on each player, results from removed player are
                  omitted from the list
         """
+        if self.concurrent_player_calls and len(self.players) > 1:
+            with ThreadPoolExecutor(len(self.players)) as executor:
+                responses = list(executor.map(function, self.players))
+        else:
+            responses = map(function, self.players)
+
         answers = []
         bad_players = []
-        for player_idx, player in enumerate(self.players):
-            response = function(player)
+        for player_idx, response in enumerate(responses):
             valid, content = self.handle_player_response(response)
             # remove the player if the response was invalid
             if valid:
@@ -153,7 +253,9 @@ class Dealer:
 
         bad_players.reverse()
         for bad_player_idx in bad_players:
-            self.players.pop(bad_player_idx)
+            removed_player = self.players.pop(bad_player_idx)
+            if self.recorder is not None:
+                self.recorder.player_removed(removed_player)
 
         return answers
 
@@ -205,6 +307,8 @@ class Dealer:
         player = self.players[player_index]
         discard_value = actions.apply(player)
         self.update_watering_hole(discard_value)
+        if self.recorder is not None:
+            self.recorder.actions(player, actions, self.watering_hole)
 
     def auto_traits(self):
         """ Effect: feeds all players' species in order, based on their auto-feeding traits, updates the watering
@@ -212,14 +316,25 @@ class Dealer:
         """
         for player in self.players:
             self.watering_hole -= player.auto_traits(self.watering_hole)
+        if self.recorder is not None:
+            self.recorder.auto_traits(self.watering_hole)
 
     def feeding_step(self):
         """ Runs the feeding step until all players' species are fed or there is no more food in the watering hole
         """
-        self.reset_active_players()
+        self.start_feeding_step()
+        self.feeding_engine = FeedingEngine(self.attackability) if self.incremental_feeding else None
 
-        while self.watering_hole > self.WATERING_HOLE_MINIMUM and self.active_players:
-            self.feed1()
+        try:
+            while self.watering_hole > self.WATERING_HOLE_MINIMUM and self.active_players:
+                self.timed(FEED1, self.feed1)
+        finally:
+            self.feeding_engine = None
+
+    def start_feeding_step(self):
+        """ Prepares the feeding step: every player can feed and the attackable species are looked up anew """
+        self.reset_active_players()
+        self.attackability = AttackabilityIndex()
 
     def feed1(self):
         """ Perform one step of the feeding. The watering hole cannot be empty.
@@ -228,14 +343,31 @@ class Dealer:
           Effect: rotates the player order at the end
         """
         current_player = self.get_current_player()
-        current_player_index = self.players.index(current_player)
-        feeding_outcome_response = current_player.feeding_choice(self.player_queue_all[1:], self.watering_hole)
+        other_players = self.player_queue_all[1:]
+        if self.feeding_engine is not None:
+            feeding_outcome_response = self.feeding_engine.feeding_choice(current_player, other_players,
+                                                                          self.watering_hole)
+        else:
+            feeding_outcome_response = current_player.feeding_choice(other_players, self.watering_hole,
+                                                                    self.attackability)
 
         valid_response, feeding_outcome = self.handle_player_response(feeding_outcome_response)
+        self.apply_feeding(feeding_outcome if valid_response else None)
+
+    def apply_feeding(self, feeding_outcome):
+        """ Applies the feeding chosen by the current player
+          Effect: removes the current player from the game if the feeding is invalid, rotates the player order at
+                  the end
+        :param feeding_outcome: FeedingOutcome of the current player, None if the player's response was invalid;
+                                feedings chosen by Player.feeding_choice are legal, see FeedingOutcome.parse
+        """
+        current_player = self.get_current_player()
+        if self.recorder is not None:
+            self.recorder.feed1(current_player, feeding_outcome)
 
         # remove player from game for invalid responses
-        if not valid_response or not feeding_outcome.validate(self):
-            self.players.pop(current_player_index)
+        if feeding_outcome is None:
+            self.players.remove(current_player)
             remove_player_from_active = True
         else:
             remove_player_from_active = feeding_outcome.apply(self)
@@ -315,6 +447,10 @@ class Dealer:
         else:
             attacker_died = False
 
+        if self.recorder is not None:
+            self.recorder.carnivore(current_player, species_index, defending_player, defending_species_index,
+                                    defender_horns, attacker_died)
+
         if not attacker_died:
             self.feed_species(current_player, species_index)
             self.scavenge()
@@ -326,6 +462,8 @@ class Dealer:
         for player in self.player_queue_all:
             food_taken = player.scavenge(self.watering_hole)
             self.watering_hole -= food_taken
+            if food_taken and self.recorder is not None:
+                self.recorder.scavenge(player, food_taken)
 
     def hurt_species(self, player, species_index, damage):
         """ Kills off `damage' population of the species at the given index belonging to the given player.
@@ -346,7 +484,10 @@ class Dealer:
           Effect: hand the player the appropriate amount of cards
         :param player: owner of the species
         """
-        player.add_cards(self.deal_cards(self.EXTINCT_SPECIES_PAYOUT))
+        cards = self.deal_cards(self.EXTINCT_SPECIES_PAYOUT)
+        if self.recorder is not None:
+            self.recorder.extinct(player, cards)
+        player.add_cards(cards)
 
     def ranking(self):
         """ Computes the player ranking based on the number of tokens in each player's food bag; the player
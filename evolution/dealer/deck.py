@@ -0,0 +1,53 @@
+"""
+    Implements the deck of trait cards held by the Dealer.
+
+"""
+
+
+class Deck:
+    """ Represents a deck of trait cards. Cards are drawn from the top of the deck.
+
+    The cards are stored in a list that is never modified, drawing cards moves a cursor past them,
+    so drawing n cards takes O(n) time regardless of the size of the deck.
+    """
+
+    def __init__(self, cards=None):
+        """ Creates a new deck
+        :param cards: iterable of TraitCards, the first card is the top of the deck
+        """
+        self.cards = list(cards) if cards is not None else []
+        self.top = 0
+
+    def __repr__(self):
+        return "Deck({})".format(repr(self.remaining()))
+
+    def __str__(self):
+        return self.__repr__()
+
+    def __len__(self):
+        return len(self.cards) - self.top
+
+    def __iter__(self):
+        return iter(self.remaining())
+
+    def __eq__(self, other):
+        if isinstance(other, Deck):
+            return self.remaining() == other.remaining()
+        if isinstance(other, list):
+            return self.remaining() == other
+        return False
+
+    def remaining(self):
+        """ Returns the cards left in the deck, top card first
+        :return: list of TraitCards
+        """
+        return self.cards[self.top:]
+
+    def draw(self, n):
+        """ Removes and returns the n topmost cards from the deck or less if less are available.
+        :param n: number of cards to draw
+        :return: list of up to n TraitCards, top card first
+        """
+        drawn = self.cards[self.top:self.top + n]
+        self.top += len(drawn)
+        return drawn
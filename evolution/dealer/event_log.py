@@ -0,0 +1,538 @@
+"""
+    Implements an append-only binary log of the events of Evolution games, for replays and statistics.
+
+    A Dealer with an EventRecorder reports every step of a game to it: the cards dealt in step1, the actions of
+    every player, the auto traits, every feeding with its carnivore attacks, scavenging and extinctions, the end of
+    every turn and the final ranking. Every few turns the recorder adds a snapshot of the Dealer, so a game can be
+    reconstructed at any turn without replaying it from the start, see replay_index.py. Many games can be recorded
+    one after another in the same log.
+
+    The log is a sequence of records:
+
+        length (varint) | event type (1 byte) | fields
+
+    where length is the number of bytes after it and the fields are unsigned varints, except for the snapshots of
+    GameStart and Snapshot, which are checkpoints as encoded by encode_checkpoint. Cards are stored as their code,
+    the index of the card in the sorted list of all cards.
+
+    An EventReader decodes the records of a log one at a time, so a log is never loaded in memory as a whole. Events
+    are named tuples, see EVENT_TYPES. A Replay applies the events of a game to a Dealer, which then goes through
+    the same states as the recorded Dealer without calling any player, and EventStatistics aggregates events.
+
+"""
+
+from collections import namedtuple, Counter
+
+from .checkpoint import encode_checkpoint, decode_checkpoint
+from .dealer import Dealer
+from .fast_dealer import CARD_CODES
+
+from ..common.actions import Actions
+from ..common.feeding_outcome import CannotFeed, NoFeeding, VegetarianFeeding, FatTissueFeeding, CarnivoreFeeding
+from ..common.species import Species
+
+
+GameStart = namedtuple("GameStart", "game turn configuration")
+Step1 = namedtuple("Step1", "player new_species cards")
+PlayerRemoved = namedtuple("PlayerRemoved", "player")
+ActionsApplied = namedtuple("ActionsApplied", "player watering_hole action4")
+AutoTraits = namedtuple("AutoTraits", "watering_hole")
+Feed1 = namedtuple("Feed1", "player valid feeding")
+Carnivore = namedtuple("Carnivore", "attacker attacker_species defender defender_species horns attacker_died")
+Scavenge = namedtuple("Scavenge", "player food")
+Extinct = namedtuple("Extinct", "player cards")
+EndTurn = namedtuple("EndTurn", "turn")
+GameEnd = namedtuple("GameEnd", "ranking")
+Snapshot = namedtuple("Snapshot", "game turn configuration")
+
+# event type -> event class, the type is the first byte of a record
+EVENT_TYPES = {
+    1: GameStart,
+    2: Step1,
+    3: PlayerRemoved,
+    4: ActionsApplied,
+    5: AutoTraits,
+    6: Feed1,
+    7: Carnivore,
+    8: Scavenge,
+    9: Extinct,
+    10: EndTurn,
+    11: GameEnd,
+    12: Snapshot,
+}
+EVENT_CODES = {event_class: code for code, event_class in EVENT_TYPES.items()}
+
+# feeding kinds in Feed1 records
+FEEDING_CANNOT_FEED = 0
+FEEDING_NO_FEEDING = 1
+FEEDING_VEGETARIAN = 2
+FEEDING_FAT_TISSUE = 3
+FEEDING_CARNIVORE = 4
+FEEDING_INVALID = 5
+
+
+def encode_varint(value, buffer):
+    """ Appends the given unsigned integer to the buffer as a varint, 7 bits per byte, least significant first
+    :param value: natural number
+    :param buffer: bytearray
+    """
+    while value >= 0x80:
+        buffer.append((value & 0x7f) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def decode_varint(data, offset):
+    """ Decodes the varint at the given offset
+    :param data: bytes-like object
+    :param offset: index of the first byte of the varint
+    :return: (value, offset after the varint) tuple
+    :raise: ValueError if the varint is truncated
+    """
+    value = 0
+    shift = 0
+    while True:
+        if offset >= len(data):
+            raise ValueError("truncated varint")
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7f) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def decode_varints(data, offset=0):
+    """ Decodes all varints from the given offset to the end of the data
+    :return: list of natural numbers
+    """
+    values = []
+    while offset < len(data):
+        value, offset = decode_varint(data, offset)
+        values.append(value)
+    return values
+
+
+def card_codes(cards):
+    """ Returns the codes of the given TraitCards """
+    return [CARD_CODES[(card.value, card.trait.value)] for card in cards]
+
+
+def encode_action4(action4):
+    """ Returns the fields of the given Action4 """
+    discard, grow_population, grow_body, board_transfer, replace_trait = action4
+    fields = [discard, len(grow_population)]
+    for _, species_index, card_index in grow_population:
+        fields.extend((species_index, card_index))
+    fields.append(len(grow_body))
+    for _, species_index, card_index in grow_body:
+        fields.extend((species_index, card_index))
+    fields.append(len(board_transfer))
+    for board_transfer_cards in board_transfer:
+        fields.append(len(board_transfer_cards))
+        fields.extend(board_transfer_cards)
+    fields.append(len(replace_trait))
+    for replacement in replace_trait:
+        fields.extend(replacement)
+    return fields
+
+
+def decode_action4(fields):
+    """ Returns the Action4 encoded by encode_action4
+    :param fields: iterator over the fields
+    """
+    discard = next(fields)
+    grow_population = [["population", next(fields), next(fields)] for _ in range(next(fields))]
+    grow_body = [["body", next(fields), next(fields)] for _ in range(next(fields))]
+    board_transfer = [[next(fields) for _ in range(next(fields))] for _ in range(next(fields))]
+    replace_trait = [[next(fields), next(fields), next(fields)] for _ in range(next(fields))]
+    return [discard, grow_population, grow_body, board_transfer, replace_trait]
+
+
+def encode_feeding(feeding_outcome):
+    """ Returns the fields of the given FeedingOutcome, None for an invalid feeding """
+    if feeding_outcome is None:
+        return [FEEDING_INVALID]
+    if isinstance(feeding_outcome, NoFeeding):
+        return [FEEDING_NO_FEEDING]
+    if isinstance(feeding_outcome, VegetarianFeeding):
+        return [FEEDING_VEGETARIAN, feeding_outcome.species_index]
+    if isinstance(feeding_outcome, FatTissueFeeding):
+        return [FEEDING_FAT_TISSUE, feeding_outcome.species_index, feeding_outcome.food_tokens]
+    if isinstance(feeding_outcome, CarnivoreFeeding):
+        return [FEEDING_CARNIVORE, feeding_outcome.species_index, feeding_outcome.player_index,
+                feeding_outcome.defender_index]
+    return [FEEDING_CANNOT_FEED]
+
+
+def decode_feeding(fields):
+    """ Returns the (valid, FeedingOutcome) tuple encoded by encode_feeding, the outcome is None if invalid """
+    kind, *arguments = fields
+    if kind == FEEDING_INVALID:
+        return False, None
+    if kind == FEEDING_NO_FEEDING:
+        return True, NoFeeding()
+    if kind == FEEDING_VEGETARIAN:
+        return True, VegetarianFeeding(*arguments)
+    if kind == FEEDING_FAT_TISSUE:
+        return True, FatTissueFeeding(*arguments)
+    if kind == FEEDING_CARNIVORE:
+        return True, CarnivoreFeeding(*arguments)
+    return True, CannotFeed()
+
+
+def decode_event(event_type, payload):
+    """ Decodes the payload of a record
+    :param event_type: event type of the record
+    :param payload: bytes after the event type
+    :return: event
+    :raise: ValueError if the record is invalid
+    """
+    event_class = EVENT_TYPES.get(event_type)
+    if event_class is None:
+        raise ValueError("unknown event type {}".format(event_type))
+
+    if event_class is GameStart or event_class is Snapshot:
+        game, offset = decode_varint(payload, 0)
+        turn, configuration = decode_checkpoint(bytes(payload[offset:]))
+        return event_class(game, turn, configuration)
+
+    fields = decode_varints(payload)
+    if event_class is Step1:
+        player, new_species, *cards = fields
+        return Step1(player, bool(new_species), cards)
+    if event_class is ActionsApplied:
+        player, watering_hole, *action4 = fields
+        return ActionsApplied(player, watering_hole, decode_action4(iter(action4)))
+    if event_class is Feed1:
+        player, *feeding = fields
+        valid, feeding_outcome = decode_feeding(feeding)
+        return Feed1(player, valid, feeding_outcome)
+    if event_class is Carnivore:
+        attacker, attacker_species, defender, defender_species, flags = fields
+        return Carnivore(attacker, attacker_species, defender, defender_species, bool(flags & 1), bool(flags & 2))
+    if event_class is Extinct:
+        player, *cards = fields
+        return Extinct(player, cards)
+    if event_class is GameEnd:
+        return GameEnd(list(zip(fields[0::2], fields[1::2])))
+    return event_class(*fields)
+
+
+def decode_records(data, offset=0, end=None):
+    """ Decodes the records of a log held in memory, e.g. a memory-mapped log
+    :param data: bytes-like object holding the log
+    :param offset: offset of the first record to decode
+    :param end: offset at which to stop, the end of the data by default
+    :return: generator of (offset, event type, payload) tuples
+    :raise: ValueError if a record is truncated
+    """
+    end = len(data) if end is None else end
+    while offset < end:
+        length, start = decode_varint(data, offset)
+        if not length or start + length > len(data):
+            raise ValueError("truncated record at offset {}".format(offset))
+        yield offset, data[start], data[start + 1:start + length]
+        offset = start + length
+
+
+class EventRecorder:
+    """ Writes the events reported by a Dealer to a binary log, see Dealer.recorder.
+
+    Records are collected in a buffer that is written to the file when it holds buffer_size bytes, so recording
+    costs one write call per many events.
+    """
+
+    BUFFER_SIZE = 1 << 16
+    SNAPSHOT_EVERY = 4
+
+    def __init__(self, file, buffer_size=None, snapshot_every=None):
+        """ Creates a recorder writing to the given file
+        :param file: binary file opened for writing or appending
+        :param buffer_size: number of bytes buffered before writing, defaults to BUFFER_SIZE
+        :param snapshot_every: number of turns between snapshots, defaults to SNAPSHOT_EVERY
+        """
+        self.file = file
+        self.buffer_size = buffer_size if buffer_size is not None else self.BUFFER_SIZE
+        self.snapshot_every = snapshot_every if snapshot_every is not None else self.SNAPSHOT_EVERY
+        self.buffer = bytearray()
+        self.games = 0
+        # id of the game being recorded
+        self.game = None
+
+    @classmethod
+    def open(cls, path, buffer_size=None, snapshot_every=None):
+        """ Creates a recorder appending to the log at the given path """
+        return cls(open(path, "ab"), buffer_size, snapshot_every)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def record(self, event_class, fields, raw=b""):
+        """ Appends a record to the buffer
+        :param event_class: class of the event
+        :param fields: list of natural numbers
+        :param raw: bytes appended after the fields
+        """
+        record = bytearray([EVENT_CODES[event_class]])
+        for field in fields:
+            encode_varint(field, record)
+        record += raw
+
+        encode_varint(len(record), self.buffer)
+        self.buffer += record
+        if len(self.buffer) >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        """ Writes the buffered records to the file """
+        if self.buffer:
+            self.file.write(self.buffer)
+            self.buffer.clear()
+        self.file.flush()
+
+    def close(self):
+        """ Writes the buffered records and closes the file """
+        self.flush()
+        self.file.close()
+
+    def game_start(self, dealer):
+        """ Records the start of a game with a snapshot of the dealer
+        :return: id of the game, counting the games recorded by this recorder
+        """
+        self.game = self.games
+        self.games += 1
+        self.record(GameStart, [self.game], encode_checkpoint(dealer.turn, dealer.serialize()))
+        return self.game
+
+    def step1(self, player, new_species, cards):
+        self.record(Step1, [player.idx, int(new_species)] + card_codes(cards))
+
+    def player_removed(self, player):
+        self.record(PlayerRemoved, [player.idx])
+
+    def actions(self, player, actions, watering_hole):
+        self.record(ActionsApplied, [player.idx, watering_hole] + encode_action4(actions.serialize()))
+
+    def auto_traits(self, watering_hole):
+        self.record(AutoTraits, [watering_hole])
+
+    def feed1(self, player, feeding_outcome):
+        self.record(Feed1, [player.idx] + encode_feeding(feeding_outcome))
+
+    def carnivore(self, attacker, attacker_species, defender, defender_species, horns, attacker_died):
+        flags = int(horns) | int(attacker_died) << 1
+        self.record(Carnivore, [attacker.idx, attacker_species, defender.idx, defender_species, flags])
+
+    def scavenge(self, player, food):
+        self.record(Scavenge, [player.idx, food])
+
+    def extinct(self, player, cards):
+        self.record(Extinct, [player.idx] + card_codes(cards))
+
+    def end_turn(self, dealer):
+        """ Records the end of a turn, and a snapshot of the dealer if one is due
+        :param dealer: Dealer at a turn boundary, after the players were rotated for the next turn
+        """
+        self.record(EndTurn, [dealer.turn])
+        if self.snapshot_every and dealer.turn % self.snapshot_every == 0:
+            self.record(Snapshot, [self.game], encode_checkpoint(dealer.turn, dealer.serialize()))
+
+    def game_end(self, dealer):
+        fields = []
+        for idx, score in dealer.ranking():
+            fields.extend((idx, score))
+        self.record(GameEnd, fields)
+
+
+class EventReader:
+    """ Reads the events of a binary log one record at a time. """
+
+    def __init__(self, file):
+        """ Creates a reader of the given file
+        :param file: binary file opened for reading, positioned at the start of a record
+        """
+        self.file = file
+
+    def records(self):
+        """ Reads the records of the log
+        :return: generator of (offset, event type, payload) tuples, offset is the position of the record in the file
+        :raise: ValueError if the log ends in the middle of a record
+        """
+        while True:
+            offset = self.file.tell()
+            length = self.read_length()
+            if length is None:
+                return
+            record = self.file.read(length)
+            if len(record) < length or not record:
+                raise ValueError("truncated record at offset {}".format(offset))
+            yield offset, record[0], record[1:]
+
+    def read_length(self):
+        """ Reads the length of the next record, None at the end of the file """
+        length = bytearray()
+        while True:
+            byte = self.file.read(1)
+            if not byte:
+                if length:
+                    raise ValueError("truncated record length")
+                return None
+            length += byte
+            if byte[0] < 0x80:
+                return decode_varint(length, 0)[0]
+
+    def __iter__(self):
+        """ Yields the events of the log """
+        for _, event_type, payload in self.records():
+            yield decode_event(event_type, payload)
+
+
+def read_events(path):
+    """ Yields the events of the log at the given path """
+    with open(path, "rb") as f:
+        yield from EventReader(f)
+
+
+class Replay:
+    """ Applies the recorded events of a game to a Dealer. The players are never called: their choices are
+      taken from the log, everything else is computed by the Dealer as during the recorded game.
+    """
+
+    def __init__(self):
+        self.dealer = None
+        self.game = None
+
+    def players(self):
+        """ Returns a dictionary from player id to Player """
+        return {player.idx: player for player in self.dealer.players}
+
+    def apply(self, event):
+        """ Applies the given event to the dealer
+        :param event: event of the game being replayed, starting with its GameStart or a Snapshot
+        :raise: ValueError if the event does not match the state of the dealer
+        """
+        if isinstance(event, GameStart) or (isinstance(event, Snapshot) and self.dealer is None):
+            self.game = event.game
+            self.dealer = Dealer.deserialize(event.configuration)
+            self.dealer.turn = event.turn
+            return
+
+        dealer = self.dealer
+        if isinstance(event, Step1):
+            player = self.players()[event.player]
+            cards = dealer.deal_cards(len(event.cards))
+            if card_codes(cards) != event.cards:
+                raise ValueError("the cards dealt do not match the deck")
+            if event.new_species:
+                player.species.append(Species())
+            player.add_cards(cards)
+        elif isinstance(event, PlayerRemoved):
+            dealer.players.remove(self.players()[event.player])
+        elif isinstance(event, ActionsApplied):
+            player = self.players()[event.player]
+            dealer.apply_actions(dealer.players.index(player), Actions.deserialize(event.action4))
+        elif isinstance(event, AutoTraits):
+            dealer.auto_traits()
+            # the feeding step starts right after the auto traits
+            dealer.start_feeding_step()
+        elif isinstance(event, Feed1):
+            if dealer.get_current_player().idx != event.player:
+                raise ValueError("player {} is not the current player".format(event.player))
+            dealer.apply_feeding(event.feeding)
+        elif isinstance(event, EndTurn):
+            dealer.end_turn()
+            if dealer.players:
+                dealer.players = dealer.players[1:] + dealer.players[:1]
+            dealer.turn = event.turn
+
+        # the other events are consequences of the events above
+
+
+def replay_game(events, game=0):
+    """ Replays a recorded game
+    :param events: iterable of events, e.g. an EventReader
+    :param game: position of the game in the log, the first game by default
+    :return: Dealer in the state at the end of the game
+    :raise: ValueError if the game is not in the log
+    """
+    replay = None
+    position = -1
+    for event in events:
+        if isinstance(event, GameStart):
+            if replay is not None:
+                break
+            position += 1
+            if position == game:
+                replay = Replay()
+        if replay is not None:
+            replay.apply(event)
+            if isinstance(event, GameEnd):
+                break
+
+    if replay is None:
+        raise ValueError("game {} is not in the log".format(game))
+    return replay.dealer
+
+
+class EventStatistics:
+    """ Aggregates statistics over the events of any number of games. """
+
+    def __init__(self):
+        self.games = 0
+        self.turns = 0
+        self.events = Counter()
+        self.feedings = Counter()
+        self.attacks = 0
+        self.horns_deaths = 0
+        self.extinctions = 0
+        self.scavenged_food = 0
+        self.players_removed = 0
+        self.winning_scores = Counter()
+
+    def add(self, event):
+        """ Adds the given event to the statistics """
+        self.events[type(event).__name__] += 1
+        if isinstance(event, GameStart):
+            self.games += 1
+        elif isinstance(event, EndTurn):
+            self.turns += 1
+        elif isinstance(event, Feed1):
+            self.feedings[type(event.feeding).__name__ if event.valid else "Invalid"] += 1
+        elif isinstance(event, Carnivore):
+            self.attacks += 1
+            self.horns_deaths += event.attacker_died
+        elif isinstance(event, Extinct):
+            self.extinctions += 1
+        elif isinstance(event, Scavenge):
+            self.scavenged_food += event.food
+        elif isinstance(event, PlayerRemoved):
+            self.players_removed += 1
+        elif isinstance(event, GameEnd) and event.ranking:
+            self.winning_scores[event.ranking[0][1]] += 1
+
+    def add_all(self, events):
+        """ Adds all given events to the statistics
+        :return: self
+        """
+        for event in events:
+            self.add(event)
+        return self
+
+    def summary(self):
+        """ Returns a JSON-compatible summary of the statistics """
+        return {
+            "games": self.games,
+            "turns": self.turns,
+            "events": dict(self.events),
+            "feedings": dict(self.feedings),
+            "attacks": self.attacks,
+            "horns-deaths": self.horns_deaths,
+            "extinctions": self.extinctions,
+            "scavenged-food": self.scavenged_food,
+            "players-removed": self.players_removed,
+            "winning-scores": {str(score): count for score, count in sorted(self.winning_scores.items())},
+        }
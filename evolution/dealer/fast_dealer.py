@@ -0,0 +1,721 @@
+"""
+    Implements a Dealer for headless simulations that keeps the whole game state in packed integer arrays.
+
+    The FastDealer plays by exactly the same rules as the Dealer and offers the same steps (step1, step2_3, step4,
+    feed1, end_turn, run_game) and the same Configuration format, but never creates Species, Player or TraitCard
+    objects while a game runs:
+
+    * every species is a position in the species columns food, body, population, fat_food, traits (the trait codes
+      of the species in order, packed into one integer), trait_mask and owner; the species of a player are
+      contiguous and in order, so the neighbors of a species are the adjacent positions of the same block
+    * every player is a seat, with its id, bag, hand of card codes and the start and count of its species block
+    * a card is its code, the index of the card in the sorted list of all cards, so comparing codes compares cards
+
+    The players are FastPlayers, which make their choices by reading these arrays instead of JSON messages, see
+    FastDummyPlayer. Actions are applied as Action4 JSON and feedings are Feeding JSON, where None represents a
+    player that cannot feed.
+
+"""
+
+from array import array
+
+from .deck import Deck
+
+from ..data_definitions import DataDefinitions
+
+from ..player.fast_dummy_player import FastDummyPlayer
+
+from ..common.species import Species
+from ..common.trait import Trait, HARD_SHELL_THRESHOLD, HORNS_DAMAGE, traits as TRAIT_NAMES
+
+
+# trait name -> trait code, the bit of a trait in a trait mask is 1 << code
+TRAIT_CODES = {name: code for code, name in enumerate(TRAIT_NAMES)}
+
+AMBUSH = Trait.AMBUSH.bit
+BURROWING = Trait.BURROWING.bit
+CARNIVORE = Trait.CARNIVORE.bit
+CLIMBING = Trait.CLIMBING.bit
+COOPERATION = Trait.COOPERATION.bit
+FAT_TISSUE = Trait.FAT_TISSUE.bit
+FERTILE = Trait.FERTILE.bit
+FORAGING = Trait.FORAGING.bit
+HARD_SHELL = Trait.HARD_SHELL.bit
+HERDING = Trait.HERDING.bit
+HORNS = Trait.HORNS.bit
+LONG_NECK = Trait.LONG_NECK.bit
+PACK_HUNTING = Trait.PACK_HUNTING.bit
+SCAVENGER = Trait.SCAVENGER.bit
+SYMBIOSIS = Trait.SYMBIOSIS.bit
+WARNING_CALL = Trait.WARNING_CALL.bit
+
+FAT_TISSUE_CODE = TRAIT_CODES[Trait.FAT_TISSUE.value]
+
+# card code -> card, the codes follow the order of TraitCards
+CARDS = sorted(DataDefinitions.deck())
+CARD_VALUES = [card.value for card in CARDS]
+CARD_TRAITS = [TRAIT_CODES[card.trait.value] for card in CARDS]
+CARD_CODES = {(card.value, card.trait.value): code for code, card in enumerate(CARDS)}
+
+# number of bits used by each trait code in packed traits
+TRAIT_CODE_BITS = 5
+TRAIT_CODE_MASK = (1 << TRAIT_CODE_BITS) - 1
+
+
+def pack_traits(codes):
+    """ Packs the given trait codes into one integer
+    :param codes: list of trait codes, in order
+    :return: packed traits
+    """
+    packed = 0
+    for slot, code in enumerate(codes):
+        packed |= (code + 1) << (slot * TRAIT_CODE_BITS)
+    return packed
+
+
+def unpack_traits(packed):
+    """ Unpacks the trait codes packed by pack_traits
+    :param packed: packed traits
+    :return: list of trait codes, in order
+    """
+    codes = []
+    while packed:
+        codes.append((packed & TRAIT_CODE_MASK) - 1)
+        packed >>= TRAIT_CODE_BITS
+    return codes
+
+
+def traits_mask(codes):
+    """ Returns the trait mask of the given trait codes """
+    mask = 0
+    for code in codes:
+        mask |= 1 << code
+    return mask
+
+
+class FastDealer:
+    """ Contains the state of a game in packed integer arrays and runs it with the same rules as the Dealer. """
+
+    WATERING_HOLE_MINIMUM = 0
+    CARNIVORE_ATTACK_POPULATION_DECREASE = 1
+    EXTINCT_SPECIES_PAYOUT = 2
+    CARDS_PER_TURN = 3
+    CARDS_PER_SPECIES = 1
+
+    def __init__(self):
+        """ Creates a FastDealer without players and cards """
+        # species columns, the species of a seat are contiguous and in order
+        self.food = array("i")
+        self.body = array("i")
+        self.population = array("i")
+        self.fat_food = array("i")
+        self.traits = array("q")
+        self.trait_mask = array("i")
+        self.owner = array("i")
+
+        # seat columns
+        self.ids = []
+        self.bags = []
+        self.hands = []
+        self.start = []
+        self.count = []
+        self.externals = []
+
+        # seats in turn order and seats that can still feed
+        self.players = []
+        self.active_players = []
+
+        self.watering_hole = self.WATERING_HOLE_MINIMUM
+        self.deck = Deck([])
+
+    def add_seat(self, idx, bag=0, hand=None, external=None):
+        """ Adds a player without species at the end of the turn order
+        :param idx: id of the player
+        :param bag: number of food tokens in the player's bag
+        :param hand: list of card codes
+        :param external: FastPlayer making the player's choices, a FastDummyPlayer by default
+        :return: the seat of the player
+        """
+        seat = len(self.ids)
+        self.ids.append(idx)
+        self.bags.append(bag)
+        self.hands.append(hand if hand is not None else [])
+        self.start.append(len(self.food))
+        self.count.append(0)
+        self.externals.append(external if external is not None else FastDummyPlayer())
+        self.players.append(seat)
+        self.active_players.append(seat)
+        return seat
+
+    def add_external_players(self, players):
+        """ Adds the given players to the game, with ids starting from 1
+        :param players: list of FastPlayers
+        :return: list of ids assigned to each player
+        """
+        return [self.ids[self.add_seat(idx + 1, external=player)] for idx, player in enumerate(players)]
+
+    def add_species(self, seat, food=0, body=0, population=1, trait_codes=(), fat_food=0):
+        """ Adds a species to the right of the species of the given seat
+        :return: position of the new species
+        """
+        position = self.start[seat] + self.count[seat]
+        self.food.insert(position, food)
+        self.body.insert(position, body)
+        self.population.insert(position, population)
+        self.fat_food.insert(position, fat_food)
+        self.traits.insert(position, pack_traits(trait_codes))
+        self.trait_mask.insert(position, traits_mask(trait_codes))
+        self.owner.insert(position, seat)
+
+        self.count[seat] += 1
+        for other in range(seat + 1, len(self.start)):
+            self.start[other] += 1
+        return position
+
+    def remove_species(self, seat, index):
+        """ Removes the species at the given index of the given seat """
+        position = self.position(seat, index)
+        for column in (self.food, self.body, self.population, self.fat_food, self.traits, self.trait_mask,
+                       self.owner):
+            column.pop(position)
+
+        self.count[seat] -= 1
+        for other in range(seat + 1, len(self.start)):
+            self.start[other] -= 1
+
+    def position(self, seat, index):
+        """ Returns the position of the species at the given index of the given seat
+        :raise: IndexError if the seat has no species at the index
+        """
+        if not 0 <= index < self.count[seat]:
+            raise IndexError("species index out of range")
+        return self.start[seat] + index
+
+    def species_positions(self, seat):
+        """ Returns the positions of the species of the given seat, in order """
+        start = self.start[seat]
+        return range(start, start + self.count[seat])
+
+    def neighbors(self, position):
+        """ Returns the positions of the left and right neighbor of the species at the given position, -1 for none """
+        seat = self.owner[position]
+        start = self.start[seat]
+        left = position - 1 if position > start else -1
+        right = position + 1 if position < start + self.count[seat] - 1 else -1
+        return left, right
+
+    def is_hungry(self, position):
+        return self.population[position] > self.food[position]
+
+    def is_carnivore(self, position):
+        return self.trait_mask[position] & CARNIVORE != 0
+
+    def can_store_fat_food(self, position):
+        return self.trait_mask[position] & FAT_TISSUE != 0 and self.fat_food[position] < self.body[position]
+
+    def species_key(self, position):
+        """ Returns the key ordering species by population, food and body, as used by the DummyPlayer """
+        return self.population[position], self.food[position], self.body[position]
+
+    def serialized_fat_food(self, position):
+        """ Returns the fat food of the species as it appears in its JSONSpecies """
+        return self.fat_food[position] if self.trait_mask[position] & FAT_TISSUE else 0
+
+    def species_equal(self, position, other):
+        """ Returns True if the species at the given positions are equal as their JSONSpecies """
+        return (self.food[position] == self.food[other] and
+                self.body[position] == self.body[other] and
+                self.population[position] == self.population[other] and
+                self.traits[position] == self.traits[other] and
+                self.serialized_fat_food(position) == self.serialized_fat_food(other))
+
+    def leftmost_equal_index(self, seat, position):
+        """ Returns the index of the leftmost species of the seat equal to the species at the given position """
+        for index, other in enumerate(self.species_positions(seat)):
+            if self.species_equal(position, other):
+                return index
+
+    def is_attackable(self, position, attacker):
+        """ Determines whether the species at the given position can be attacked by the attacker, same as
+          Species.is_attackable with the neighbors of the species
+        :param position: position of the defending species
+        :param attacker: position of the attacking species
+        :return: true if the species is attackable
+        """
+        trait_mask = self.trait_mask
+        attacker_mask = trait_mask[attacker]
+        left, right = self.neighbors(position)
+
+        if (((left >= 0 and trait_mask[left] & WARNING_CALL) or (right >= 0 and trait_mask[right] & WARNING_CALL))
+                and not attacker_mask & AMBUSH):
+            return False
+
+        mask = trait_mask[position]
+        if mask & BURROWING and self.food[position] == self.population[position]:
+            return False
+        if mask & CLIMBING and not attacker_mask & CLIMBING:
+            return False
+        if mask & HARD_SHELL:
+            attacking_body = self.body[attacker]
+            if attacker_mask & PACK_HUNTING:
+                attacking_body += self.population[attacker]
+            if attacking_body - self.body[position] < HARD_SHELL_THRESHOLD:
+                return False
+        if mask & HERDING and self.population[attacker] <= self.population[position]:
+            return False
+        if mask & SYMBIOSIS and right >= 0 and self.body[right] > self.body[position]:
+            return False
+
+        return True
+
+    def attackable_indices(self, attacker, seat):
+        """ Returns the indices of the species of the seat that the attacker can attack, excluding the attacker """
+        return [index for index, position in enumerate(self.species_positions(seat))
+                if position != attacker and self.is_attackable(position, attacker)]
+
+    def score(self, seat):
+        """ Returns the score of the player at the given seat, same as Player.score """
+        positions = self.species_positions(seat)
+        return (self.bags[seat] + sum(self.population[p] for p in positions) +
+                sum(len(unpack_traits(self.traits[p])) for p in positions))
+
+    def run_game(self, deck=None):
+        """ Simulates an entire game, same as Dealer.run_game
+        :param deck: list of card codes in the order they are dealt, all cards in order by default
+        """
+        self.deck = Deck(list(deck) if deck is not None else list(range(len(CARDS))))
+
+        def num_cards_to_deal():
+            return sum(self.num_cards_to_deal(seat) for seat in self.players)
+
+        while num_cards_to_deal() <= len(self.deck):
+            self.take_turn()
+            if not self.players:
+                break
+            self.players = self.players[1:] + self.players[:1]
+
+    def num_cards_to_deal(self, seat):
+        return self.CARDS_PER_TURN + self.CARDS_PER_SPECIES * max(1, self.count[seat])
+
+    def take_turn(self):
+        self.step1()
+        action_list = self.step2_3()
+        self.step4(action_list)
+        self.end_turn()
+
+    def call_external(self, seat, method, *args):
+        """ Calls the given method of the player at the given seat
+        :return: (valid, result) tuple, valid is false if the player raised an exception
+        """
+        try:
+            return True, getattr(self.externals[seat], method)(self, seat, *args)
+        except Exception:
+            return False, None
+
+    def remove_players(self, seats):
+        """ Removes the given seats from the game """
+        self.players = [seat for seat in self.players if seat not in seats]
+
+    def step1(self):
+        """ Gives a species to every player without species and deals cards, same as Dealer.step1 """
+        bad_players = []
+        for seat in self.players:
+            cards = self.deck.draw(self.num_cards_to_deal(seat))
+            if not self.count[seat]:
+                self.add_species(seat)
+            self.hands[seat].extend(cards)
+
+            valid, _ = self.call_external(seat, "start")
+            if not valid:
+                bad_players.append(seat)
+
+        self.remove_players(bad_players)
+
+    def step2_3(self):
+        """ Asks every player for its actions, same as Dealer.step2_3
+          Effect: the players whose actions are not a legal Action4 are removed from the game
+        :return: list of Action4, one for each remaining player
+        """
+        action_list = []
+        bad_players = []
+        for seat in self.players:
+            valid, action4 = self.call_external(seat, "choose")
+            if valid and self.legal_actions(seat, action4):
+                action_list.append(action4)
+            else:
+                bad_players.append(seat)
+
+        self.remove_players(bad_players)
+        return action_list
+
+    def legal_actions(self, seat, action4):
+        """ Determines whether the given Action4 is well-formed and legal for the player at the given seat, with the
+          same checks as Actions.parse: card indices in the hand and used once, distinct traits on a new board,
+          species indices in range, growth within the maximums and trait slots that exist
+        :param seat: seat of the player
+        :param action4: Action4 JSON returned by the player
+        :return: true if the actions can be applied
+        """
+        if not DataDefinitions.action4(action4):
+            return False
+        discard, grow_population, grow_body, board_transfer, replace_trait = action4
+
+        hand = self.hands[seat]
+        used = bytearray(len(hand))
+
+        def use(card_index):
+            if card_index >= len(used) or used[card_index]:
+                return False
+            used[card_index] = 1
+            return True
+
+        if not use(discard):
+            return False
+
+        # trait codes of every species after the actions so far, the new species at the end
+        species_traits = [unpack_traits(self.traits[position]) for position in self.species_positions(seat)]
+        # populations and bodies of every species after the growth so far, the new species at the end
+        populations = [self.population[position] for position in self.species_positions(seat)]
+        bodies = [self.body[position] for position in self.species_positions(seat)]
+
+        for board in board_transfer:
+            if not board or not all(map(use, board)):
+                return False
+            codes = [CARD_TRAITS[hand[card_index]] for card_index in board[1:]]
+            if len(set(codes)) != len(codes):
+                return False
+            species_traits.append(codes)
+            populations.append(Species.DEFAULT_POPULATION)
+            bodies.append(Species.DEFAULT_BODY)
+
+        for grow, sizes, growth, maximum in [(grow_population, populations, Species.POPULATION_GROWTH,
+                                              Species.MAXIMUM_POPULATION),
+                                             (grow_body, bodies, Species.BODY_GROWTH, Species.MAXIMUM_BODY)]:
+            for _, species_index, card_index in grow:
+                if species_index >= len(sizes) or not use(card_index):
+                    return False
+                sizes[species_index] += growth
+                if sizes[species_index] > maximum:
+                    return False
+
+        replaced = set()
+        for species_index, trait_slot, card_index in replace_trait:
+            if (species_index >= len(species_traits) or trait_slot >= len(species_traits[species_index]) or
+                    not use(card_index)):
+                return False
+            species_traits[species_index][trait_slot] = CARD_TRAITS[hand[card_index]]
+            replaced.add(species_index)
+
+        return all(len(set(species_traits[index])) == len(species_traits[index]) for index in replaced)
+
+    def step4(self, action_list):
+        """ Applies the actions, the auto traits and runs the feeding step, same as Dealer.step4
+        :param action_list: list of Action4, one for each player in turn order
+        """
+        for player_index, action4 in enumerate(action_list):
+            self.apply_actions(player_index, action4)
+
+        self.auto_traits()
+        self.feeding_step()
+
+    def apply_actions(self, player_index, action4):
+        """ Applies the given Action4 for the player at the given index, same as Actions.apply """
+        seat = self.players[player_index]
+        hand = self.hands[seat]
+        discard, grow_population, grow_body, board_transfer, replace_trait = action4
+
+        for card_index, *trait_card_indices in board_transfer:
+            self.add_species(seat, trait_codes=[CARD_TRAITS[hand[index]] for index in trait_card_indices])
+        for _, species_index, _ in grow_population:
+            self.population[self.position(seat, species_index)] += Species.POPULATION_GROWTH
+        for _, species_index, _ in grow_body:
+            self.body[self.position(seat, species_index)] += Species.BODY_GROWTH
+        for species_index, trait_slot, card_index in replace_trait:
+            position = self.position(seat, species_index)
+            codes = unpack_traits(self.traits[position])
+            if codes[trait_slot] == FAT_TISSUE_CODE:
+                self.fat_food[position] = Species.MINIMUM_FAT_FOOD
+            codes[trait_slot] = CARD_TRAITS[hand[card_index]]
+            self.traits[position] = pack_traits(codes)
+            self.trait_mask[position] = traits_mask(codes)
+
+        discard_value = CARD_VALUES[hand[discard]]
+
+        used_cards = [discard]
+        used_cards.extend(card_index for _, _, card_index in grow_population)
+        used_cards.extend(card_index for _, _, card_index in grow_body)
+        for board in board_transfer:
+            used_cards.extend(board)
+        used_cards.extend(card_index for _, _, card_index in replace_trait)
+        for card_index in sorted(used_cards, reverse=True):
+            hand.pop(card_index)
+
+        self.watering_hole = max(self.watering_hole + discard_value, self.WATERING_HOLE_MINIMUM)
+
+    def auto_traits(self):
+        """ Activates fertile, long neck and fat tissue of all species, same as Dealer.auto_traits """
+        for seat in self.players:
+            food_taken = 0
+            for index in range(self.count[seat]):
+                position = self.start[seat] + index
+                mask = self.trait_mask[position]
+                if mask & FERTILE and self.population[position] + 1 <= Species.MAXIMUM_POPULATION:
+                    self.population[position] += Species.POPULATION_GROWTH
+                if mask & LONG_NECK:
+                    food_taken += self.feed_species(seat, index, self.watering_hole - food_taken)
+
+                tokens = min(self.fat_food[position], self.population[position] - self.food[position])
+                self.food[position] += tokens
+                self.fat_food[position] -= tokens
+            self.watering_hole -= food_taken
+
+    def feed_species(self, seat, index, watering_hole):
+        """ Feeds the species at the given index of the seat, with foraging and cooperation, same as
+          Player.feed_species
+        :return: number of food tokens consumed
+        """
+        position = self.start[seat] + index
+        food, population = self.food, self.population
+        mask = self.trait_mask[position]
+
+        tokens_used = 0
+        if population[position] > food[position] and watering_hole >= 1:
+            food[position] += 1
+            tokens_used = 1
+        if mask & FORAGING and population[position] > food[position] and watering_hole - tokens_used >= 1:
+            food[position] += 1
+            tokens_used += 1
+
+        if mask & COOPERATION and index + 1 < self.count[seat]:
+            for _ in range(tokens_used):
+                tokens_used += self.feed_species(seat, index + 1, watering_hole - tokens_used)
+
+        return tokens_used
+
+    def hurt_species(self, seat, index, damage):
+        """ Hurts the species at the given index of the seat, removing it and paying the owner if it goes extinct
+        :return: (extinct, has horns) tuple
+        """
+        position = self.position(seat, index)
+        self.population[position] -= damage
+        if self.food[position] > self.population[position]:
+            self.food[position] = self.population[position]
+
+        extinct = self.population[position] <= Species.MINIMUM_POPULATION
+        horns = self.trait_mask[position] & HORNS != 0
+        if extinct:
+            self.remove_species(seat, index)
+            self.hands[seat].extend(self.deck.draw(self.EXTINCT_SPECIES_PAYOUT))
+        return extinct, horns
+
+    def feeding_step(self):
+        """ Feeds until the watering hole is empty or no player can feed, same as Dealer.feeding_step """
+        self.active_players = self.players.copy()
+        while self.watering_hole > self.WATERING_HOLE_MINIMUM and self.active_players:
+            self.feed1()
+
+    def feed1(self):
+        """ Performs one step of the feeding, same as Dealer.feed1 """
+        seat = self.active_players[0]
+        player_index = self.players.index(seat)
+        queue = self.players[player_index:] + self.players[:player_index]
+        others = queue[1:]
+
+        valid, feeding = self.feeding_choice(seat, others)
+        if not valid or not self.validate_feeding(seat, others, feeding):
+            self.players.pop(player_index)
+            remove_player_from_active = True
+        else:
+            remove_player_from_active = self.apply_feeding(seat, others, feeding)
+
+        if remove_player_from_active:
+            self.active_players.pop(0)
+        else:
+            self.active_players = self.active_players[1:] + self.active_players[:1]
+
+    def feeding_choice(self, seat, others):
+        """ Determines the next feeding automatically if possible, otherwise asks the player, same as
+          Player.feeding_choice
+        :return: (valid, Feeding JSON) tuple, where None represents CannotFeed
+        """
+        watering_hole = self.watering_hole
+        hungry = False
+        vegetarian = []
+        fat_tissue = []
+        carnivores = []
+        for index, position in enumerate(self.species_positions(seat)):
+            if self.is_hungry(position):
+                hungry = True
+                if self.is_carnivore(position):
+                    carnivores.append((index, position))
+                else:
+                    vegetarian.append(index)
+            if self.can_store_fat_food(position):
+                fat_tissue.append([index, min(watering_hole, self.body[position] - self.fat_food[position])])
+
+        # only the first two carnivore feedings are needed to find out whether there is exactly one
+        targets = others + [seat]
+        carnivore_feedings = []
+        for index, position in carnivores:
+            for player_index, target in enumerate(targets):
+                for target_index in self.attackable_indices(position, target):
+                    carnivore_feedings.append([index, player_index, target_index])
+                    if len(carnivore_feedings) == 2:
+                        break
+                if len(carnivore_feedings) == 2:
+                    break
+            if len(carnivore_feedings) == 2:
+                break
+
+        if ((not hungry) or (not vegetarian and not carnivore_feedings)) and not fat_tissue:
+            return True, None
+        if len(fat_tissue) == 1 and not vegetarian and not carnivore_feedings:
+            return True, fat_tissue[0]
+        if len(vegetarian) == 1 and not fat_tissue and not carnivore_feedings:
+            return True, vegetarian[0]
+        if (len(carnivore_feedings) == 1 and carnivore_feedings[0][1] < len(others) and
+                not fat_tissue and not vegetarian):
+            return True, carnivore_feedings[0]
+
+        valid, feeding = self.call_external(seat, "feed_next", others, watering_hole)
+        return valid and DataDefinitions.feeding_outcome(feeding), feeding
+
+    def validate_feeding(self, seat, others, feeding):
+        """ Validates the given feeding, same as FeedingOutcome.validate """
+        if feeding is None or feeding is False:
+            return True
+        if isinstance(feeding, int):
+            return 0 <= feeding < self.count[seat] and self.is_hungry(self.start[seat] + feeding) and \
+                not self.is_carnivore(self.start[seat] + feeding)
+        if len(feeding) == 2:
+            index, tokens = feeding
+            if not 0 <= index < self.count[seat]:
+                return False
+            position = self.start[seat] + index
+            return (self.can_store_fat_food(position) and
+                    1 <= tokens <= min(self.watering_hole, self.body[position] - self.fat_food[position]))
+        if len(feeding) == 3:
+            index, player_index, target_index = feeding
+            targets = others + [seat]
+            if not (0 <= index < self.count[seat] and 0 <= player_index < len(targets)):
+                return False
+            position = self.start[seat] + index
+            return (self.is_hungry(position) and self.is_carnivore(position) and
+                    target_index in self.attackable_indices(position, targets[player_index]))
+        return False
+
+    def apply_feeding(self, seat, others, feeding):
+        """ Applies the given valid feeding, same as FeedingOutcome.apply
+        :return: true if the player cannot feed anymore
+        """
+        if feeding is None or feeding is False:
+            return True
+        if isinstance(feeding, int):
+            self.watering_hole -= self.feed_species(seat, feeding, self.watering_hole)
+        elif len(feeding) == 2:
+            index, tokens = feeding
+            self.fat_food[self.start[seat] + index] += tokens
+            self.watering_hole -= tokens
+        else:
+            self.carnivore_feeding(seat, others, *feeding)
+        return False
+
+    def carnivore_feeding(self, seat, others, index, player_index, target_index):
+        """ Performs a carnivore attack, same as Dealer.carnivore_feeding """
+        defender = (others + [seat])[player_index]
+        _, defender_horns = self.hurt_species(defender, target_index, self.CARNIVORE_ATTACK_POPULATION_DECREASE)
+
+        attacker_died = False
+        if defender_horns:
+            attacker_died, _ = self.hurt_species(seat, index, HORNS_DAMAGE)
+
+        if not attacker_died:
+            self.watering_hole -= self.feed_species(seat, index, self.watering_hole)
+            for scavenger_seat in [seat] + others:
+                food_taken = 0
+                for scavenger in range(self.count[scavenger_seat]):
+                    if self.trait_mask[self.start[scavenger_seat] + scavenger] & SCAVENGER:
+                        food_taken += self.feed_species(scavenger_seat, scavenger, self.watering_hole - food_taken)
+                self.watering_hole -= food_taken
+
+    def end_turn(self):
+        """ Reduces populations to their food, moves food to the bags and pays for extinct species, same as
+          Dealer.end_turn
+        """
+        for seat in self.players:
+            extinct = []
+            for index, position in enumerate(self.species_positions(seat)):
+                self.population[position] = min(self.food[position], self.population[position])
+                if self.population[position] <= Species.MINIMUM_POPULATION:
+                    extinct.append(index)
+                else:
+                    self.bags[seat] += self.food[position]
+                    self.food[position] = Species.MINIMUM_FOOD
+
+            for index in reversed(extinct):
+                self.remove_species(seat, index)
+            for _ in extinct:
+                self.hands[seat].extend(self.deck.draw(self.EXTINCT_SPECIES_PAYOUT))
+
+    def ranking(self):
+        """ Computes the player ranking, same as Dealer.ranking
+        :return: generator yielding (idx, bag tokens) for each player in order of the ranking
+        """
+        for seat in sorted(self.players, key=self.score, reverse=True):
+            yield self.ids[seat], self.score(seat)
+
+    def serialize_species(self, position):
+        """ Returns the JSONSpecies of the species at the given position """
+        data = [
+            [DataDefinitions.SPECIES_JSON_KEY_FOOD, self.food[position]],
+            [DataDefinitions.SPECIES_JSON_KEY_BODY, self.body[position]],
+            [DataDefinitions.SPECIES_JSON_KEY_POPULATION, self.population[position]],
+            [DataDefinitions.SPECIES_JSON_KEY_TRAITS, [TRAIT_NAMES[c] for c in unpack_traits(self.traits[position])]],
+        ]
+        if self.serialized_fat_food(position) > Species.DEFAULT_FAT_FOOD:
+            data.append([DataDefinitions.SPECIES_JSON_KEY_FAT_FOOD, self.fat_food[position]])
+        return data
+
+    def serialize_player(self, seat):
+        """ Returns the JSON representation of the player at the given seat, same as Player.serialize """
+        data = [
+            [DataDefinitions.PLAYER_JSON_KEY_IDX, self.ids[seat]],
+            [DataDefinitions.PLAYER_JSON_KEY_SPECIES,
+             [self.serialize_species(p) for p in self.species_positions(seat)]],
+            [DataDefinitions.PLAYER_JSON_KEY_BAG, self.bags[seat]],
+        ]
+        if self.hands[seat]:
+            data.append([DataDefinitions.PLAYER_JSON_KEY_CARDS, [self.serialize_card(c) for c in self.hands[seat]]])
+        return data
+
+    @staticmethod
+    def serialize_card(code):
+        return [CARD_VALUES[code], TRAIT_NAMES[CARD_TRAITS[code]]]
+
+    def serialize(self):
+        """ Returns the dealer's Configuration """
+        players = [self.serialize_player(seat) for seat in self.players]
+        return [players, self.watering_hole, [self.serialize_card(code) for code in self.deck]]
+
+    @classmethod
+    def deserialize(cls, data):
+        """ Creates a FastDealer from the given Configuration, all players are FastDummyPlayers
+        :param data: Configuration
+        :return: FastDealer
+        """
+        lop, watering_hole, loc = data
+
+        dealer = cls()
+        for player in lop:
+            [_, idx], [_, species_list], [_, bag], *maybe_cards = player
+            hand = [CARD_CODES[tuple(card)] for card in maybe_cards[0][1]] if maybe_cards else []
+            seat = dealer.add_seat(idx, bag, hand)
+
+            for species in species_list:
+                [_, food], [_, body], [_, population], [_, traits], *maybe_fat_food = species
+                fat_food = maybe_fat_food[0][1] if maybe_fat_food else Species.DEFAULT_FAT_FOOD
+                dealer.add_species(seat, food, body, population, [TRAIT_CODES[t] for t in traits], fat_food)
+
+        dealer.watering_hole = watering_hole
+        dealer.deck = Deck([CARD_CODES[tuple(card)] for card in loc])
+        return dealer
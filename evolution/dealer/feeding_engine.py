@@ -0,0 +1,171 @@
+"""
+    Implements an incremental computation of the feeding choices during a feeding step.
+
+    Player.feeding_choice recomputes every possible feeding of the current player on every call, enumerating the
+    carnivore feedings twice and computing the board signature of every player each time, although a single
+    feeding changes the species of one or two players. The FeedingEngine keeps these values for every player and
+    only recomputes the values of players whose species changed since they were computed:
+
+    * per player: whether it has hungry species, its vegetarian feedings, its fat tissue capacities, its hungry
+      carnivores and the signature of its board
+    * per pair of attacking and defending player: the targets of each hungry carnivore of the attacker
+
+    A player's values are recomputed when the versions of its species differ from the versions they were
+    computed from, see Species.version; a species that goes extinct is removed, so the number of versions
+    changes. Checking the versions of all players costs one attribute lookup per species and call, while the
+    Dealer does not need to tell the engine about its changes. A change of the watering hole does not invalidate
+    anything, the fat tissue feedings are limited to the watering hole when they are looked up.
+
+"""
+
+from ..common.attackability import AttackabilityIndex
+from ..common.feeding_outcome import VegetarianFeeding, FatTissueFeeding, CarnivoreFeeding
+from ..common.player_helpers import external_player_call
+from ..player.player import FeedingCandidates
+
+
+class PlayerFeedingState:
+    """ The values of a single player needed to compute feeding choices, computed from its current species """
+
+    def __init__(self, player, versions):
+        """ Computes the feeding state of the given player
+        :param player: Player
+        :param versions: versions of the species of the player, in order
+        """
+        self.player = player
+        self.versions = versions
+
+        species_list = player.species
+        self.hungry = False
+        self.vegetarian = []
+        # (species index, number of tokens that can be stored) for species that can store fat food
+        self.fat_tissue = []
+        # (species index, species) for hungry carnivores
+        self.carnivores = []
+
+        for index, species in enumerate(species_list):
+            hungry = species.is_hungry()
+            self.hungry = self.hungry or hungry
+            if hungry and species.is_carnivore():
+                self.carnivores.append((index, species))
+            elif hungry:
+                self.vegetarian.append(VegetarianFeeding(index))
+            if species.can_store_fat_food():
+                self.fat_tissue.append((index, species.body - species.fat_food))
+
+        self.board = AttackabilityIndex.board_signature(species_list)
+
+    def fat_tissue_feedings(self, watering_hole):
+        """ Returns the optimal fat tissue feedings of the player
+        :param watering_hole: number of food tokens left in the watering hole
+        :return: list of FatTissueFeedings
+        """
+        return [FatTissueFeeding(index, min(watering_hole, capacity)) for index, capacity in self.fat_tissue]
+
+
+class FeedingEngine:
+    """ Computes the feeding choices of the players during one feeding step, recomputing only the values of
+      players that changed.
+    """
+
+    def __init__(self, attackability=None):
+        """ Creates a new engine without any computed values
+        :param attackability: AttackabilityIndex used to find the targets of carnivores
+        """
+        self.attackability = attackability if attackability is not None else AttackabilityIndex()
+        # id(player) -> PlayerFeedingState
+        self.states = {}
+        # id(attacker) -> id(defender) -> list with a tuple of target indices for each hungry carnivore of the
+        # attacker, in the order of PlayerFeedingState.carnivores
+        self.targets = {}
+
+    def state(self, player):
+        """ Returns the feeding state of the given player, computing it if its species changed since it was computed
+          Effect: forgets the carnivore targets involving the player if its species changed
+        :param player: Player
+        :return: PlayerFeedingState
+        """
+        key = id(player)
+        versions = tuple([species.version for species in player.species])
+        state = self.states.get(key)
+        if state is None or state.versions != versions:
+            if state is not None:
+                self.targets.pop(key, None)
+                for defenders in self.targets.values():
+                    defenders.pop(key, None)
+            state = self.states[key] = PlayerFeedingState(player, versions)
+        return state
+
+    def carnivore_targets(self, attacker, defender):
+        """ Returns the targets of the hungry carnivores of the attacker among the defender's species. A carnivore
+          never targets itself.
+        :param attacker: PlayerFeedingState of the attacking player
+        :param defender: PlayerFeedingState of the defending player
+        :return: list with a tuple of target indices for each hungry carnivore of the attacker
+        """
+        defenders = self.targets.setdefault(id(attacker.player), {})
+        targets = defenders.get(id(defender.player))
+        if targets is None:
+            defending_species = defender.player.species
+            targets = []
+            for index, carnivore in attacker.carnivores:
+                indices = self.attackability.attackable_indices(carnivore, defending_species, defender.board)
+                if attacker is defender:
+                    indices = tuple(target for target in indices if target != index)
+                targets.append(indices)
+            defenders[id(defender.player)] = targets
+        return targets
+
+    def carnivore_feedings(self, player, players):
+        """ Returns all possible feeding outcomes from the player's species attacking any of the given players'
+          species, in the same order as BasePlayer.get_possible_carnivore_feedings.
+        :param player: attacking Player
+        :param players: list of players that can be attacked
+        :return: list of CarnivoreFeedings
+        """
+        attacker = self.state(player)
+        if not attacker.carnivores:
+            return []
+
+        targets = [self.carnivore_targets(attacker, self.state(defender)) for defender in players]
+
+        feedings = []
+        for carnivore, (carnivore_index, _) in enumerate(attacker.carnivores):
+            for player_index, player_targets in enumerate(targets):
+                for target_index in player_targets[carnivore]:
+                    feedings.append(CarnivoreFeeding(carnivore_index, player_index, target_index))
+        return feedings
+
+    def candidates(self, player, players, watering_hole):
+        """ Returns the feeding candidates of the given player
+        :param player: Player whose turn it is to feed
+        :param players: other players in the game, in order starting after the player
+        :param watering_hole: number of food tokens left in the watering hole
+        :return: FeedingCandidates
+        """
+        state = self.state(player)
+        carnivore = self.carnivore_feedings(player, players + [player])
+        others = len(players)
+        return FeedingCandidates(
+            hungry=state.hungry,
+            vegetarian=state.vegetarian.copy(),
+            fat_tissue=state.fat_tissue_feedings(watering_hole),
+            carnivore=carnivore,
+            carnivore_others=[feeding for feeding in carnivore if feeding.player_index < others],
+        )
+
+    @external_player_call()
+    def feeding_choice(self, player, players, watering_hole):
+        """ Determines the next feeding choice for the given player, same as Player.feeding_choice
+        :param player: Player whose turn it is to feed
+        :param players: other players in the game, in order starting after the player
+        :param watering_hole: number of food tokens left in the watering hole
+        :return: the next feeding choice for the player
+        :raise: ExternalPlayerIssue
+        """
+        feeding = self.candidates(player, players, watering_hole).automatic_feeding()
+        if feeding is not None:
+            return feeding
+
+        return player.request_feeding(player.to_player_state(), [[s.serialize() for s in p.species] for p in players],
+                                      watering_hole, players)
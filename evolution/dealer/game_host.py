@@ -0,0 +1,374 @@
+"""
+    Implements a long-running Evolution game host. The host keeps a listening socket open, signs up remote
+    players on an asyncio event loop and groups them into games in a lobby:
+
+    1. accept connections and sign-up messages without blocking other connections
+    2. once at least MIN_PLAYERS are waiting, a game starts when MAX_PLAYERS have joined or when no new player
+       has joined for COUNTDOWN_TIME seconds
+    3. every game runs its own Dealer, many games run at the same time
+    4. after a game, the players still in the game receive a game over message; a player answering with a new
+       game message signs up again over the same connection and waits in the lobby for the next game, the
+       connections of the other players are closed
+
+    The Dealer talks to its players synchronously, so each game runs in a worker thread of the host's executor,
+    while the event loop stays free to sign up players for the next games. The executor has MAX_GAMES threads:
+    the players of a game use blocking sockets in its thread, so at most MAX_GAMES games run at the same time and
+    the games started beyond that wait, without notice, for a thread to be free. A game that fails is reported
+    with on_error and the connections of its players are closed.
+
+    A host with an Instrumentation records every game in an Instrumentation of its own, see instrumentation.py,
+    and adds it to the instrumentation of the host once the game is over. With a stats port, the host answers
+    every connection to that port with its instrumentation in JSON, in an HTTP response, e.g. for a monitoring
+    system to scrape.
+
+"""
+
+import asyncio
+import json
+import socket
+import sys
+
+from concurrent.futures import ThreadPoolExecutor
+
+from .dealer import Dealer
+from .remote_dealer import RemoteDealer
+from ..common.instrumentation import Instrumentation
+from ..common.json_stream import JSONStreamDecoder
+from ..player.remote_player import RemotePlayer
+
+
+class Lobby:
+    """ Groups signed-up players into games. A Lobby has no notion of time, the countdown is kept by the caller. """
+
+    def __init__(self, min_players, max_players):
+        """ Creates a new empty lobby
+        :param min_players: minimum number of players in a game
+        :param max_players: maximum number of players in a game
+        """
+        self.min_players = min_players
+        self.max_players = max_players
+        self.waiting = []
+
+    def add(self, player):
+        """ Adds the given player to the lobby.
+        :param player: signed-up player, in the format used by the caller
+        :return: list of players for a new game if the lobby is full, otherwise None
+        """
+        self.waiting.append(player)
+        if len(self.waiting) >= self.max_players:
+            return self.take()
+        return None
+
+    def ready(self):
+        """ Returns True if enough players are waiting to start a game
+        :return: true if a game can start
+        """
+        return len(self.waiting) >= self.min_players
+
+    def take(self):
+        """ Removes up to max_players players from the lobby, in the order they joined.
+        :return: list of players for a new game
+        """
+        players, self.waiting = self.waiting[:self.max_players], self.waiting[self.max_players:]
+        return players
+
+
+class GameHost:
+    """ Accepts remote players and runs games for them until it is stopped. """
+
+    MIN_PLAYERS = 3
+    MAX_PLAYERS = 8
+
+    OKAY_MESSAGE = "ok"
+    GAME_OVER_MESSAGE = RemoteDealer.GAME_OVER_MESSAGE
+    NEW_GAME_MESSAGE = RemoteDealer.NEW_GAME_MESSAGE
+
+    # seconds a player has to sign up and seconds a connected player has to respond
+    TIMEOUT = 5
+    # seconds without new sign-ups after which a game starts with the players that are waiting
+    COUNTDOWN_TIME = 5
+    # number of games that can run at the same time
+    MAX_GAMES = 32
+    # whether the Dealers call start and choose of all their players at the same time
+    CONCURRENT_PLAYER_CALLS = True
+
+    def __init__(self, host, port, countdown_time=None, max_games=None, on_result=None, instrumentation=None,
+                 stats_port=None, on_error=None):
+        """ Creates a new game host
+        :param host: host to bind to
+        :param port: port to bind to, 0 picks a free port
+        :param countdown_time: overrides COUNTDOWN_TIME
+        :param max_games: overrides MAX_GAMES
+        :param on_result: function called with (game id, results) after every game, where results is a list of
+                          (info message, player id, score) in order of the ranking; prints the results by default
+        :param instrumentation: Instrumentation aggregating the instrumentations of all games, or None
+        :param stats_port: port on which the instrumentation is served, 0 picks a free port, None does not serve it
+        :param on_error: function called with (game id, exception) after every game that fails; prints the error by
+                         default
+        """
+        self.host = host
+        self.port = port
+        self.countdown_time = countdown_time if countdown_time is not None else self.COUNTDOWN_TIME
+        self.executor = ThreadPoolExecutor(max_games if max_games is not None else self.MAX_GAMES)
+        self.on_result = on_result if on_result is not None else self.print_results
+        self.on_error = on_error if on_error is not None else self.print_error
+        self.instrumentation = instrumentation
+        self.stats_port = stats_port
+
+        self.lobby = Lobby(self.MIN_PLAYERS, self.MAX_PLAYERS)
+        self.socket = None
+        self.countdown = None
+        self.tasks = set()
+        self.games_started = 0
+
+    def bind(self):
+        """ Creates the listening socket.
+          Effect: sets self.port to the port that was bound
+        """
+        s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        s.bind((self.host, self.port))
+        s.listen(socket.SOMAXCONN)
+        s.setblocking(False)
+        self.socket = s
+        self.port = s.getsockname()[1]
+
+    async def serve(self):
+        """ Accepts connections until cancelled; every connection is signed up concurrently. """
+        if self.socket is None:
+            self.bind()
+
+        stats_server = None
+        if self.instrumentation is not None and self.stats_port is not None:
+            stats_server = await self.start_stats()
+
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                client_socket, _ = await loop.sock_accept(self.socket)
+                self.spawn(self.sign_up(client_socket))
+        finally:
+            self.socket.close()
+            if stats_server is not None:
+                stats_server.close()
+            if self.countdown is not None:
+                self.countdown.cancel()
+            self.executor.shutdown(wait=False)
+
+    async def start_stats(self):
+        """ Starts serving the instrumentation of the host on stats_port
+          Effect: sets self.stats_port to the port that was bound
+        :return: asyncio Server
+        """
+        server = await asyncio.start_server(self.send_stats, self.host, self.stats_port)
+        self.stats_port = server.sockets[0].getsockname()[1]
+        return server
+
+    async def send_stats(self, reader, writer):
+        """ Answers a request on the stats port with the instrumentation of the host in JSON, whatever the request
+        :param reader: StreamReader of the connection
+        :param writer: StreamWriter of the connection
+        """
+        try:
+            await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), self.TIMEOUT)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+
+        body = json.dumps(self.instrumentation.serialize()).encode(RemotePlayer.ENCODING)
+        header = "HTTP/1.0 200 OK\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n".format(len(body))
+        try:
+            writer.write(header.encode(RemotePlayer.ENCODING) + body)
+            await writer.drain()
+        except OSError:
+            pass
+        finally:
+            writer.close()
+
+    def spawn(self, coroutine):
+        """ Schedules the given coroutine, keeping a reference to it until it finishes
+        :param coroutine: coroutine to run on the event loop
+        """
+        task = asyncio.ensure_future(coroutine)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+
+    async def sign_up(self, client_socket):
+        """ Performs the sign-up sequence for the given connection: receives the sign-up message, see
+          RemotePlayer.parse_hello, and responds with OKAY_MESSAGE using the options the player asked for.
+          Connections that do not send a valid sign-up message in time are closed.
+        :param client_socket: non-blocking socket of the new connection
+        """
+        try:
+            hello_message, decoder = await asyncio.wait_for(self.receive_hello(client_socket), self.TIMEOUT)
+        except (asyncio.TimeoutError, ConnectionError, ValueError):
+            client_socket.close()
+            return
+
+        hello = RemotePlayer.parse_hello(hello_message)
+        if hello is None:
+            client_socket.close()
+            return
+
+        info_message, options = hello
+        remote_player = RemotePlayer(client_socket)
+        # the player waits for the response before sending anything else, so only the separator of the sign-up
+        # message may be buffered if the player switches to the binary encoding
+        remote_player.decoder = decoder
+        remote_player.use_options(options)
+        await self.accept(info_message, remote_player)
+
+    async def rejoin(self, info_message, remote_player):
+        """ Sends GAME_OVER_MESSAGE to a player after its game and signs it up again if it answers with
+          NEW_GAME_MESSAGE in time, otherwise closes its connection.
+        :param info_message: message the player signed up with
+        :param remote_player: RemotePlayer of the game that is over
+        """
+        client_socket = remote_player.socket
+        client_socket.setblocking(False)
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.sock_sendall(client_socket, remote_player.encode_message(self.GAME_OVER_MESSAGE))
+            message, _ = await asyncio.wait_for(
+                self.receive_hello(client_socket, remote_player.decoder), self.TIMEOUT)
+        except (asyncio.TimeoutError, OSError, ValueError):
+            client_socket.close()
+            return
+
+        if message != self.NEW_GAME_MESSAGE:
+            client_socket.close()
+            return
+
+        await self.accept(info_message, remote_player)
+
+    async def accept(self, info_message, remote_player):
+        """ Responds to a sign-up with OKAY_MESSAGE and adds the player to the lobby
+        :param info_message: message the player signed up with
+        :param remote_player: RemotePlayer of the connection, its socket is non-blocking
+        """
+        client_socket = remote_player.socket
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.sock_sendall(client_socket, remote_player.encode_message(self.OKAY_MESSAGE))
+        except OSError:
+            client_socket.close()
+            return
+
+        # from now on the connection is used by a Dealer running in a worker thread
+        client_socket.settimeout(self.TIMEOUT)
+        self.join((info_message, remote_player))
+
+    @staticmethod
+    async def receive_hello(client_socket, decoder=None):
+        """ Receives the next JSON value sent over the given connection
+        :param client_socket: non-blocking socket
+        :param decoder: JSONStreamDecoder or BinaryStreamDecoder holding data already received over the
+                        connection, a new JSONStreamDecoder by default
+        :return: (decoded value, decoder holding any data received after the value) tuple
+        :raise: ConnectionError, ValueError if a binary frame is malformed
+        """
+        loop = asyncio.get_running_loop()
+        decoder = decoder if decoder is not None else JSONStreamDecoder(RemotePlayer.ENCODING)
+        while True:
+            complete, value = decoder.decode()
+            if complete:
+                return value, decoder
+            data = await loop.sock_recv(client_socket, RemotePlayer.BUFFER_SIZE)
+            if not data:
+                raise ConnectionError("connection closed during sign-up")
+            decoder.feed(data)
+
+    def join(self, player):
+        """ Adds a signed-up player to the lobby and starts or restarts the countdown for the next game.
+        :param player: (info message, remote player) tuple
+        """
+        if self.countdown is not None:
+            self.countdown.cancel()
+            self.countdown = None
+
+        players = self.lobby.add(player)
+        if players:
+            self.start_game(players)
+        elif self.lobby.ready():
+            loop = asyncio.get_running_loop()
+            self.countdown = loop.call_later(self.countdown_time, self.countdown_expired)
+
+    def countdown_expired(self):
+        """ Starts a game with the waiting players after no player joined for countdown_time seconds """
+        self.countdown = None
+        if self.lobby.ready():
+            self.start_game(self.lobby.take())
+
+    def start_game(self, players):
+        """ Starts a new game with the given players in a worker thread
+        :param players: list of (info message, remote player) tuples
+        """
+        self.games_started += 1
+        self.spawn(self.play(self.games_started, players))
+
+    async def play(self, game_id, players):
+        """ Runs a complete game and reports the results, or the error if the game fails; the connections of the
+          players of a failed game are closed
+        :param game_id: number identifying the game
+        :param players: list of (info message, remote player) tuples
+        """
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self.executor, self.run_game, players, self.instrumentation)
+        except BaseException as error:
+            for _, remote_player in players:
+                remote_player.socket.close()
+            if not isinstance(error, Exception):
+                raise
+            self.on_error(game_id, error)
+            return
+        self.on_result(game_id, results)
+
+        # the ids of the players are their positions in the game, starting at 1
+        remaining = {idx for _, idx, _ in results}
+        for idx, (info_message, remote_player) in enumerate(players, 1):
+            if idx in remaining:
+                self.spawn(self.rejoin(info_message, remote_player))
+            else:
+                remote_player.socket.close()
+
+    @classmethod
+    def run_game(cls, players, instrumentation=None):
+        """ Runs a complete game with the given players. Blocks until the game is over.
+        :param players: list of (info message, remote player) tuples
+        :param instrumentation: Instrumentation to which the instrumentation of the game is added, or None
+        :return: list of (info message, player id, score) in order of the ranking
+        """
+        dealer = Dealer()
+        dealer.concurrent_player_calls = cls.CONCURRENT_PLAYER_CALLS
+        player_ids = dealer.add_external_players([remote_player for _, remote_player in players])
+        if instrumentation is not None:
+            dealer.instrument(Instrumentation())
+        try:
+            dealer.run_game()
+        finally:
+            if instrumentation is not None:
+                # the remote players take part in other games afterwards
+                game_instrumentation = dealer.instrumentation
+                dealer.instrument(None)
+                instrumentation.merge(game_instrumentation, players=False)
+
+        info_messages = {idx: info_message for idx, (info_message, _) in zip(player_ids, players)}
+        return [(info_messages[idx], idx, score) for idx, score in dealer.ranking()]
+
+    @staticmethod
+    def print_results(game_id, results):
+        """ Prints the results of a game
+        :param game_id: number identifying the game
+        :param results: list of (info message, player id, score) in order of the ranking
+        """
+        print("Results of game {}:".format(game_id))
+        for place, (info_message, idx, score) in enumerate(results):
+            print("{}\tplayer id:{} info message: {}\tscore: {}".format(place + 1, idx, info_message, score))
+
+    @staticmethod
+    def print_error(game_id, error):
+        """ Prints the error of a game that failed
+        :param game_id: number identifying the game
+        :param error: exception raised by the game
+        """
+        print("Game {} failed: {!r}".format(game_id, error), file=sys.stderr)
@@ -0,0 +1,116 @@
+"""
+    Implements a long-lived Evolution client that plays many consecutive games with the same player.
+
+    After every game the server sends a game over message; the client answers with a new game message and waits in
+    the lobby for the next game over the same connection, see GameHost. When the connection is lost or cannot be
+    made, the client connects and signs up again after a delay that doubles after every failed attempt, up to
+    MAX_BACKOFF seconds.
+
+"""
+
+import socket
+import time
+
+from .remote_dealer import RemoteDealer
+
+
+class PersistentClient:
+    """ Keeps an external player signed up with a server, game after game. """
+
+    # seconds to wait before the first reconnection attempt
+    INITIAL_BACKOFF = 0.5
+    # maximum number of seconds to wait between reconnection attempts
+    MAX_BACKOFF = 30
+
+    def __init__(self, host, port, player, hello_message, max_games=None, max_attempts=None,
+                 initial_backoff=None, max_backoff=None, binary=False, delta=False):
+        """ Creates a new persistent client
+        :param host: server host
+        :param port: server port
+        :param player: ExternalPlayer used for all games
+        :param hello_message: info message sent when signing up
+        :param max_games: number of games after which the client stops, unlimited by default
+        :param max_attempts: number of failed connection attempts in a row after which the client stops, unlimited
+                             by default
+        :param initial_backoff: overrides INITIAL_BACKOFF
+        :param max_backoff: overrides MAX_BACKOFF
+        :param binary: if true, asks the server to use the binary encoding
+        :param delta: if true, asks the server to send delta updates with feed_next
+        """
+        self.host = host
+        self.port = port
+        self.player = player
+        self.hello_message = hello_message
+        self.max_games = max_games
+        self.max_attempts = max_attempts
+        self.initial_backoff = initial_backoff if initial_backoff is not None else self.INITIAL_BACKOFF
+        self.max_backoff = max_backoff if max_backoff is not None else self.MAX_BACKOFF
+        self.binary = binary
+        self.delta = delta
+
+        self.games_played = 0
+        self.connections = 0
+
+    def run(self):
+        """ Plays games until max_games games were played or max_attempts connection attempts failed in a row.
+          Effect: updates games_played and connections
+        :return: number of games played
+        """
+        backoff = self.initial_backoff
+        failed_attempts = 0
+        while not self.done():
+            if self.connect():
+                backoff = self.initial_backoff
+                failed_attempts = 0
+                continue
+
+            failed_attempts += 1
+            if self.max_attempts is not None and failed_attempts >= self.max_attempts:
+                break
+            time.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+        return self.games_played
+
+    def connect(self):
+        """ Connects to the server and plays games over the connection until it is lost or enough games were
+          played.
+          Effect: updates games_played and connections
+        :return: true if the client signed up, false if the connection or the sign-up failed
+        """
+        try:
+            s = socket.create_connection((self.host, self.port))
+        except OSError:
+            return False
+
+        self.connections += 1
+        try:
+            return self.play(RemoteDealer(s, self.player))
+        finally:
+            s.close()
+
+    def play(self, dealer):
+        """ Signs up over the given connection and plays games until the connection is lost or enough games were
+          played.
+          Effect: updates games_played
+        :param dealer: RemoteDealer of a new connection
+        :return: true if the sign-up succeeded, else false
+        """
+        try:
+            dealer.sign_up(self.hello_message, self.binary, self.delta)
+        except OSError:
+            return False
+
+        while dealer.main():
+            self.games_played += 1
+            if self.done():
+                break
+            try:
+                dealer.new_game()
+            except OSError:
+                break
+        return True
+
+    def done(self):
+        """ Returns True if the client played max_games games """
+        return self.max_games is not None and self.games_played >= self.max_games
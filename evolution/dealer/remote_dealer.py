@@ -4,6 +4,8 @@
 """
 
 
+from ..common.binary_protocol import BINARY_ENCODING
+from ..common.delta_state import DELTA_UPDATES, is_delta_message, apply_delta
 from ..common.remote_actor import RemoteActor
 
 
@@ -13,6 +15,11 @@ class RemoteDealer(RemoteActor):
     CHOOSE_MESSAGE_LEN = 2
     FEED_NEXT_MESSAGE_LEN = 5
 
+    # sent by the server after the last turn of a game to the players still in the game
+    GAME_OVER_MESSAGE = "game over"
+    # sent by a player after a game over message to join the next game over the same connection
+    NEW_GAME_MESSAGE = "new game"
+
     def __init__(self, socket, player):
         """ Creates a new proxy for a remote dealer
         :param socket: socket connection
@@ -20,21 +27,69 @@ class RemoteDealer(RemoteActor):
         """
         super().__init__(socket)
         self.player = player
+        # last State received with feed_next, to apply delta updates to, see delta_state
+        self.state = None
 
     def main(self):
         """ Starts the main loop for the remote dealer. The dealer listens for incoming messages from the
-          server and performs the appropriate action on each received message. """
-        for message in self.receive_iterator():
-            self.process_message(message)
+          server and performs the appropriate action on each received message until the server closes
+          the connection or the game is over.
+        :return: true if the game is over and the connection can be used for a new game, false if the connection
+                 was closed
+        """
+        try:
+            for message in self.receive_iterator():
+                if message == self.GAME_OVER_MESSAGE:
+                    return True
+                self.process_message(message)
+        except ConnectionError:
+            pass
+        return False
+
+    def sign_up(self, info_message, binary=False, delta=False):
+        """ Signs up with the server
+          Effect: switches to the binary encoding if asked for
+        :param info_message: string identifying the player
+        :param binary: if true, asks the server to use the binary encoding, see binary_protocol
+        :param delta: if true, asks the server to send delta updates with feed_next, see delta_state
+        :return: response of the server
+        :raise: socket.timeout, ConnectionError
+        """
+        self.send(self.hello_message(info_message, binary, delta))
+        if binary:
+            self.use_binary()
+        return self.receive()
+
+    @staticmethod
+    def hello_message(info_message, binary=False, delta=False):
+        """ Returns the sign-up message asking for the given options
+        :param info_message: string identifying the player
+        :param binary: if true, asks for the binary encoding
+        :param delta: if true, asks for delta updates
+        :return: info message if no option is asked for, otherwise [info message, option, ...]
+        """
+        options = [option for option, used in [(BINARY_ENCODING, binary), (DELTA_UPDATES, delta)] if used]
+        return [info_message] + options if options else info_message
+
+    def new_game(self):
+        """ Asks the server to join the next game after a game over message
+        :return: response of the server, the same as the response to the sign-up message
+        :raise: socket.timeout, ConnectionError
+        """
+        self.send(self.NEW_GAME_MESSAGE)
+        return self.receive()
 
     def process_message(self, message):
         """ Processes the given message. A message is one of:
           * PlayerState, for start
           * [LOB, LOB], for choose
           * State, for feed_next
+          * DeltaMessage, for feed_next with delta updates
         :param message: message to process
         """
-        if len(message) == self.START_MESSAGE_LEN:
+        if is_delta_message(message):
+            self.feed_next_delta(message)
+        elif len(message) == self.START_MESSAGE_LEN:
             self.start(message)
         elif len(message) == self.CHOOSE_MESSAGE_LEN:
             self.choose(message)
@@ -61,7 +116,18 @@ class RemoteDealer(RemoteActor):
         """ Processes a feed_next message of the format State and sends the player's response back to the server.
         :param data: State
         """
+        self.state = data
         bag, species, cards, watering_hole, players = data
         player_state = [species, bag, cards]
         response = self.player.feed_next(player_state, players, watering_hole)
         self.send(response)
+
+    def feed_next_delta(self, message):
+        """ Processes a feed_next message with the changes to the last State and sends the player's response back
+          to the server.
+        :param message: DeltaMessage
+        :raise: ValueError if no State was received before or the changes do not apply to it
+        """
+        if self.state is None:
+            raise ValueError("delta update without a previous state")
+        self.feed_next(apply_delta(self.state, message))
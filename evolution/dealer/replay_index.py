@@ -0,0 +1,220 @@
+"""
+    Implements random access into an event log: the state of the Dealer of any recorded game at any turn boundary,
+    without reading the log from the start.
+
+    The index of a log is a separate file listing every turn boundary of every game of the log, in log order:
+
+        magic (4 bytes) | version (1 byte) | size of the indexed log (8 bytes)
+        entries: game (4 bytes) | turn (4 bytes) | offset of the boundary (8 bytes) | offset of the snapshot (8 bytes)
+
+    all big-endian. Games are numbered by their position in the log. The boundary of a turn is the offset of the
+    first record after the end of the turn, the snapshot is the GameStart or Snapshot record closest before it. The
+    turn boundary at turn 0 is the start of the game.
+
+    A ReplayIndex memory-maps the log and its index. Finding a turn is a binary search over the entries and the
+    state of the Dealer is reconstructed by loading the snapshot and replaying the events up to the boundary, so only
+    the few turns since the last snapshot are read.
+
+"""
+
+import os
+import mmap
+import struct
+
+from .checkpoint import HEADER as CHECKPOINT_HEADER
+from .event_log import Replay, GameStart, Snapshot, EndTurn, EVENT_CODES, decode_records, decode_event, \
+    decode_varint
+
+
+INDEX_MAGIC = b"EVIX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct(">4sBQ")
+INDEX_ENTRY = struct.Struct(">IIQQ")
+INDEX_SUFFIX = ".idx"
+
+GAME_START = EVENT_CODES[GameStart]
+SNAPSHOT = EVENT_CODES[Snapshot]
+END_TURN = EVENT_CODES[EndTurn]
+
+
+def index_entries(data):
+    """ Computes the index entries of a log. Only the headers of the snapshots are decoded.
+    :param data: bytes-like object holding the log
+    :return: list of (game, turn, boundary offset, snapshot offset) tuples in log order
+    :raise: ValueError if the log is truncated
+    """
+    entries = []
+    game = -1
+    snapshot = None
+    for offset, event_type, payload in decode_records(data):
+        length, start = decode_varint(data, offset)
+        end = start + length
+        if event_type == GAME_START or event_type == SNAPSHOT:
+            _, start = decode_varint(payload, 0)
+            _, _, turn = CHECKPOINT_HEADER.unpack_from(payload, start)
+            snapshot = offset
+            if event_type == GAME_START:
+                game += 1
+                entries.append((game, turn, end, snapshot))
+            elif entries and entries[-1][:2] == (game, turn):
+                # the snapshot of a turn replaces its end of turn
+                entries[-1] = (game, turn, end, snapshot)
+        elif event_type == END_TURN and snapshot is not None:
+            turn, _ = decode_varint(payload, 0)
+            entries.append((game, turn, end, snapshot))
+    return entries
+
+
+def write_index(log_path, index_path=None):
+    """ Indexes the log at the given path. The log is memory-mapped, not read into memory.
+    :param log_path: path of the event log
+    :param index_path: path of the index file, the path of the log with INDEX_SUFFIX by default
+    :return: path of the index file
+    """
+    index_path = index_path if index_path is not None else log_path + INDEX_SUFFIX
+    data = map_file(log_path)
+    try:
+        index = bytearray(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(data)))
+        for entry in index_entries(data):
+            index += INDEX_ENTRY.pack(*entry)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    temporary_path = index_path + ".tmp"
+    with open(temporary_path, "wb") as f:
+        f.write(index)
+    os.replace(temporary_path, index_path)
+    return index_path
+
+
+def map_file(path):
+    """ Memory-maps the file at the given path for reading
+    :return: mmap, or empty bytes for an empty file which cannot be mapped
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class ReplayIndex:
+    """ Random access to the recorded games of an event log through its index. """
+
+    def __init__(self, log_path, index_path=None):
+        """ Opens the given log and its index. The index is written first if it is missing or does not cover the
+          whole log, e.g. when games were appended to the log.
+        :param log_path: path of the event log
+        :param index_path: path of the index file, the path of the log with INDEX_SUFFIX by default
+        :raise: OSError if the log cannot be read, ValueError if the log is truncated
+        """
+        self.index_path = index_path if index_path is not None else log_path + INDEX_SUFFIX
+        if self.indexed_size() != os.path.getsize(log_path):
+            write_index(log_path, self.index_path)
+
+        self.log = map_file(log_path)
+        self.index = map_file(self.index_path)
+        self.size = (len(self.index) - INDEX_HEADER.size) // INDEX_ENTRY.size
+
+    def indexed_size(self):
+        """ Returns the size of the log when the index was written, None if there is no valid index """
+        try:
+            with open(self.index_path, "rb") as f:
+                header = f.read(INDEX_HEADER.size)
+        except FileNotFoundError:
+            return None
+        if len(header) < INDEX_HEADER.size:
+            return None
+        magic, version, size = INDEX_HEADER.unpack(header)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            return None
+        return size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self.close()
+
+    def close(self):
+        """ Unmaps the log and the index """
+        for data in [self.log, self.index]:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def __len__(self):
+        """ Returns the number of turn boundaries in the index """
+        return self.size
+
+    def entry(self, position):
+        """ Returns the entry at the given position
+        :return: (game, turn, boundary offset, snapshot offset) tuple
+        """
+        return INDEX_ENTRY.unpack_from(self.index, INDEX_HEADER.size + position * INDEX_ENTRY.size)
+
+    def find(self, game, turn):
+        """ Finds the entry of the given turn boundary with a binary search
+        :param game: position of the game in the log
+        :param turn: number of turns played
+        :return: position of the entry
+        :raise: KeyError if the game did not reach the given turn boundary
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self.entry(middle)[:2] < (game, turn):
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.size or self.entry(low)[:2] != (game, turn):
+            raise KeyError((game, turn))
+        return low
+
+    def games(self):
+        """ Returns the number of games in the log """
+        return self.entry(self.size - 1)[0] + 1 if self.size else 0
+
+    def turns(self, game):
+        """ Returns the turn boundaries of the given game
+        :param game: position of the game in the log
+        :return: list of turns, starting with the turn the game started at
+        :raise: KeyError if the game is not in the log
+        """
+        position = self.first(game)
+        turns = []
+        while position < self.size:
+            entry_game, turn, _, _ = self.entry(position)
+            if entry_game != game:
+                break
+            turns.append(turn)
+            position += 1
+        return turns
+
+    def first(self, game):
+        """ Returns the position of the first entry of the given game
+        :raise: KeyError if the game is not in the log
+        """
+        low, high = 0, self.size
+        while low < high:
+            middle = (low + high) // 2
+            if self.entry(middle)[0] < game:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.size or self.entry(low)[0] != game:
+            raise KeyError(game)
+        return low
+
+    def dealer_at(self, game, turn):
+        """ Reconstructs the Dealer of the given game at the given turn boundary, loading the closest snapshot and
+          replaying the events after it
+        :param game: position of the game in the log
+        :param turn: number of turns played
+        :return: Dealer, without external players
+        :raise: KeyError if the game did not reach the given turn boundary
+        """
+        _, _, boundary, snapshot = self.entry(self.find(game, turn))
+        replay = Replay()
+        for _, event_type, payload in decode_records(self.log, snapshot, boundary):
+            replay.apply(decode_event(event_type, payload))
+        return replay.dealer
@@ -0,0 +1,91 @@
+import random
+
+from unittest import TestCase, skipIf
+
+from .batch_simulation import BatchSimulation, np
+from .dealer import Dealer
+from .fast_dealer import FastDealer, CARDS, CARD_CODES
+from ..player.dummy_player import DummyPlayer
+from ..player.fast_dummy_player import FastDummyPlayer
+
+
+def sorted_cards(configuration):
+    """ Returns the Configuration with the cards of every player in order """
+    players, watering_hole, deck = configuration
+    for player in players:
+        if len(player) > 3:
+            player[3][1] = sorted(player[3][1], key=lambda card: CARD_CODES[tuple(card)])
+    return [players, watering_hole, deck]
+
+
+def run_fast_dealer(players, deck, dealer_class=FastDealer):
+    dealer = dealer_class()
+    dealer.add_external_players([FastDummyPlayer() for _ in range(players)])
+    dealer.run_game(deck)
+    return dealer
+
+
+@skipIf(np is None, "NumPy is not installed")
+class BatchSimulationTestCase(TestCase):
+
+    def test_run_same_as_dealer(self):
+        for players in range(3, 9):
+            reference = Dealer()
+            reference.add_external_players([DummyPlayer() for _ in range(players)])
+            reference.run_game()
+
+            simulation = BatchSimulation(2, players)
+            simulation.run()
+
+            for game in range(2):
+                self.assertEqual(simulation.serialize(game), sorted_cards(reference.serialize()))
+                self.assertEqual(simulation.ranking(game), list(reference.ranking()))
+
+    def test_run_shuffled_decks(self):
+        rng = random.Random(4500)
+        for players in range(3, 9):
+            decks = [rng.sample(range(len(CARDS)), len(CARDS)) for _ in range(20)]
+            simulation = BatchSimulation(len(decks), players, decks)
+            simulation.run()
+
+            winners = simulation.winners()
+            for game, deck in enumerate(decks):
+                fast = run_fast_dealer(players, deck)
+                ranking = list(fast.ranking())
+                self.assertEqual(simulation.serialize(game), sorted_cards(fast.serialize()))
+                self.assertEqual(simulation.ranking(game), ranking)
+                self.assertEqual(winners[game], ranking[0][0])
+
+    def test_rule_variant(self):
+        class Variant:
+            EXTINCT_SPECIES_PAYOUT = 4
+            CARDS_PER_TURN = 2
+
+        class BatchVariant(Variant, BatchSimulation):
+            pass
+
+        class FastDealerVariant(Variant, FastDealer):
+            pass
+
+        rng = random.Random(4501)
+        decks = [rng.sample(range(len(CARDS)), len(CARDS)) for _ in range(20)]
+        simulation = BatchVariant(len(decks), 4, decks)
+        simulation.run()
+
+        for game, deck in enumerate(decks):
+            fast = run_fast_dealer(4, deck, FastDealerVariant)
+            self.assertEqual(simulation.serialize(game), sorted_cards(fast.serialize()))
+
+    def test_scores(self):
+        simulation = BatchSimulation(1, 3)
+        simulation.bag[0] = [3, 0, 1]
+        simulation.count[0] = [2, 0, 1]
+        simulation.population[0, 0, :2] = [2, 4]
+        simulation.traits[0, 0, 1] = 0b101
+        simulation.population[0, 2, 0] = 1
+        simulation.population[0, 2, 1] = 5
+        simulation.remove_players(np.array([True]), np.array([1]))
+
+        self.assertEqual(simulation.scores().tolist(), [[3 + 6 + 2, -1, 2]])
+        self.assertEqual(simulation.ranking(0), [(1, 11), (3, 2)])
+        self.assertEqual(simulation.winners().tolist(), [1])
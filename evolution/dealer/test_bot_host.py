@@ -0,0 +1,93 @@
+import asyncio
+
+from unittest import TestCase
+
+from .bot_host import Bot, BotHost, latency_summary
+from .game_host import GameHost
+from .remote_dealer import RemoteDealer
+from ..common.binary_protocol import encode_frame
+from ..player.dummy_player import DummyPlayer
+
+
+class BotTestCase(TestCase):
+
+    def test_handle(self):
+        bot = Bot("bot", DummyPlayer(), games=2)
+        self.assertEqual(bot.take_outgoing(), RemoteDealer.encode("bot"))
+
+        bot.sent_at = 1.0
+        self.assertTrue(bot.handle(GameHost.OKAY_MESSAGE, 1.5))
+        self.assertEqual(bot.latencies, [0.5])
+        self.assertEqual(bot.take_outgoing(), b"")
+
+        self.assertTrue(bot.handle(RemoteDealer.GAME_OVER_MESSAGE, 2.0))
+        self.assertEqual(bot.latencies, [0.5])
+        self.assertEqual(bot.take_outgoing(), RemoteDealer.encode(RemoteDealer.NEW_GAME_MESSAGE))
+        self.assertTrue(bot.handle(GameHost.OKAY_MESSAGE, 2.0))
+        self.assertFalse(bot.handle(RemoteDealer.GAME_OVER_MESSAGE, 3.0))
+        self.assertEqual(bot.games_played, 2)
+        self.assertEqual(bot.messages, 4)
+
+    def test_latency_summary(self):
+        self.assertEqual(latency_summary([])["count"], 0)
+        summary = latency_summary([0.004, 0.001, 0.003, 0.002])
+        self.assertEqual(summary["count"], 4)
+        self.assertAlmostEqual(summary["mean"], 2.5)
+        self.assertAlmostEqual(summary["p50"], 2)
+        self.assertAlmostEqual(summary["max"], 4)
+
+
+class BotHostTestCase(TestCase):
+
+    def test_bots_play_games(self):
+        games = 2
+        results = []
+
+        game_host = GameHost("127.0.0.1", 0, countdown_time=0.2)
+        game_host.bind()
+        game_host.on_result = lambda game_id, ranking: results.append(ranking)
+
+        bots = [Bot("d{}".format(i), DummyPlayer(), games, binary=i % 2 == 0, delta=i % 3 == 0)
+                for i in range(12)]
+        bot_host = BotHost("127.0.0.1", game_host.port, bots)
+
+        async def serve():
+            server = asyncio.ensure_future(game_host.serve())
+            await bot_host.serve()
+            server.cancel()
+
+        asyncio.run(asyncio.wait_for(serve(), 60))
+
+        reports = bot_host.report()
+        self.assertEqual([report["error"] for report in reports], [None] * len(bots))
+        self.assertEqual([report["games"] for report in reports], [games] * len(bots))
+        self.assertTrue(all(report["latency_ms"]["count"] > 0 for report in reports))
+        self.assertEqual(sorted(info for ranking in results for info, _, _ in ranking),
+                         sorted(bot.name for bot in bots for _ in range(games)))
+
+    def test_bot_error(self):
+        async def handle(reader, writer):
+            hello = await reader.readline()
+            if b"binary" in hello:
+                # an unknown frame kind
+                writer.write(encode_frame(GameHost.OKAY_MESSAGE) + bytes([9, 0, 0, 0, 0]))
+            else:
+                writer.write(RemoteDealer.encode(GameHost.OKAY_MESSAGE) +
+                             RemoteDealer.encode(RemoteDealer.GAME_OVER_MESSAGE))
+            await writer.drain()
+            await reader.read()
+            writer.close()
+
+        bots = [Bot("binary", DummyPlayer(), binary=True), Bot("json", DummyPlayer())]
+
+        async def serve():
+            server = await asyncio.start_server(handle, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            await BotHost("127.0.0.1", port, bots).serve()
+            server.close()
+
+        asyncio.run(asyncio.wait_for(serve(), 10))
+
+        self.assertIn("ValueError", bots[0].error)
+        self.assertIsNone(bots[1].error)
+        self.assertEqual(bots[1].games_played, 1)
@@ -0,0 +1,117 @@
+import os
+import tempfile
+import threading
+
+from unittest import TestCase
+from unittest.mock import patch
+
+from .checkpoint import CheckpointWriter, encode_checkpoint, decode_checkpoint, write_checkpoint, read_checkpoint
+from .dealer import Dealer
+from ..player.dummy_player import DummyPlayer
+
+
+class Crash(Exception):
+    pass
+
+
+def interrupted_game(path, players, turns):
+    """ Plays a game of dummy players with checkpoints until it crashes at the start of the given turn """
+    dealer = Dealer()
+    dealer.add_external_players([DummyPlayer() for _ in range(players)])
+    take_turn = dealer.take_turn
+
+    def crashing_take_turn():
+        if dealer.turn == turns:
+            raise Crash()
+        take_turn()
+
+    dealer.take_turn = crashing_take_turn
+    try:
+        with CheckpointWriter(path) as checkpoints:
+            dealer.run_game(checkpoints)
+    except Crash:
+        pass
+
+
+class CheckpointTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.ckpt")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_encode_decode(self):
+        configuration = [[[["id", 1], ["species", []], ["bag", 3]]], 5, [[2, "carnivore"]]]
+        data = encode_checkpoint(7, configuration)
+        self.assertEqual(decode_checkpoint(data), (7, configuration))
+
+        for invalid in [b"", b"EVCK", b"XXXX" + data[4:], data[:4] + b"\x09" + data[5:], data[:-3]]:
+            with self.assertRaises(ValueError):
+                decode_checkpoint(invalid)
+
+    def test_write_replaces_atomically(self):
+        write_checkpoint(self.path, 1, [[], 0, []])
+        write_checkpoint(self.path, 2, [[], 1, []])
+        self.assertEqual(read_checkpoint(self.path), (2, [[], 1, []]))
+        self.assertEqual(os.listdir(self.directory.name), ["game.ckpt"])
+
+    def test_resume_same_as_uninterrupted(self):
+        for players in range(3, 9):
+            reference = Dealer()
+            reference.add_external_players([DummyPlayer() for _ in range(players)])
+            reference.run_game()
+
+            interrupted_game(self.path, players, 3)
+            dealer = Dealer.load_checkpoint(self.path, [DummyPlayer() for _ in range(players)])
+            # games of 8 players are over after 2 turns
+            self.assertEqual(dealer.turn, min(3, reference.turn))
+            dealer.resume_game()
+
+            self.assertEqual(dealer.serialize(), reference.serialize())
+            self.assertEqual(list(dealer.ranking()), list(reference.ranking()))
+            self.assertEqual(dealer.turn, reference.turn)
+
+    def test_resume_attaches_external_players(self):
+        interrupted_game(self.path, 4, 2)
+        externals = [DummyPlayer() for _ in range(4)]
+        dealer = Dealer.load_checkpoint(self.path, externals)
+        self.assertEqual([p.external for p in dealer.players], externals[2:] + externals[:2])
+
+    def test_every(self):
+        dealer = Dealer()
+        with CheckpointWriter(self.path, every=2) as checkpoints:
+            for turn in [1, 2, 3]:
+                dealer.turn = turn
+                checkpoints.save(dealer)
+        self.assertEqual(read_checkpoint(self.path)[0], 2)
+
+    def test_write_behind(self):
+        # while a checkpoint is being written only the latest pending checkpoint is kept
+        release = threading.Event()
+        written = []
+
+        def slow_write(path, turn, configuration):
+            release.wait()
+            written.append(turn)
+
+        dealer = Dealer()
+        with patch("evolution.dealer.checkpoint.write_checkpoint", slow_write):
+            with CheckpointWriter(self.path) as checkpoints:
+                for turn in range(1, 6):
+                    dealer.turn = turn
+                    checkpoints.save(dealer)
+                release.set()
+                checkpoints.flush()
+
+        self.assertEqual(written[-1], 5)
+        self.assertLessEqual(len(written), 2)
+
+    def test_write_error(self):
+        dealer = Dealer()
+        checkpoints = CheckpointWriter(os.path.join(self.path, "missing", "game.ckpt"))
+        checkpoints.save(dealer)
+        with self.assertRaises(OSError):
+            checkpoints.flush()
+        checkpoints.close()
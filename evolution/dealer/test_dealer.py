@@ -1,10 +1,11 @@
 import json
+import time
 
 from collections import OrderedDict
 from functools import partial
 
 from unittest import TestCase
-from unittest.mock import MagicMock, call
+from unittest.mock import MagicMock, call, patch
 
 from .dealer import Dealer, TraitCard
 from ..data_definitions import DataDefinitions
@@ -13,6 +14,8 @@ from ..player.dummy_player import DummyPlayer
 from ..common.species import Species
 from ..common.trait import Trait, HORNS_DAMAGE
 from ..common.actions import Actions, GrowPopulation, GrowBody, BoardTransfer, ReplaceTrait
+from ..common.player_helpers import ExternalPlayerCall
+from ..common.instrumentation import Instrumentation, GAME, STEP1, STEP2_3, STEP4, FEED1, EXTERNAL_PLAYER_CALL
 
 
 class DealerTestCase(TestCase):
@@ -326,6 +329,27 @@ class DealerTestCase(TestCase):
         for p in d.players:
             self.assertEqual(p.score(), 1)
 
+    def test_run_game_instrumented(self):
+        d = Dealer()
+        d.instrument(Instrumentation())
+        d.add_external_players([DummyPlayer() for _ in range(5)])
+        d.run_game()
+
+        instrumentation = d.instrumentation
+        self.assertEqual(instrumentation.games, 1)
+        timings = instrumentation.histograms
+        self.assertEqual(timings[GAME].count, 1)
+        self.assertEqual(timings[STEP1].count, d.turn)
+        self.assertEqual(timings[STEP2_3].count, d.turn)
+        self.assertEqual(timings[STEP4].count, d.turn)
+        self.assertGreater(timings[FEED1].count, d.turn)
+        self.assertEqual(timings[EXTERNAL_PLAYER_CALL + ".start"].count, 5 * d.turn)
+        self.assertEqual(timings[EXTERNAL_PLAYER_CALL].count,
+                         sum(player[EXTERNAL_PLAYER_CALL].count for player in instrumentation.players.values()))
+        self.assertEqual(sorted(instrumentation.players), [1, 2, 3, 4, 5])
+        # the dummy players are not remote
+        self.assertEqual(instrumentation.traffic, {})
+
     def test_run_game_malicious_feeding_choice(self):
 
         bad_external = DummyPlayer()
@@ -402,6 +426,85 @@ class DealerTestCase(TestCase):
         self.assertEqual(d.players, [p2, p3])
 
 
+class ConcurrentPlayerCallsTestCase(TestCase):
+
+    @staticmethod
+    def slow_external(duration):
+        external = DummyPlayer()
+        start, choose = external.start, external.choose
+
+        def slow_start(*args):
+            time.sleep(duration)
+            return start(*args)
+
+        def slow_choose(*args):
+            time.sleep(duration)
+            return choose(*args)
+
+        external.start = slow_start
+        external.choose = slow_choose
+        return external
+
+    @staticmethod
+    def concurrent_dealer(externals):
+        d = Dealer(deck=DataDefinitions.deck())
+        d.add_external_players(externals)
+        d.concurrent_player_calls = True
+        return d
+
+    def test_run_game_same_as_sequential(self):
+        for players in range(3, 9):
+            sequential = Dealer()
+            sequential.add_external_players([DummyPlayer() for _ in range(players)])
+            sequential.run_game()
+
+            concurrent = Dealer()
+            concurrent.add_external_players([DummyPlayer() for _ in range(players)])
+            concurrent.concurrent_player_calls = True
+            concurrent.run_game()
+
+            self.assertEqual(concurrent.serialize(), sequential.serialize())
+            self.assertEqual(list(concurrent.ranking()), list(sequential.ranking()))
+
+    def test_calls_overlap(self):
+        d = self.concurrent_dealer([self.slow_external(0.2) for _ in range(6)])
+
+        start = time.monotonic()
+        d.step1()
+        actions = d.step2_3()
+        self.assertLess(time.monotonic() - start, 6 * 0.2)
+
+        self.assertEqual([p.idx for p in d.players], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(len(actions), 6)
+
+    def test_step1_deals_in_order(self):
+        d = self.concurrent_dealer([self.slow_external(0.05 * (3 - idx)) for idx in range(3)])
+        deck = list(d.deck)
+
+        d.step1()
+        self.assertEqual([p.cards for p in d.players], [deck[0:4], deck[4:8], deck[8:12]])
+
+    def test_bad_players_removed_in_order(self):
+        bad_external = DummyPlayer()
+        bad_external.choose = MagicMock(side_effect=ValueError())
+        d = self.concurrent_dealer([DummyPlayer(), bad_external, DummyPlayer(), bad_external])
+
+        d.step1()
+        actions = d.step2_3()
+        self.assertEqual([p.idx for p in d.players], [1, 3])
+        self.assertEqual(len(actions), 2)
+
+    def test_per_player_deadline(self):
+        d = self.concurrent_dealer([DummyPlayer(), self.slow_external(0.5), DummyPlayer()])
+
+        with patch.object(ExternalPlayerCall, "TIMEOUT_THRESHOLD", 0.2):
+            start = time.monotonic()
+            d.step1()
+
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual([p.idx for p in d.players], [1, 3])
+
+
 class Feed1TestCase(TestCase):
 
     @staticmethod
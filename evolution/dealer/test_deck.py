@@ -0,0 +1,36 @@
+from unittest import TestCase
+
+from .deck import Deck
+from ..data_definitions import DataDefinitions
+
+
+class DeckTestCase(TestCase):
+
+    def test_draw(self):
+        cards = sorted(DataDefinitions.deck())
+        deck = Deck(cards)
+        self.assertEqual(len(deck), len(cards))
+
+        self.assertEqual(deck.draw(3), cards[:3])
+        self.assertEqual(deck.draw(0), [])
+        self.assertEqual(deck.draw(4), cards[3:7])
+        self.assertEqual(len(deck), len(cards) - 7)
+        self.assertEqual(deck, cards[7:])
+        self.assertEqual(list(deck), cards[7:])
+
+        self.assertEqual(deck.draw(len(cards)), cards[7:])
+        self.assertEqual(len(deck), 0)
+        self.assertEqual(deck.draw(1), [])
+        self.assertEqual(deck, [])
+
+    def test_copy(self):
+        cards = DataDefinitions.deck()[:5]
+        deck = Deck(cards)
+        deck.draw(2)
+
+        copy = Deck(deck)
+        self.assertEqual(copy, deck)
+        copy.draw(1)
+        self.assertNotEqual(copy, deck)
+        self.assertEqual(deck, cards[2:])
+        self.assertEqual(cards, DataDefinitions.deck()[:5])
@@ -0,0 +1,144 @@
+import io
+import random
+
+from unittest import TestCase
+
+from .dealer import Dealer
+from .deck import Deck
+from .event_log import EventRecorder, EventReader, EventStatistics, replay_game, encode_varint, decode_varint, \
+    GameStart, Step1, PlayerRemoved, ActionsApplied, Feed1, Carnivore, EndTurn, GameEnd
+from ..common.feeding_outcome import CarnivoreFeeding
+from ..data_definitions import DataDefinitions
+from ..player.dummy_player import DummyPlayer
+
+
+class CrashingPlayer(DummyPlayer):
+    """ Dummy player that fails to choose its actions from the given turn on """
+
+    def __init__(self, turn):
+        super().__init__()
+        self.turns = turn
+
+    def choose(self, choice):
+        self.turns -= 1
+        if self.turns <= 0:
+            raise RuntimeError("crashed")
+        return super().choose(choice)
+
+
+class PlayerStub:
+
+    def __init__(self, idx):
+        self.idx = idx
+
+
+def recorded_game(externals, deck=None):
+    """ Plays a game with the given external players and records it
+    :param deck: list of TraitCards dealt in order, the sorted deck by default
+    :return: (Dealer at the end of the game, log as bytes) tuple
+    """
+    log = io.BytesIO()
+    dealer = Dealer()
+    dealer.add_external_players(externals)
+    dealer.recorder = EventRecorder(log, buffer_size=64)
+    if deck is None:
+        dealer.run_game()
+    else:
+        dealer.deck = Deck(deck)
+        dealer.resume_game()
+    dealer.recorder.flush()
+    return dealer, log.getvalue()
+
+
+def read_log(data):
+    return list(EventReader(io.BytesIO(data)))
+
+
+class EventLogTestCase(TestCase):
+
+    def test_varint(self):
+        for value in [0, 1, 127, 128, 300, 2 ** 35 + 7]:
+            buffer = bytearray()
+            encode_varint(value, buffer)
+            self.assertEqual(decode_varint(buffer, 0), (value, len(buffer)))
+        with self.assertRaises(ValueError):
+            decode_varint(b"\x80", 0)
+
+    def test_events(self):
+        dealer, data = recorded_game([DummyPlayer() for _ in range(4)])
+        events = read_log(data)
+
+        self.assertIsInstance(events[0], GameStart)
+        self.assertEqual(events[0].turn, 0)
+        self.assertEqual(Dealer.deserialize(events[0].configuration).deck.cards, Dealer(
+            deck=sorted(DataDefinitions.deck())).deck.cards)
+        self.assertEqual(events[-1], GameEnd(list(dealer.ranking())))
+
+        self.assertTrue(all(isinstance(event, Step1) for event in events[1:5]))
+        self.assertEqual([(event.player, event.new_species) for event in events[1:5]],
+                         [(idx, True) for idx in range(1, 5)])
+        self.assertEqual(sum(isinstance(event, EndTurn) for event in events), dealer.turn)
+        self.assertEqual(sum(isinstance(event, ActionsApplied) for event in events), 4 * dealer.turn)
+
+    def test_replay_same_as_game(self):
+        for players in range(3, 9):
+            dealer, data = recorded_game([DummyPlayer() for _ in range(players)])
+            replayed = replay_game(EventReader(io.BytesIO(data)))
+            self.assertEqual(replayed.serialize(), dealer.serialize())
+            self.assertEqual(replayed.turn, dealer.turn)
+
+    def test_replay_shuffled_decks_and_removed_players(self):
+        rng = random.Random(4502)
+        for _ in range(10):
+            deck = sorted(DataDefinitions.deck())
+            rng.shuffle(deck)
+            externals = [DummyPlayer(), CrashingPlayer(2), DummyPlayer(), DummyPlayer(), CrashingPlayer(4)]
+            dealer, data = recorded_game(externals, deck)
+            events = read_log(data)
+
+            self.assertCountEqual([event for event in events if isinstance(event, PlayerRemoved)],
+                                  [PlayerRemoved(2), PlayerRemoved(5)])
+            self.assertEqual(replay_game(events).serialize(), dealer.serialize())
+
+    def test_replay_game_of_log(self):
+        log = io.BytesIO()
+        recorder = EventRecorder(log)
+        dealers = []
+        for players in [3, 4, 5]:
+            dealer = Dealer()
+            dealer.add_external_players([DummyPlayer() for _ in range(players)])
+            dealer.recorder = recorder
+            dealer.run_game()
+            dealers.append(dealer)
+        recorder.flush()
+
+        events = read_log(log.getvalue())
+        self.assertEqual([event.game for event in events if isinstance(event, GameStart)], [0, 1, 2])
+        self.assertEqual(replay_game(events, 1).serialize(), dealers[1].serialize())
+        with self.assertRaises(ValueError):
+            replay_game(events, 3)
+
+    def test_carnivore(self):
+        log = io.BytesIO()
+        recorder = EventRecorder(log)
+        recorder.feed1(PlayerStub(2), CarnivoreFeeding(1, 0, 3))
+        recorder.carnivore(PlayerStub(2), 1, PlayerStub(3), 3, True, False)
+        recorder.flush()
+
+        self.assertEqual(read_log(log.getvalue()), [Feed1(2, True, CarnivoreFeeding(1, 0, 3)),
+                                                    Carnivore(2, 1, 3, 3, True, False)])
+
+    def test_truncated_log(self):
+        _, data = recorded_game([DummyPlayer() for _ in range(3)])
+        with self.assertRaises(ValueError):
+            read_log(data[:-1])
+
+    def test_statistics(self):
+        dealer, data = recorded_game([DummyPlayer() for _ in range(5)])
+        summary = EventStatistics().add_all(read_log(data)).summary()
+
+        self.assertEqual(summary["games"], 1)
+        self.assertEqual(summary["turns"], dealer.turn)
+        self.assertEqual(summary["players-removed"], 0)
+        self.assertEqual(summary["winning-scores"], {str(next(dealer.ranking())[1]): 1})
+        self.assertEqual(sum(summary["feedings"].values()), summary["events"]["Feed1"])
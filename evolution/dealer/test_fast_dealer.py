@@ -0,0 +1,122 @@
+import os
+import glob
+import json
+import random
+
+from unittest import TestCase
+
+from .dealer import Dealer
+from .fast_dealer import FastDealer, pack_traits, unpack_traits
+from ..data_definitions import DataDefinitions
+from ..common.actions import Actions
+from ..player.dummy_player import DummyPlayer
+from ..player.fast_dummy_player import FastDummyPlayer
+from ..player.player import Player
+from ..random_states import random_action4, random_configuration, random_player
+
+
+TEST_HARNESSES = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "..", "test_harnesses")
+
+
+def load_tests(name):
+    """ Returns the inputs of the given test corpus as (path, JSON) tuples """
+    for path in sorted(glob.glob(os.path.join(TEST_HARNESSES, name, "*-in.json"))):
+        with open(path) as f:
+            yield path, json.load(f)
+
+
+def outcome(function):
+    """ Returns the result of the function or the name of the exception it raised """
+    try:
+        return function()
+    except Exception as e:
+        return type(e).__name__
+
+
+class FastDealerTestCase(TestCase):
+
+    def test_pack_traits(self):
+        for codes in [[], [0], [15, 0, 3], [5, 5]]:
+            self.assertEqual(unpack_traits(pack_traits(codes)), codes)
+
+    def test_serialize_deserialize(self):
+        rng = random.Random(4500)
+        for _ in range(20):
+            configuration = random_configuration(rng, cards=20)
+            self.assertEqual(FastDealer.deserialize(configuration).serialize(), configuration)
+
+    def test_xstep_corpus(self):
+        for path, configuration in load_tests("xstep_tests"):
+            if not DataDefinitions.dealer(configuration):
+                continue
+
+            def feed1(dealer_class):
+                dealer = dealer_class.deserialize(configuration)
+                dealer.feed1()
+                return dealer.serialize()
+
+            self.assertEqual(outcome(lambda: feed1(FastDealer)), outcome(lambda: feed1(Dealer)), path)
+
+    def test_xstep4_corpus(self):
+        for path, (configuration, step4) in load_tests("xstep4_tests"):
+            if not DataDefinitions.dealer(configuration) or not all(DataDefinitions.action4(a) for a in step4):
+                continue
+
+            def reference():
+                dealer = Dealer.deserialize(configuration)
+                dealer.step4([Actions.deserialize(action4) for action4 in step4])
+                return dealer.serialize()
+
+            def fast():
+                dealer = FastDealer.deserialize(configuration)
+                dealer.step4(step4)
+                return dealer.serialize()
+
+            self.assertEqual(outcome(fast), outcome(reference), path)
+
+    def test_feeding_step_random(self):
+        rng = random.Random(4501)
+        for _ in range(100):
+            configuration = random_configuration(rng, cards=20)
+
+            reference = Dealer.deserialize(configuration)
+            reference.feeding_step()
+            reference.end_turn()
+
+            fast = FastDealer.deserialize(configuration)
+            fast.feeding_step()
+            fast.end_turn()
+
+            self.assertEqual(fast.serialize(), reference.serialize())
+
+    def test_run_game(self):
+        for players in range(3, 9):
+            reference = Dealer()
+            reference.add_external_players([DummyPlayer() for _ in range(players)])
+            reference.run_game()
+
+            fast = FastDealer()
+            fast.add_external_players([FastDummyPlayer() for _ in range(players)])
+            fast.run_game()
+
+            self.assertEqual(fast.serialize(), reference.serialize())
+            self.assertEqual(list(fast.ranking()), list(reference.ranking()))
+
+    def test_illegal_actions(self):
+        class IllegalPlayer(FastDummyPlayer):
+            def choose(self, dealer, seat):
+                return [99, [], [], [], []]
+
+        fast = FastDealer()
+        fast.add_external_players([FastDummyPlayer(), IllegalPlayer(), FastDummyPlayer(), FastDummyPlayer()])
+        fast.run_game()
+        self.assertEqual(sorted(fast.ids[seat] for seat in fast.players), [1, 3, 4])
+
+    def test_legal_actions_same_as_parse(self):
+        rng = random.Random(4502)
+        for _ in range(2000):
+            player = random_player(rng)
+            action4 = random_action4(rng, player)
+
+            fast = FastDealer.deserialize(Dealer([player, Player(2), Player(3)], 0).serialize())
+            self.assertEqual(fast.legal_actions(0, action4), Actions.parse(action4, player) is not None, action4)
@@ -0,0 +1,94 @@
+import random
+
+from unittest import TestCase
+from unittest.mock import MagicMock
+
+from .dealer import Dealer
+from .feeding_engine import FeedingEngine
+from ..player.player import Player
+from ..player.strategy_player import StrategyPlayer
+from ..common.feeding_outcome import CannotFeed, VegetarianFeeding, CarnivoreFeeding
+from ..common.species import Species
+from ..common.trait import Trait
+from ..random_states import random_configuration
+
+
+class FeedingEngineTestCase(TestCase):
+
+    def test_candidates(self):
+        player = Player(1, species=[
+            Species(food=0, population=2, traits=[Trait.CARNIVORE]),
+            Species(food=0, population=1),
+            Species(food=1, population=1, body=3, traits=[Trait.FAT_TISSUE], fat_food=1),
+        ])
+        other = Player(2, species=[Species(), Species(traits=[Trait.CLIMBING])])
+
+        candidates = FeedingEngine().candidates(player, [other], 5)
+        self.assertTrue(candidates.hungry)
+        self.assertEqual(candidates.vegetarian, [VegetarianFeeding(1)])
+        self.assertEqual([f.serialize() for f in candidates.fat_tissue], [[2, 2]])
+        self.assertEqual(candidates.carnivore, [CarnivoreFeeding(0, 0, 0), CarnivoreFeeding(0, 1, 1),
+                                                CarnivoreFeeding(0, 1, 2)])
+        self.assertEqual(candidates.carnivore_others, [CarnivoreFeeding(0, 0, 0)])
+
+    def test_species_changed(self):
+        player = Player(1, species=[Species(food=0, population=1)])
+        other = Player(2, species=[Species()])
+        engine = FeedingEngine()
+
+        self.assertEqual(engine.candidates(player, [other], 5).vegetarian, [VegetarianFeeding(0)])
+        # kept while the species do not change
+        state = engine.state(player)
+        self.assertIs(engine.state(player), state)
+
+        player.species[0].feed(5)
+        candidates = engine.candidates(player, [other], 5)
+        self.assertIsNot(engine.state(player), state)
+        self.assertEqual(candidates.vegetarian, [])
+        self.assertEqual(candidates.automatic_feeding(), CannotFeed())
+
+    def test_species_removed_targets(self):
+        player = Player(1, species=[Species(food=0, population=2, traits=[Trait.CARNIVORE])])
+        other = Player(2, species=[Species(), Species()])
+        engine = FeedingEngine()
+
+        self.assertEqual(len(engine.candidates(player, [other], 5).carnivore), 2)
+
+        other.species.pop()
+        self.assertEqual(engine.candidates(player, [other], 5).carnivore, [CarnivoreFeeding(0, 0, 0)])
+
+    def test_feeding_step_same_as_full(self):
+        rng = random.Random(4500)
+
+        for _ in range(50):
+            configuration = random_configuration(rng)
+
+            full = Dealer.deserialize(configuration)
+            full.incremental_feeding = False
+            full.feeding_step()
+
+            incremental = Dealer.deserialize(configuration)
+            incremental.feeding_step()
+
+            self.assertEqual(incremental.serialize(), full.serialize())
+
+    def test_feeding_step_same_requests(self):
+        rng = random.Random(4501)
+
+        for _ in range(10):
+            configuration = random_configuration(rng)
+            requests = []
+
+            for incremental_feeding in [False, True]:
+                dealer = Dealer.deserialize(configuration)
+                dealer.incremental_feeding = incremental_feeding
+                externals = []
+                for player in dealer.players:
+                    player.external = StrategyPlayer(player.idx)
+                    player.external.feed_next = MagicMock(side_effect=player.external.feed_next)
+                    externals.append(player.external)
+
+                dealer.feeding_step()
+                requests.append([external.feed_next.call_args_list for external in externals])
+
+            self.assertEqual(requests[0], requests[1])
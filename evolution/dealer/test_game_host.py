@@ -0,0 +1,145 @@
+import asyncio
+import json
+import socket
+
+from threading import Thread
+from unittest import TestCase
+
+from .game_host import GameHost, Lobby
+from .remote_dealer import RemoteDealer
+from ..common.instrumentation import Instrumentation
+from ..player.dummy_player import DummyPlayer
+from ..player.remote_player import RemotePlayer
+
+
+class LobbyTestCase(TestCase):
+
+    def test_add_take(self):
+        lobby = Lobby(3, 4)
+
+        self.assertIsNone(lobby.add(1))
+        self.assertIsNone(lobby.add(2))
+        self.assertFalse(lobby.ready())
+        self.assertIsNone(lobby.add(3))
+        self.assertTrue(lobby.ready())
+        self.assertEqual(lobby.add(4), [1, 2, 3, 4])
+        self.assertFalse(lobby.ready())
+
+        lobby.add(5)
+        self.assertEqual(lobby.take(), [5])
+        self.assertEqual(lobby.waiting, [])
+
+
+class GameHostTestCase(TestCase):
+
+    @staticmethod
+    def client(port, hello):
+        s = socket.create_connection(("127.0.0.1", port))
+        s.settimeout(GameHost.TIMEOUT)
+        dealer = RemoteDealer(s, DummyPlayer())
+        dealer.send(hello)
+        assert dealer.receive() == GameHost.OKAY_MESSAGE
+        dealer.main()
+        s.close()
+
+    def test_concurrent_games(self):
+        games = 3
+        players_per_game = [3, 8, 5]
+        results = {}
+
+        game_host = GameHost("127.0.0.1", 0, countdown_time=0.5)
+        game_host.bind()
+
+        async def serve():
+            server = asyncio.ensure_future(game_host.serve())
+            for game, n in enumerate(players_per_game):
+                for i in range(n):
+                    Thread(target=self.client, args=(game_host.port, "g{}p{}".format(game, i)), daemon=True).start()
+                # wait for the countdown to start the game before the next group connects
+                while game_host.games_started <= game:
+                    await asyncio.sleep(0.05)
+            while len(results) < games:
+                await asyncio.sleep(0.05)
+            server.cancel()
+
+        def on_result(game_id, ranking):
+            results[game_id] = ranking
+
+        game_host.on_result = on_result
+        asyncio.run(asyncio.wait_for(serve(), 60))
+
+        self.assertEqual(sorted(results), [1, 2, 3])
+        for game, n in enumerate(players_per_game):
+            ranking = results[game + 1]
+            self.assertEqual(len(ranking), n)
+            self.assertEqual(sorted(info for info, _, _ in ranking), sorted("g{}p{}".format(game, i) for i in range(n)))
+
+    def test_stats(self):
+        results = {}
+        game_host = GameHost("127.0.0.1", 0, countdown_time=0.5, on_result=results.__setitem__,
+                             instrumentation=Instrumentation(), stats_port=0)
+        game_host.bind()
+
+        async def serve():
+            server = asyncio.ensure_future(game_host.serve())
+            for i in range(3):
+                Thread(target=self.client, args=(game_host.port, "p{}".format(i)), daemon=True).start()
+            while not results:
+                await asyncio.sleep(0.05)
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", game_host.stats_port)
+            writer.write(b"GET / HTTP/1.0\r\n\r\n")
+            response = await reader.read()
+            writer.close()
+            server.cancel()
+            return response
+
+        response = asyncio.run(asyncio.wait_for(serve(), 60))
+        header, body = response.split(b"\r\n\r\n", 1)
+        self.assertTrue(header.startswith(b"HTTP/1.0 200"))
+
+        stats = json.loads(body.decode("utf-8"))
+        self.assertEqual(stats["games"], 1)
+        self.assertGreater(stats["timings"]["step1"]["count"], 0)
+        self.assertEqual(stats["timings"]["external_player_call.start"]["count"],
+                         3 * stats["timings"]["step1"]["count"])
+        self.assertEqual(stats["players"], {})
+        self.assertGreater(stats["traffic"]["all"]["bytes_sent"], 0)
+        self.assertGreater(stats["traffic"]["all"]["messages_received"], 0)
+
+    def test_sign_up_invalid(self):
+        game_host = GameHost("127.0.0.1", 0)
+        game_host.bind()
+
+        async def serve():
+            server = asyncio.ensure_future(game_host.serve())
+            loop = asyncio.get_running_loop()
+            responses = []
+            for hello in [b"[1, 2]", b'["name", ["x"]]', b'["name", {"binary": 1}]']:
+                s = socket.create_connection(("127.0.0.1", game_host.port))
+                s.setblocking(False)
+                await loop.sock_sendall(s, hello)
+                responses.append(await asyncio.wait_for(loop.sock_recv(s, 10), 5))
+                s.close()
+            server.cancel()
+            return responses
+
+        self.assertEqual(asyncio.run(serve()), [b"", b"", b""])
+        self.assertEqual(game_host.lobby.waiting, [])
+
+    def test_play_error(self):
+        errors = []
+        game_host = GameHost("127.0.0.1", 0, on_result=self.fail, on_error=lambda *error: errors.append(error))
+
+        def run_game(players, instrumentation):
+            raise ValueError("dealer failed")
+
+        game_host.run_game = run_game
+        sockets = [socket.socketpair() for _ in range(3)]
+        players = [("p{}".format(i), RemotePlayer(s)) for i, (s, _) in enumerate(sockets)]
+        asyncio.run(game_host.play(1, players))
+
+        self.assertEqual([(game_id, str(error)) for game_id, error in errors], [(1, "dealer failed")])
+        for s, other in sockets:
+            self.assertEqual(s.fileno(), -1)
+            other.close()
@@ -0,0 +1,88 @@
+import asyncio
+import socket
+
+from threading import Thread
+from unittest import TestCase
+
+from .game_host import GameHost
+from .persistent_client import PersistentClient
+from ..player.dummy_player import DummyPlayer
+
+
+def free_port():
+    """ Returns a port that nothing listens on """
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    s.bind(("127.0.0.1", 0))
+    port = s.getsockname()[1]
+    s.close()
+    return port
+
+
+def start(clients):
+    """ Runs every given client in its own thread
+    :return: list of threads
+    """
+    threads = [Thread(target=client.run, daemon=True) for client in clients]
+    for thread in threads:
+        thread.start()
+    return threads
+
+
+def serve(game_host, threads, timeout=60):
+    """ Runs the given game host until all given client threads are done
+    :return: dictionary from game id to results
+    """
+    results = {}
+    game_host.on_result = lambda game_id, ranking: results.__setitem__(game_id, ranking)
+
+    async def serve_clients():
+        server = asyncio.ensure_future(game_host.serve())
+        while any(thread.is_alive() for thread in threads):
+            await asyncio.sleep(0.05)
+        server.cancel()
+
+    asyncio.run(asyncio.wait_for(serve_clients(), timeout))
+    return results
+
+
+class PersistentClientTestCase(TestCase):
+
+    def test_consecutive_games(self):
+        game_host = GameHost("127.0.0.1", 0, countdown_time=0.2)
+        game_host.bind()
+        players = [DummyPlayer() for _ in range(3)]
+        clients = [PersistentClient("127.0.0.1", game_host.port, player, "p{}".format(i), max_games=3,
+                                    binary=i == 0, delta=i < 2)
+                   for i, player in enumerate(players)]
+
+        results = serve(game_host, start(clients))
+
+        self.assertEqual(sorted(results), [1, 2, 3])
+        for ranking in results.values():
+            self.assertEqual(sorted(info for info, _, _ in ranking), ["p0", "p1", "p2"])
+        for client in clients:
+            self.assertEqual(client.games_played, 3)
+            self.assertEqual(client.connections, 1)
+
+    def test_reconnect_with_backoff(self):
+        port = free_port()
+        clients = [PersistentClient("127.0.0.1", port, DummyPlayer(), "p{}".format(i), max_games=1,
+                                    initial_backoff=0.05, max_backoff=0.2)
+                   for i in range(3)]
+        threads = start(clients)
+
+        # the clients retry until the server is up
+        threads[0].join(0.3)
+        game_host = GameHost("127.0.0.1", port, countdown_time=0.2)
+        game_host.bind()
+
+        results = serve(game_host, threads)
+        self.assertEqual(len(results), 1)
+        self.assertEqual([client.games_played for client in clients], [1, 1, 1])
+        self.assertTrue(all(client.connections == 1 for client in clients))
+
+    def test_max_attempts(self):
+        client = PersistentClient("127.0.0.1", free_port(), DummyPlayer(), "p", max_attempts=3,
+                                  initial_backoff=0.01)
+        self.assertEqual(client.run(), 0)
+        self.assertEqual(client.connections, 0)
@@ -91,3 +91,14 @@ class RemoteDealerTestCase(TestCase):
         self.assertFalse(player.feed_next.called)
         rd.feed_next(message)
         player.feed_next.assert_called_once_with(player_state, players, watering_hole)
+
+    def test_main_game_over(self):
+
+        rd = RemoteDealer(self.sock, MagicMock())
+        rd.process_message = MagicMock()
+        rd.receive_iterator = MagicMock(return_value=iter([[1, 2], RemoteDealer.GAME_OVER_MESSAGE, [3, 4]]))
+        self.assertTrue(rd.main())
+        rd.process_message.assert_called_once_with([1, 2])
+
+        rd.receive_iterator = MagicMock(return_value=iter([[1, 2]]))
+        self.assertFalse(rd.main())
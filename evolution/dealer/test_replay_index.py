@@ -0,0 +1,95 @@
+import os
+import tempfile
+
+from unittest import TestCase
+
+from .dealer import Dealer
+from .event_log import EventRecorder
+from .replay_index import ReplayIndex, INDEX_SUFFIX
+from ..data_definitions import DataDefinitions
+from ..player.dummy_player import DummyPlayer
+
+
+class TurnStates:
+    """ Stands in for a CheckpointWriter, keeping the Configuration of the dealer at every turn boundary """
+
+    def __init__(self):
+        self.states = {}
+
+    def save(self, dealer):
+        self.states[dealer.turn] = dealer.serialize()
+
+
+def record_games(path, player_counts, snapshot_every):
+    """ Plays and records one game of dummy players per given number of players
+    :return: list of dictionaries from turn to the Configuration of the game at that turn boundary
+    """
+    games = []
+    with EventRecorder.open(path, snapshot_every=snapshot_every) as recorder:
+        for players in player_counts:
+            dealer = Dealer()
+            dealer.add_external_players([DummyPlayer() for _ in range(players)])
+            dealer.recorder = recorder
+            states = TurnStates()
+            dealer.run_game(states)
+            games.append(states.states)
+    return games
+
+
+class ReplayIndexTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.evlog")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_dealer_at_every_turn(self):
+        for snapshot_every in [0, 1, 2, 3]:
+            games = record_games(self.path, [3, 5, 8, 4], snapshot_every)
+            with ReplayIndex(self.path) as index:
+                self.assertEqual(index.games(), 4)
+                for game, states in enumerate(games):
+                    self.assertEqual(index.turns(game), [0] + sorted(states))
+                    for turn in states:
+                        dealer = index.dealer_at(game, turn)
+                        self.assertEqual(dealer.serialize(), states[turn])
+                        self.assertEqual(dealer.turn, turn)
+            os.remove(self.path)
+
+    def test_start_of_game(self):
+        record_games(self.path, [4], 2)
+        with ReplayIndex(self.path) as index:
+            dealer = index.dealer_at(0, 0)
+        self.assertEqual([len(player.species) for player in dealer.players], [0, 0, 0, 0])
+        self.assertEqual(dealer.deck.cards, sorted(DataDefinitions.deck()))
+
+    def test_missing_turn(self):
+        games = record_games(self.path, [3], 2)
+        with ReplayIndex(self.path) as index:
+            with self.assertRaises(KeyError):
+                index.dealer_at(0, len(games[0]) + 1)
+            with self.assertRaises(KeyError):
+                index.dealer_at(1, 0)
+            with self.assertRaises(KeyError):
+                index.turns(1)
+
+    def test_appended_games_are_indexed(self):
+        record_games(self.path, [3], 2)
+        with ReplayIndex(self.path) as index:
+            self.assertEqual(index.games(), 1)
+
+        games = record_games(self.path, [6], 2)
+        with ReplayIndex(self.path) as index:
+            self.assertEqual(index.games(), 2)
+            self.assertEqual(index.dealer_at(1, 1).serialize(), games[0][1])
+
+    def test_index_file_reused(self):
+        record_games(self.path, [3], 2)
+        ReplayIndex(self.path).close()
+        modified = os.path.getmtime(self.path + INDEX_SUFFIX)
+        os.utime(self.path + INDEX_SUFFIX, (modified - 100, modified - 100))
+
+        ReplayIndex(self.path).close()
+        self.assertEqual(os.path.getmtime(self.path + INDEX_SUFFIX), modified - 100)
@@ -5,8 +5,8 @@
 
 """
 
+from ..common.attackability import AttackabilityIndex
 from ..common.species import Species
-from ..common.trait import Trait
 from ..common.feeding_outcome import CarnivoreFeeding, VegetarianFeeding, FatTissueFeeding
 
 
@@ -64,7 +64,7 @@ class BasePlayer:
         :return: all hungry carnivores belonging to this player
         """
         hungry_species = self.get_hungry_species()
-        return [species for species in hungry_species if species.has_trait(Trait.CARNIVORE)]
+        return [species for species in hungry_species if species.is_carnivore()]
 
     def get_species_index(self, species):
         """ Returns the index of the given species in the list of this player's species.
@@ -76,6 +76,50 @@ class BasePlayer:
             if s is species:
                 return index
 
+    def can_feed_vegetarian(self, species_index):
+        """ Determines whether the species at the given index can be fed as a vegetarian, without enumerating the
+          possible vegetarian feedings.
+        :param species_index: index of the species in this player's list of species
+        :return: true if the species exists, is not a carnivore and is hungry, else false
+        """
+        if not 0 <= species_index < len(self.species):
+            return False
+        species = self.species[species_index]
+        return not species.is_carnivore() and species.is_hungry()
+
+    def can_store_fat_food(self, species_index, food_tokens, watering_hole):
+        """ Determines whether the species at the given index can store the given number of food tokens on its
+          fat tissue, without enumerating the possible fat tissue feedings.
+        :param species_index: index of the species in this player's list of species
+        :param food_tokens: number of food tokens to store
+        :param watering_hole: number of tokens remaining in the watering hole
+        :return: true if the species exists, has fat tissue and room for the tokens, which are at least one and
+                 at most the watering hole, else false
+        """
+        if not 0 <= species_index < len(self.species):
+            return False
+        species = self.species[species_index]
+        return (species.can_store_fat_food() and
+                1 <= food_tokens <= min(watering_hole, species.body - species.fat_food))
+
+    def can_attack(self, species_index, defender, defender_index):
+        """ Determines whether the species at the given index can attack the given species of the given player,
+          looking only at the carnivore, the defending species and its neighbors.
+        :param species_index: index of the attacking species in this player's list of species
+        :param defender: BasePlayer owning the defending species, may be this player
+        :param defender_index: index of the defending species in the defender's list of species
+        :return: true if the attacker exists and is a hungry carnivore, and the defending species exists, is not the
+                 attacker and is attackable by it, else false
+        """
+        if not (0 <= species_index < len(self.species) and 0 <= defender_index < len(defender.species)):
+            return False
+        carnivore = self.species[species_index]
+        target = defender.species[defender_index]
+        if not (carnivore.is_carnivore() and carnivore.is_hungry()) or target is carnivore:
+            return False
+        left, right = defender.get_neighbors(defender_index)
+        return target.is_attackable(carnivore, left=left, right=right)
+
     def get_possible_vegetarian_feedings(self):
         """ Returns all possible vegetarian feeding outcomes for this player
         :return: list of all possible vegetarian feedings
@@ -104,21 +148,25 @@ class BasePlayer:
 
         return feedings
 
-    def get_possible_carnivore_feedings(self, players):
+    def get_possible_carnivore_feedings(self, players, attackability=None):
         """ Returns all possible feeding outcomes from this player's species attacking any of the given player's
             species.
         :param players: list of other players in the game
+        :param attackability: AttackabilityIndex shared by the enumerations of a feeding step, a new one is used
+                              if not given
         :return: list of all possible carnivore feedings
         """
+        attackability = attackability if attackability is not None else AttackabilityIndex()
+        boards = [AttackabilityIndex.board_signature(player.species) for player in players]
 
         feedings = []
-        hungry_carnivores = self.get_hungry_carnivores()
-        for carnivore in hungry_carnivores:
-            carnivore_index = self.get_species_index(carnivore)
+        for carnivore_index, carnivore in enumerate(self.species):
+            if not (carnivore.is_carnivore() and carnivore.is_hungry()):
+                continue
             for player_index, player in enumerate(players):
-                for target in player.get_attackable_species(carnivore):
-                    target_index = player.get_species_index(target)
-                    feedings.append(CarnivoreFeeding(carnivore_index, player_index, target_index))
+                for target_index in attackability.attackable_indices(carnivore, player.species, boards[player_index]):
+                    if player.species[target_index] is not carnivore:
+                        feedings.append(CarnivoreFeeding(carnivore_index, player_index, target_index))
 
         return feedings
 
@@ -0,0 +1,96 @@
+"""
+    Implements the dummy strategy for the FastDealer. The choices are exactly those of the DummyPlayer, made by
+    reading the arrays of the FastDealer instead of deserializing the state of the game.
+
+"""
+
+from .fast_player import FastPlayer
+
+
+def first_max(positions, key):
+    """ Returns the first of the given positions with the largest key, same as ordering the species by the key from
+      largest to smallest and taking the first one
+    :param positions: nonempty list of species positions
+    :param key: function returning the key of a position
+    :return: position
+    """
+    best, best_key = None, None
+    for position in positions:
+        position_key = key(position)
+        if best is None or position_key > best_key:
+            best, best_key = position, position_key
+    return best
+
+
+class FastDummyPlayer(FastPlayer):
+    """ Represents a FastPlayer with the dummy strategy, see DummyPlayer. """
+
+    def choose(self, dealer, seat):
+        """ Chooses the actions in the same way as DummyPlayer.choose """
+        hand = dealer.hands[seat]
+        indices_in_order = [index for index, _ in sorted(enumerate(hand), key=lambda index_card: index_card[1])]
+
+        discard = indices_in_order.pop(0)
+        gp, gb, bt, rt = [], [], [], []
+
+        bt.append([indices_in_order.pop(0), indices_in_order.pop(0)])
+
+        new_species_index = dealer.count[seat]
+        if indices_in_order:
+            gp.append(["population", new_species_index, indices_in_order.pop(0)])
+        if indices_in_order:
+            gb.append(["body", new_species_index, indices_in_order.pop(0)])
+        if indices_in_order:
+            rt.append([new_species_index, 0, indices_in_order.pop(0)])
+
+        return [discard, gp, gb, bt, rt]
+
+    def feed_next(self, dealer, seat, others, watering_hole):
+        """ Chooses the feeding in the same way as DummyPlayer.feed_next """
+        positions = dealer.species_positions(seat)
+
+        fat_tissue_species = [p for p in positions if dealer.can_store_fat_food(p)]
+        hungry_vegetarians = [p for p in positions if dealer.is_hungry(p) and not dealer.is_carnivore(p)]
+        hungry_carnivores = [p for p in positions if dealer.is_hungry(p) and dealer.is_carnivore(p)]
+
+        if fat_tissue_species:
+            return self.feed_fat_tissue(dealer, seat, fat_tissue_species, watering_hole)
+        if hungry_vegetarians:
+            return dealer.leftmost_equal_index(seat, first_max(hungry_vegetarians, dealer.species_key))
+
+        can_attack_others = [p for p in hungry_carnivores
+                             if any(dealer.attackable_indices(p, other) for other in others)]
+        if can_attack_others:
+            return self.feed_carnivore(dealer, seat, can_attack_others, others)
+        if any(dealer.attackable_indices(p, seat) for p in hungry_carnivores):
+            return False
+        return None
+
+    @staticmethod
+    def feed_fat_tissue(dealer, seat, fat_tissue_species, watering_hole):
+        """ Feeds the species with the largest fat tissue need, see DummyPlayer.feed_fat_tissue """
+        def fat_need(position):
+            return dealer.body[position] - dealer.fat_food[position]
+
+        max_need = max(fat_need(p) for p in fat_tissue_species)
+        species_to_feed = first_max([p for p in fat_tissue_species if fat_need(p) == max_need], dealer.species_key)
+        return [dealer.leftmost_equal_index(seat, species_to_feed), min(watering_hole, fat_need(species_to_feed))]
+
+    @staticmethod
+    def feed_carnivore(dealer, seat, hungry_carnivores, others):
+        """ Feeds the largest carnivore by attacking the largest species it can attack, see
+          DummyPlayer.feed_carnivore
+        """
+        attacker = first_max(hungry_carnivores, dealer.species_key)
+
+        largest = None
+        for player_index, other in enumerate(others):
+            targets = [dealer.start[other] + index for index in dealer.attackable_indices(attacker, other)]
+            if targets:
+                target = first_max(targets, dealer.species_key)
+                if largest is None or dealer.species_key(target) > dealer.species_key(largest[1]):
+                    largest = player_index, target
+
+        player_index, target = largest
+        return [dealer.leftmost_equal_index(seat, attacker), player_index,
+                dealer.leftmost_equal_index(others[player_index], target)]
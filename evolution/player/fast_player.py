@@ -0,0 +1,36 @@
+"""
+
+    Describes the interface for a player of the FastDealer.
+
+    A FastPlayer does not receive JSON messages, it reads the state of the game from the arrays of the FastDealer:
+    the species of a seat are at the positions dealer.species_positions(seat) and its cards are dealer.hands[seat].
+
+"""
+
+
+class FastPlayer:
+
+    def start(self, dealer, seat):
+        """ Called at the beginning of a turn, after the player received its species and cards.
+        :param dealer: FastDealer
+        :param seat: seat of the player
+        """
+        pass
+
+    def choose(self, dealer, seat):
+        """ Determines the actions to perform with the player's cards.
+        :param dealer: FastDealer
+        :param seat: seat of the player
+        :return: Action4 representing the player's chosen actions with their cards
+        """
+        raise NotImplementedError("A fast player must implement this method.")
+
+    def feed_next(self, dealer, seat, others, watering_hole):
+        """ Determines a feeding outcome when it cannot be determined automatically.
+        :param dealer: FastDealer
+        :param seat: seat of the player
+        :param others: seats of the other players, starting with the player after this one
+        :param watering_hole: integer representing the number of food tokens left in the watering hole
+        :returns: Feeding representing the player's feeding choice
+        """
+        raise NotImplementedError("A fast player must implement this method.")
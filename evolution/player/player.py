@@ -7,11 +7,13 @@ from .dummy_player import DummyPlayer
 
 from ..data_definitions import DataDefinitions, unpack
 
+from ..common.attackability import AttackabilityIndex
 from ..common.feeding_outcome import CannotFeed, FeedingOutcome
 from ..common.species import Species
 from ..common.trait_card import TraitCard
 from ..common.actions import Actions
 from ..common.player_helpers import external_player_call, ExternalPlayerCall
+from ..common.remote_actor import RemoteActor
 
 
 class Player(BasePlayer):
@@ -38,6 +40,8 @@ class Player(BasePlayer):
         self.bag = bag if bag is not None else self.DEFAULT_FOOD_BAG_VALUE
         self.cards = cards.copy() if cards is not None else []
         self.external = external if external is not None else DummyPlayer()
+        # Instrumentation timing the calls to the external player, or None, see instrument
+        self.instrumentation = None
 
     def __repr__(self):
         species = "[{}]".format(", ".join([repr(species) for species in self.species]))
@@ -50,6 +54,25 @@ class Player(BasePlayer):
     def __str__(self):
         return self.__repr__()
 
+    def instrument(self, instrumentation):
+        """ Records the durations of the calls to the external player and, for a remote player, its traffic in the
+          given Instrumentation
+        :param instrumentation: Instrumentation, or None to stop recording
+        """
+        self.instrumentation = instrumentation
+        if isinstance(self.external, RemoteActor):
+            self.external.traffic = instrumentation.traffic_of(self.idx) if instrumentation is not None else None
+
+    def external_call(self, method):
+        """ Returns the ExternalPlayerCall limiting a call to the given method of the external player
+        :param method: name of the method
+        :return: ExternalPlayerCall
+        """
+        # a remote player is only blocked on its socket, which is shut down rather than interrupting the thread
+        interrupt = self.external.interrupt if isinstance(self.external, RemoteActor) else None
+        return ExternalPlayerCall(instrumentation=self.instrumentation, player=self.idx, method=method,
+                                  interrupt=interrupt)
+
     def score(self):
         """ Returns the current score of the player, which is calculated as follows:
           score = bag + sum(population of existing species) + sum(trait cards for each species)
@@ -83,7 +106,7 @@ class Player(BasePlayer):
             self.species.append(Species())
         self.add_cards(cards)
 
-        with ExternalPlayerCall():
+        with self.external_call("start"):
             self.external.start(watering_hole, self.to_player_state())
 
     def end_turn(self):
@@ -121,64 +144,51 @@ class Player(BasePlayer):
         before = [[s.serialize() for s in p.species] for p in players[:self_index]]
         after = [[s.serialize() for s in p.species] for p in players[self_index + 1:]]
 
-        with ExternalPlayerCall():
-            action4 = self.external.choose(before, after)
-            assert DataDefinitions.action4(action4), "invalid action4 returned by external player"
-            return Actions.deserialize(action4)
+        with self.external_call("choose"):
+            actions = Actions.parse(self.external.choose(before, after), self)
+            assert actions is not None, "invalid action4 returned by external player"
+            return actions
 
     @external_player_call()
-    def feeding_choice(self, players, watering_hole):
+    def feeding_choice(self, players, watering_hole, attackability=None):
         """ Determines the next feeding choice for the player automatically if possible, or asks the player
-          to make the choice. The possible outcomes are:
-            * the player cannot feed any more species
-            * it will automatically feed
-                -- a single species with a non-full fat-food trait card (to the max possible)
-                -- a single vegetarian
-                -- a single carnivore that can attack only one species from a different player
-                    (no self-attack is allowed).
-            * there is more than one possibility and the player is asked to make a feeding choice
+          to make the choice, see FeedingCandidates.automatic_feeding for the choices made automatically.
         :param players: other players in the game
         :param watering_hole: number of food tokens left in the watering hole
+        :param attackability: AttackabilityIndex of the current feeding step, a new one is used if not given
         :return: the next feeding choice for the player
         :raise: ExternalPlayerIssue
         """
-        hungry_species = self.get_hungry_species()
-        possible_vegetarian_feedings = self.get_possible_vegetarian_feedings()
-        possible_fat_tissue_feedings = self.get_possible_fat_tissue_feedings(watering_hole)
-        # list of hungry carnivores that have at least one valid target among any player's species
-        possible_carnivore_feedings = self.get_possible_carnivore_feedings(players + [self])
-        possible_carnivore_feedings_others = self.get_possible_carnivore_feedings(players)
-
-        # there are no possible feedings if:
-        # * there are no hungry species and no species that can store more fat tokens
-        # * all hungry species are carnivores that have no targets and there are no species that can store more fat
-        no_feedable_species = ((not hungry_species) or
-                               (not possible_vegetarian_feedings and not possible_carnivore_feedings))
-        if no_feedable_species and not possible_fat_tissue_feedings:
-            return CannotFeed()
-
-        # a single species with a non-full fat-food trait card
-        if (len(possible_fat_tissue_feedings) == 1 and
-                not possible_vegetarian_feedings and not possible_carnivore_feedings):
-            return possible_fat_tissue_feedings[0]
-
-        # a single vegetarian
-        if (len(possible_vegetarian_feedings) == 1 and
-                not possible_fat_tissue_feedings and not possible_carnivore_feedings):
-            return possible_vegetarian_feedings[0]
-
-        # a single carnivore
-        if (len(possible_carnivore_feedings_others) == 1 and len(possible_carnivore_feedings) == 1 and
-                not possible_fat_tissue_feedings and not possible_vegetarian_feedings):
-            return possible_carnivore_feedings[0]
-
-        # there is more than one feeding possibility
-        players = [[s.serialize() for s in p.species] for p in players]
-
-        with ExternalPlayerCall():
-            feeding_outcome = self.external.feed_next(self.to_player_state(), players, watering_hole)
-            assert DataDefinitions.feeding_outcome(feeding_outcome), "invalid feeding returned by external player"
-            return FeedingOutcome.deserialize(feeding_outcome)
+        attackability = attackability if attackability is not None else AttackabilityIndex()
+        candidates = FeedingCandidates(
+            hungry=bool(self.get_hungry_species()),
+            vegetarian=self.get_possible_vegetarian_feedings(),
+            fat_tissue=self.get_possible_fat_tissue_feedings(watering_hole),
+            carnivore=self.get_possible_carnivore_feedings(players + [self], attackability),
+            carnivore_others=self.get_possible_carnivore_feedings(players, attackability),
+        )
+
+        feeding = candidates.automatic_feeding()
+        if feeding is not None:
+            return feeding
+
+        opponents = [[s.serialize() for s in p.species] for p in players]
+        return self.request_feeding(self.to_player_state(), opponents, watering_hole, players)
+
+    def request_feeding(self, player_state, opponents, watering_hole, players):
+        """ Asks the external player to make the next feeding choice
+        :param player_state: PlayerState of this player
+        :param opponents: list of the other players' species, each a list of JSONSpecies
+        :param watering_hole: number of food tokens left in the watering hole
+        :param players: other players in the game, in order starting after this player
+        :return: valid FeedingOutcome chosen by the player
+        :raise: ExternalPlayerIssue
+        """
+        with self.external_call("feed_next"):
+            feeding = self.external.feed_next(player_state, opponents, watering_hole)
+            feeding_outcome = FeedingOutcome.parse(feeding, self, players, watering_hole)
+            assert feeding_outcome is not None, "invalid feeding returned by external player"
+            return feeding_outcome
 
     def feed_species(self, species_index, watering_hole):
         """ Feeds the species at the given index based on the number of tokens available in the watering hole,
@@ -312,3 +322,57 @@ class Player(BasePlayer):
             self.DATA_KEY_SPECIES: [s.display() for s in self.species],
             self.DATA_KEY_CARDS: [tc.display() for tc in self.cards],
         }
+
+
+class FeedingCandidates:
+    """ The possible feedings of a player at some point of the feeding step, from which the Player determines
+      whether the next feeding choice can be made automatically.
+    """
+
+    def __init__(self, hungry, vegetarian, fat_tissue, carnivore, carnivore_others):
+        """ Creates the feeding candidates of a player
+        :param hungry: true if the player has a hungry species
+        :param vegetarian: list of possible VegetarianFeedings
+        :param fat_tissue: list of possible optimal FatTissueFeedings
+        :param carnivore: list of possible CarnivoreFeedings on any player's species, including the player's own
+        :param carnivore_others: list of possible CarnivoreFeedings on the other players' species
+        """
+        self.hungry = hungry
+        self.vegetarian = vegetarian
+        self.fat_tissue = fat_tissue
+        self.carnivore = carnivore
+        self.carnivore_others = carnivore_others
+
+    def automatic_feeding(self):
+        """ Determines the feeding choice if it can be made automatically. The possible outcomes are:
+            * the player cannot feed any more species
+            * it will automatically feed
+                -- a single species with a non-full fat-food trait card (to the max possible)
+                -- a single vegetarian
+                -- a single carnivore that can attack only one species from a different player
+                    (no self-attack is allowed).
+            * there is more than one possibility and the player has to be asked to make a feeding choice
+        :return: FeedingOutcome or None if the player has to be asked
+        """
+        # there are no possible feedings if:
+        # * there are no hungry species and no species that can store more fat tokens
+        # * all hungry species are carnivores that have no targets and there are no species that can store more fat
+        no_feedable_species = (not self.hungry) or (not self.vegetarian and not self.carnivore)
+        if no_feedable_species and not self.fat_tissue:
+            return CannotFeed()
+
+        # a single species with a non-full fat-food trait card
+        if len(self.fat_tissue) == 1 and not self.vegetarian and not self.carnivore:
+            return self.fat_tissue[0]
+
+        # a single vegetarian
+        if len(self.vegetarian) == 1 and not self.fat_tissue and not self.carnivore:
+            return self.vegetarian[0]
+
+        # a single carnivore
+        if (len(self.carnivore_others) == 1 and len(self.carnivore) == 1 and
+                not self.fat_tissue and not self.vegetarian):
+            return self.carnivore[0]
+
+        # there is more than one feeding possibility
+        return None
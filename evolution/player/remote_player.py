@@ -4,23 +4,73 @@
 """
 
 
+from ..common.binary_protocol import START_FRAME, CHOOSE_FRAME, FEED_NEXT_FRAME, BINARY_ENCODING
+from ..common.delta_state import DELTA_UPDATES, diff_state
 from ..common.remote_actor import RemoteActor
 from .external_player import ExternalPlayer
 
 
 class RemotePlayer(ExternalPlayer, RemoteActor):
 
+    # options a player can ask for when signing up
+    OPTIONS = {BINARY_ENCODING, DELTA_UPDATES}
+
+    def __init__(self, socket):
+        """ Creates a new proxy for a remote player
+        :param socket: socket connection
+        """
+        super().__init__(socket)
+        # whether feed_next sends the changes to the last State instead of the full State, see delta_state
+        self.delta_updates = False
+        # last State the player responded to in the current turn
+        self.last_state = None
+
+    @classmethod
+    def parse_hello(cls, message):
+        """ Parses the sign-up message of a player, which is either its info message or, to ask for options such
+          as the binary encoding, [info message, option, ...]
+        :param message: first message received from the player
+        :return: (info message, set of options) tuple, or None if the message is not a sign-up message or asks
+                 for an unknown option
+        """
+        if isinstance(message, str):
+            return message, set()
+        if (isinstance(message, list) and len(message) >= 2 and isinstance(message[0], str) and
+                all(isinstance(option, str) and option in cls.OPTIONS for option in message[1:])):
+            return message[0], set(message[1:])
+        return None
+
+    def use_options(self, options):
+        """ Uses the given options from now on
+        :param options: set of options from parse_hello
+        """
+        if BINARY_ENCODING in options:
+            self.use_binary()
+        self.delta_updates = DELTA_UPDATES in options
+
     def start(self, watering_hole, player_state):
         species, bag, cards = player_state
         data = [watering_hole, bag, species, cards]
-        self.send(data)
+        self.last_state = None
+        self.send(data, kind=START_FRAME)
 
     def choose(self, preceding, following):
-        self.send([preceding, following])
+        self.send([preceding, following], kind=CHOOSE_FRAME)
         return self.receive()
 
     def feed_next(self, player_state, players, watering_hole):
         species, bag, cards = player_state
         data = [bag, species, cards, watering_hole, players]
-        self.send(data)
-        return self.receive()
+
+        delta = None
+        if self.delta_updates and self.last_state is not None:
+            delta = diff_state(self.last_state, data)
+        if delta is not None:
+            self.send(delta)
+        else:
+            self.send(data, kind=FEED_NEXT_FRAME)
+
+        response = self.receive()
+        if self.delta_updates:
+            self.last_state = data
+        return response
@@ -1,3 +1,5 @@
+import random
+
 from unittest import TestCase
 
 from .base_player import BasePlayer
@@ -5,6 +7,7 @@ from .base_player import BasePlayer
 from ..common.trait import Trait
 from ..common.species import Species
 from ..common.feeding_outcome import VegetarianFeeding, FatTissueFeeding, CarnivoreFeeding
+from ..random_states import random_board
 
 
 class GetPossibleFeedingsTestCase(TestCase):
@@ -108,3 +111,43 @@ class GetPossibleFeedingsTestCase(TestCase):
             CarnivoreFeeding(0, 0, 1),
         ]
         self.assertEqual(player.get_possible_carnivore_feedings(players), expected)
+
+
+class LegalityPredicatesTestCase(TestCase):
+    """ The legality predicates must agree with the enumerations of all possible feedings """
+
+    def test_can_feed_vegetarian(self):
+        rng = random.Random(18)
+        for _ in range(2000):
+            player = BasePlayer(species=random_board(rng, carnivores=0.3))
+            possible = player.get_possible_vegetarian_feedings()
+            for index in range(-1, len(player.species) + 1):
+                self.assertEqual(player.can_feed_vegetarian(index), VegetarianFeeding(index) in possible)
+
+    def test_can_store_fat_food(self):
+        rng = random.Random(18)
+        for _ in range(2000):
+            player = BasePlayer(species=random_board(rng, carnivores=0.3))
+            watering_hole = rng.randint(1, 10)
+            possible = player.get_possible_fat_tissue_feedings(watering_hole, include_suboptimal=True)
+            for index in range(-1, len(player.species) + 1):
+                for tokens in range(Species.MAXIMUM_BODY + 2):
+                    self.assertEqual(player.can_store_fat_food(index, tokens, watering_hole),
+                                     FatTissueFeeding(index, tokens) in possible)
+
+    def test_can_attack(self):
+        rng = random.Random(18)
+        attacks = 0
+        for _ in range(2000):
+            player = BasePlayer(species=random_board(rng, carnivores=0.3))
+            players = [BasePlayer(species=random_board(rng, carnivores=0.3))
+                       for _ in range(rng.randint(1, 4))] + [player]
+            possible = player.get_possible_carnivore_feedings(players)
+            for species_index in range(-1, len(player.species) + 1):
+                for player_index, defender in enumerate(players):
+                    for defender_index in range(-1, len(defender.species) + 1):
+                        feeding = CarnivoreFeeding(species_index, player_index, defender_index)
+                        self.assertEqual(player.can_attack(species_index, defender, defender_index),
+                                         feeding in possible)
+            attacks += len(possible)
+        self.assertGreater(attacks, 500)
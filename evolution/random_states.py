@@ -0,0 +1,95 @@
+"""
+
+    Builds random Evolution data from a given random.Random, for the property tests and the benchmarks, so that
+    they all draw their species, players, actions and configurations in the same way.
+
+"""
+
+from .common.species import Species
+from .common.trait import Trait
+from .data_definitions import DataDefinitions
+from .dealer.dealer import Dealer
+from .player.player import Player
+
+
+def random_species(rng, hungry=False, carnivores=0.0):
+    """ Returns a species with random food, body, population, traits and fat food
+    :param rng: random.Random
+    :param hungry: if true, the species has less food than population
+    :param carnivores: probability of adding the carnivore trait, if the species has a free trait slot
+    :return: Species
+    """
+    population = rng.randint(1, Species.MAXIMUM_POPULATION)
+    body = rng.randint(0, Species.MAXIMUM_BODY)
+    traits = rng.sample(list(Trait), rng.randint(0, Species.MAXIMUM_TRAITS))
+    if carnivores and rng.random() < carnivores and Trait.CARNIVORE not in traits \
+            and len(traits) < Species.MAXIMUM_TRAITS:
+        traits.append(Trait.CARNIVORE)
+    fat_food = rng.randint(0, body) if Trait.FAT_TISSUE in traits else None
+    return Species(food=rng.randint(0, population - 1 if hungry else population), body=body, population=population,
+                   traits=traits, fat_food=fat_food)
+
+
+def random_board(rng, species=4, carnivores=0.0):
+    """ Returns the random species boards of a player
+    :param rng: random.Random
+    :param species: maximum number of species
+    :param carnivores: probability of adding the carnivore trait to each species, see random_species
+    :return: [Species, ...]
+    """
+    return [random_species(rng, carnivores=carnivores) for _ in range(rng.randint(0, species))]
+
+
+def random_player(rng, species=3, cards=8):
+    """ Returns the player with id 1, with random species and a random hand
+    :param rng: random.Random
+    :param species: maximum number of species
+    :param cards: maximum number of cards, the player has at least one
+    :return: Player
+    """
+    return Player(1, species=random_board(rng, species),
+                  cards=rng.sample(DataDefinitions.deck(), rng.randint(1, cards)))
+
+
+def random_action4(rng, player):
+    """ Returns a random Action4 with indices mostly in range for the given player, sometimes malformed
+    :param rng: random.Random
+    :param player: Player choosing the actions
+    :return: JSON, mostly an Action4
+    """
+    def index(n):
+        return rng.choice([7, -1, True, "0"]) if rng.random() < 0.03 else rng.randrange(n + 1)
+
+    def card():
+        return index(len(player.cards))
+
+    def species():
+        return index(len(player.species) + 1)
+
+    def actions(make):
+        return [make() for _ in range(rng.choice([0, 0, 1, 1, 2]))]
+
+    action4 = [
+        card(),
+        actions(lambda: ["population", species(), card()]),
+        actions(lambda: ["body", species(), card()]),
+        actions(lambda: [card() for _ in range(rng.randint(1, 3))]),
+        actions(lambda: [species(), rng.randrange(Species.MAXIMUM_TRAITS + 1), card()]),
+    ]
+    if rng.random() < 0.05:
+        action4[rng.randrange(1, 5)].append(rng.choice([[], [0], ["body", 0], [0, 0, 0, 0], 0, None]))
+    if rng.random() < 0.02:
+        action4 = action4[:rng.randrange(5)]
+    return action4
+
+
+def random_configuration(rng, players=8, species=5, cards=0):
+    """ Returns a Configuration of players with random species and a random watering hole
+    :param rng: random.Random
+    :param players: number of players
+    :param species: maximum number of species of a player
+    :param cards: number of cards in the deck, the lowest cards
+    :return: Configuration
+    """
+    players = [Player(idx + 1, species=random_board(rng, species)) for idx in range(players)]
+    return Dealer(players, rng.randint(1, 40), sorted(DataDefinitions.deck())[:cards]).serialize()
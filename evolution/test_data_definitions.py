@@ -1,6 +1,11 @@
+import os
+import glob
+import json
+import random
+
 from unittest import TestCase
 
-from .data_definitions import DataDefinitions, unpack, irange
+from .data_definitions import DataDefinitions, unpack, irange, compile_record
 from .common.trait import Trait
 from .common.trait_card import TraitCard
 
@@ -193,6 +198,112 @@ class DataDefinitionsTestCase(TestCase):
             self.assertIs(expected, DataDefinitions.dealer(data), data)
 
 
+def interpreted(predicate):
+    """ Returns the given interpreted predicate, returning False for data it fails on with an exception """
+    def safe_predicate(value):
+        try:
+            return predicate(value)
+        except (ValueError, TypeError, IndexError):
+            return False
+    return safe_predicate
+
+
+def mutations(rng, value, n):
+    """ Yields n copies of the given JSON data with one random element replaced, removed or duplicated """
+    replacements = [None, -1, 0, 1, 8, True, False, "x", "carnivore", "food", [], [0], ["food", 1], [1, "carnivore"],
+                    [-9, "carnivore"], ["population", 0, 0], [[]]]
+    for _ in range(n):
+        mutated = json.loads(json.dumps(value))
+        parent = mutated
+        while True:
+            index = rng.randrange(len(parent))
+            if isinstance(parent[index], list) and parent[index] and rng.random() < 0.8:
+                parent = parent[index]
+                continue
+            operation = rng.randrange(3)
+            if operation == 0:
+                parent[index] = rng.choice(replacements)
+            elif operation == 1:
+                parent.pop(index)
+            else:
+                parent.insert(index, parent[index])
+            break
+        yield mutated
+
+
+class CompiledDefinitionsTestCase(TestCase):
+
+    HARNESSES = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..", "test_harnesses")
+
+    def inputs(self, harness):
+        for path in sorted(glob.glob(os.path.join(self.HARNESSES, harness, "*-in.json"))):
+            with open(path) as f:
+                yield json.load(f)
+
+    def assertSameAsInterpreted(self, compiled, interpreter, values):
+        interpreter = interpreted(interpreter)
+        for value in values:
+            self.assertIs(compiled(value), interpreter(value), value)
+
+    def test_dealer(self):
+        rng = random.Random(4503)
+        configurations = list(self.inputs("xstep_tests"))
+        self.assertTrue(all(DataDefinitions.dealer(c) for c in configurations))
+        for configuration in configurations:
+            self.assertSameAsInterpreted(DataDefinitions.dealer, DataDefinitions.interpret_dealer,
+                                         mutations(rng, configuration, 30))
+
+    def test_player_and_species(self):
+        rng = random.Random(4504)
+        for configuration in self.inputs("xstep_tests"):
+            for player in configuration[0]:
+                self.assertSameAsInterpreted(DataDefinitions.player, DataDefinitions.interpret_player,
+                                             [player] + list(mutations(rng, player, 10)))
+                for species in player[1][1]:
+                    self.assertSameAsInterpreted(DataDefinitions.species, DataDefinitions.interpret_species,
+                                                 [species] + list(mutations(rng, species, 5)))
+
+    def test_trait_card(self):
+        values = [[n, trait.value] for trait in Trait for n in range(-10, 11)] + \
+                 [[1, Trait.CARNIVORE], [True, "ambush"], [1.0, "ambush"], [1, "Ambush"], [1, ["ambush"]],
+                  [1], [1, "ambush", 1], "ab", None]
+        self.assertSameAsInterpreted(DataDefinitions.trait_card, DataDefinitions.interpret_trait_card, values)
+
+    def test_action4(self):
+        rng = random.Random(4505)
+        action4 = [1, [["population", 0, 2]], [["body", 1, 3]], [[4], [5, 6, 7]], [[1, 0, 8]]]
+        self.assertTrue(DataDefinitions.action4(action4))
+        self.assertSameAsInterpreted(DataDefinitions.action4, DataDefinitions.interpret_action4,
+                                     mutations(rng, action4, 500))
+
+    def test_compile_record(self):
+        config = [
+            ["test-key", "testkey", DataDefinitions.integer],
+            ["test-key-opt", "testkeyopt", DataDefinitions.integer, DataDefinitions.OPTIONAL],
+            ["test-key1", "testkey1", DataDefinitions.integer],
+        ]
+        predicate = compile_record(config)
+
+        def unpacks(data):
+            try:
+                unpack(config, data)
+                return True
+            except (AssertionError, ValueError, TypeError, IndexError):
+                return False
+
+        cases = [
+            [],
+            [["test-key", 1], ["test-key1", 2]],
+            [["test-key", 1], ["test-key-opt", 5], ["test-key1", 2]],
+            [["test-key", 1], ["test-key1", "2"]],
+            [["test-key1", 1], ["test-key", 2]],
+            [["test-key", 1], ["test-key1", 2], ["other", 3]],
+            [["test-key", 1], 5],
+        ]
+        for data in cases:
+            self.assertIs(predicate(data), unpacks(data), data)
+
+
 class IRangeTestCase(TestCase):
 
     def test_irange(self):
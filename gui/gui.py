@@ -16,6 +16,8 @@ class GUI:
 
     WINDOW_TITLE_DEALER = "Dealer"
     WINDOW_TITLE_PLAYER = "Player"
+    WINDOW_TITLE_REPLAY = "Replay of game {game}"
+    TURN_LABEL = "turn"
 
     WINDOW_WIDTH = 800
     WINDOW_HEIGHT = 800
@@ -195,6 +197,39 @@ class GUI:
         rendering = cls.render_player(data)
         cls.create_window(cls.WINDOW_TITLE_PLAYER, rendering)
 
+    @classmethod
+    def replay_window(cls, game, turns, dealer_data_at):
+        """ Creates a new window rendering the dealer state of a recorded game at the turn chosen with a slider
+        :param game: position of the game in its event log
+        :param turns: list of the turn boundaries of the game, in order
+        :param dealer_data_at: function from a turn to the dealer representation returned by the display method
+        """
+        root = Tk()
+        root.title(cls.WINDOW_TITLE_REPLAY.format(game=game))
+        root.geometry("{}x{}".format(cls.WINDOW_WIDTH, cls.WINDOW_HEIGHT))
+
+        text = Text(root, state="disabled", wrap="word")
+
+        def show_turn(position):
+            rendering = cls.render_dealer(dealer_data_at(turns[int(position)]))
+            text.configure(state="normal")
+            text.delete("1.0", END)
+            text.insert(INSERT, rendering)
+            text.configure(state="disabled")
+
+        scale = Scale(root, from_=0, to=len(turns) - 1, orient="horizontal", label=cls.TURN_LABEL,
+                      command=show_turn)
+        scale.pack(side="top", fill="x")
+
+        vsb = Scrollbar(root, command=text.yview, orient="vertical")
+        vsb.pack(side="right", fill="y")
+
+        text.configure(yscrollcommand=vsb.set)
+        text.pack(expand=True, fill="both")
+
+        show_turn(0)
+        root.mainloop()
+
 
 def render_dealer(data):
     """ Opens a new window with a rendering of the dealer based on the given data
@@ -207,3 +242,12 @@ def render_player(data):
     :param data: player representation returned by the display method
     """
     GUI.player_window(data)
+
+
+def render_replay(game, turns, dealer_data_at):
+    """ Opens a new window to step through the turns of a recorded game
+    :param game: position of the game in its event log
+    :param turns: list of the turn boundaries of the game, in order
+    :param dealer_data_at: function from a turn to the dealer representation returned by the display method
+    """
+    GUI.replay_window(game, turns, dealer_data_at)
@@ -0,0 +1,26 @@
+import os
+import sys
+
+from argparse import ArgumentParser
+
+from gui import render_replay
+
+PROJECT_ROOT = os.path.join(os.path.dirname(os.path.realpath(__file__)), "..")
+sys.path.insert(0, PROJECT_ROOT)
+
+from evolution.dealer.replay_index import ReplayIndex
+
+
+def main(log_path, game):
+    with ReplayIndex(log_path) as index:
+        render_replay(game, index.turns(game), lambda turn: index.dealer_at(game, turn).display())
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser(description="Steps through the turns of a game recorded in an event log")
+    parser.add_argument("log", help="path of the event log")
+    parser.add_argument("game", type=int, nargs="?", default=0, help="position of the game in the log")
+    args = parser.parse_args()
+
+    main(args.log, args.game)
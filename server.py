@@ -1,21 +1,31 @@
 """
-    Launches an Evolution server, accepts remote players and simulates a complete evolution game.
+    Launches an Evolution server, accepts remote players and simulates evolution games.
+
+    By default the server keeps running and hosts many games at the same time, see GameHost.
+    With --single, the server simulates one complete game and exits:
 
     1. listen for connections
     2. until at least 3 and at most 8 or timeout:
-        1. accepts a single JSON string and sends back an ok message
+        1. accepts a single JSON string, or [string, option, ...] to use options such as the binary encoding, and
+           sends back an ok message
         2. creates a new proxy player with a connection from above ^
     3. create a dealer and hand it the proxy players
     4. start game
 
+    With --stats-port, the long-running server serves the instrumentation of all games it ran in JSON on the given
+    port; with --single and --stats, the instrumentation of the game is written to the given file once the game is
+    over, see evolution/common/instrumentation.py.
+
 """
 
+import asyncio
 import socket
 
-from time import sleep
 from argparse import ArgumentParser
 
+from evolution.common.instrumentation import Instrumentation
 from evolution.dealer.dealer import Dealer
+from evolution.dealer.game_host import GameHost
 from evolution.player.remote_player import RemotePlayer
 
 DEFAULT_HOST = "127.0.0.1"
@@ -30,11 +40,32 @@ TIMEOUT = 5
 COUNTDOWN_TIME = 5
 
 
-def main(host, port):
-    """ Connects to an Evolution server on the given host/port, performs the sign up sequence and
-      then continuously listens for messages from the server and responds accordingly.
+def main(host, port, stats_port=None):
+    """ Launches a game host on the given host/port that signs up remote players and runs games for them
+      until the process is interrupted.
+    :param host: evolution host
+    :param port: evolution port
+    :param stats_port: port on which the instrumentation of the games is served, or None
+    """
+    instrumentation = Instrumentation() if stats_port is not None else None
+    game_host = GameHost(host, port, countdown_time=COUNTDOWN_TIME, instrumentation=instrumentation,
+                         stats_port=stats_port)
+    game_host.bind()
+    print("Waiting for players to join on {}:{}...".format(host, game_host.port))
+    if stats_port is not None:
+        print("Serving the instrumentation of the games on {}:{}".format(host, stats_port))
+
+    try:
+        asyncio.run(game_host.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+def main_single(host, port, stats_path=None):
+    """ Accepts remote players on the given host/port, simulates a single game and prints the results.
     :param host: evolution host
     :param port: evolution port
+    :param stats_path: file to which the instrumentation of the game is written, or None
     """
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
@@ -43,7 +74,7 @@ def main(host, port):
     players = accept_players(s)
 
     print("Starting game with {} players\n".format(len(players)))
-    start_game(players)
+    start_game(players, stats_path)
 
 
 def accept_players(s):
@@ -86,11 +117,13 @@ def accept_player(s):
     remote_player = RemotePlayer(client_socket)
 
     try:
-        hello_message = remote_player.receive()
-        if isinstance(hello_message, str):
+        hello = RemotePlayer.parse_hello(remote_player.receive())
+        if hello is not None:
+            info_message, options = hello
+            remote_player.use_options(options)
             remote_player.send(OKAY_MESSAGE)
-            print("New player joined, saying: {}".format(hello_message))
-            return (hello_message, remote_player)
+            print("New player joined, saying: {}".format(info_message))
+            return (info_message, remote_player)
 
     except socket.timeout:
         pass
@@ -98,15 +131,20 @@ def accept_player(s):
     return accept_player(s)
 
 
-def start_game(players):
+def start_game(players, stats_path=None):
     """ Starts the game with the given list of remote players. After the game finishes prints the results.
     :param players: list of (info message, remote player) tuples to start the game with
+    :param stats_path: file to which the instrumentation of the game is written, or None
     """
     remote_players = [player for info_message, player in players]
 
     dealer = Dealer()
     player_ids = dealer.add_external_players(remote_players)
+    if stats_path is not None:
+        dealer.instrument(Instrumentation())
     dealer.run_game()
+    if stats_path is not None:
+        dealer.instrumentation.dump(stats_path)
 
     id_player_map = {idx: player for idx, player in zip(player_ids, players)}
 
@@ -121,10 +159,16 @@ def parse_args():
     parser = ArgumentParser(description="Launches a new Evolution server, bound to the given host and port")
     parser.add_argument("-i", "--host", help="server host to bind to", default=DEFAULT_HOST)
     parser.add_argument("-p", "--port", help="server port to bind to", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-s", "--single", help="run a single game and exit", action="store_true")
+    parser.add_argument("--stats-port", help="port serving the instrumentation of the games", type=int)
+    parser.add_argument("--stats", help="with --single, file to write the instrumentation of the game to")
 
     return parser.parse_args()
 
 
 if __name__ == "__main__":
     args = parse_args()
-    main(args.host, args.port)
+    if args.single:
+        main_single(args.host, args.port, args.stats)
+    else:
+        main(args.host, args.port, args.stats_port)
@@ -32,6 +32,7 @@ class SequentialParallelTestCase(TestCase):
         # parallel
         s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         s.bind((host, 0))
+        s.listen(players)
         port = s.getsockname()[1]
 
         for i in range(players):
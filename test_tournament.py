@@ -0,0 +1,100 @@
+import os
+import json
+import tempfile
+
+from io import StringIO
+from unittest import TestCase
+
+from evolution.dealer.checkpoint import CheckpointWriter
+from evolution.dealer.dealer import Dealer
+from evolution.dealer.deck import Deck
+from evolution.data_definitions import DataDefinitions
+from evolution.player.dummy_player import DummyPlayer
+from tournament import get_factory, seatings, play_game, run_tournament, read_results, TournamentStatistics
+
+
+class TournamentTestCase(TestCase):
+
+    def test_get_factory(self):
+        self.assertIs(get_factory("dummy"), DummyPlayer)
+        self.assertIs(get_factory("evolution.player.dummy_player:DummyPlayer"), DummyPlayer)
+        with self.assertRaises(ValueError):
+            get_factory("nobody")
+        with self.assertRaises(ValueError):
+            get_factory("evolution.player.dummy_player:Nobody")
+
+    def test_seatings(self):
+        games = list(seatings(["a", "a", "b"], 5))
+        self.assertEqual([game for game, _ in games], [0, 1, 2, 3, 4])
+        self.assertEqual([seating for _, seating in games],
+                         [("a", "a", "b"), ("a", "b", "a"), ("b", "a", "a"), ("a", "a", "b"), ("a", "b", "a")])
+
+    def test_statistics(self):
+        statistics = TournamentStatistics()
+        statistics.add({"game": 0, "seating": ["a", "b", "b"], "ranking": [[2, "b", 5], [3, "b", 5], [1, "a", 2]]})
+        statistics.add({"game": 1, "seating": ["b", "a", "b"], "ranking": [[2, "a", 4], [1, "b", 3]]})
+
+        summary = statistics.summary()
+        self.assertEqual(summary["a"]["seats"], 2)
+        self.assertEqual(summary["a"]["wins"], 1)
+        self.assertEqual(summary["a"]["win-rate"], 0.5)
+        self.assertEqual(summary["a"]["mean-score"], 3)
+        self.assertEqual(summary["a"]["scores"], {"2": 1, "4": 1})
+        self.assertEqual(summary["b"]["seats"], 4)
+        self.assertEqual(summary["b"]["wins"], 1)
+        self.assertEqual(summary["b"]["win-rate"], 0.25)
+        self.assertEqual(summary["b"]["scores"], {"3": 1, "5": 2})
+
+    def test_run_tournament(self):
+        lineup = ["dummy", "dummy", "dummy", "dummy"]
+        output = StringIO()
+        statistics = run_tournament(lineup, 7, output, workers=2, batch_size=2)
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(result["game"] for result in results), list(range(7)))
+        self.assertEqual(statistics.games, 7)
+        self.assertEqual(statistics.seats["dummy"], 28)
+
+        # games are deterministic, the results match games played in this process
+        for result in results:
+            self.assertEqual(result["ranking"], play_game(result["seating"]))
+
+    def test_play_game_resumes_checkpoint(self):
+        seating = ["dummy", "dummy", "dummy", "dummy"]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "game-0.ckpt")
+
+            # a game that stopped after its first turn
+            dealer = Dealer()
+            dealer.add_external_players([DummyPlayer(idx + 1) for idx in range(4)])
+            dealer.deck = Deck(sorted(DataDefinitions.deck()))
+            dealer.take_turn()
+            dealer.players = dealer.players[1:] + dealer.players[:1]
+            dealer.turn = 1
+            with CheckpointWriter(path) as checkpoints:
+                checkpoints.save(dealer)
+
+            self.assertEqual(play_game(seating, path), play_game(seating))
+            self.assertFalse(os.path.exists(path))
+
+    def test_run_tournament_finished(self):
+        lineup = ["dummy", "dummy", "strategy"]
+        finished = [{"game": game, "seating": list(seating), "ranking": play_game(seating)}
+                    for game, seating in seatings(lineup, 2)]
+
+        output = StringIO()
+        with tempfile.TemporaryDirectory() as directory:
+            statistics = run_tournament(lineup, 5, output, workers=2, batch_size=2, checkpoint_dir=directory,
+                                        finished=finished)
+            self.assertEqual(os.listdir(directory), [])
+
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual(sorted(result["game"] for result in results), [2, 3, 4])
+        self.assertEqual(statistics.games, 5)
+
+    def test_read_results(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "results.jsonl")
+            with open(path, "w") as f:
+                f.write('{"game": 0, "seating": [], "ranking": []}\n{"game": 1, "seat')
+            self.assertEqual(read_results(path), [{"game": 0, "seating": [], "ranking": []}])
@@ -0,0 +1,275 @@
+"""
+    Runs a tournament of Evolution games across a pool of processes.
+
+    A tournament is played by a lineup of 3 to 8 player factories, e.g. "dummy dummy strategy strategy".
+    Every game seats the lineup in a different permutation, cycling through all distinct seatings. Games are
+    simulated in batches by worker processes, each game is written to the results file as soon as its batch
+    completes and the win rates and score distributions of each factory are printed at the end.
+
+    A factory is either one of the names in FACTORIES or an import path "package.module:Name" of a callable
+    that takes the player id and returns an ExternalPlayer.
+
+    The results file contains one JSON object per line:
+        {"game": Natural, "seating": [Factory, ...], "ranking": [[Natural, Factory, Natural], ...]}
+    where the ranking lists the player id, factory and score of each player from first to last place.
+
+    With a checkpoint directory, every game in progress is checkpointed at its turn boundaries, see
+    CheckpointWriter. A tournament that was interrupted is resumed with --resume: the games in the results file are
+    not played again and the games that were in progress continue from their last checkpoint.
+
+"""
+
+import os
+import json
+import importlib
+
+from argparse import ArgumentParser
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import permutations
+
+from evolution.dealer.checkpoint import CheckpointWriter
+from evolution.dealer.dealer import Dealer
+from evolution.player.dummy_player import DummyPlayer
+from evolution.player.strategy_player import StrategyPlayer
+
+
+PLAYERS_MIN = 3
+PLAYERS_MAX = 8
+
+FACTORIES = {
+    "dummy": DummyPlayer,
+    "strategy": StrategyPlayer,
+}
+
+# number of games simulated by a worker per task
+BATCH_SIZE = 50
+# number of turns between the checkpoints of a game
+CHECKPOINT_EVERY = 1
+
+
+def get_factory(name):
+    """ Returns the player factory with the given name
+    :param name: key of FACTORIES or "package.module:Name"
+    :return: callable that takes a player id and returns an ExternalPlayer
+    :raise: ValueError if the factory does not exist
+    """
+    if name in FACTORIES:
+        return FACTORIES[name]
+
+    module_name, _, attribute = name.partition(":")
+    try:
+        return getattr(importlib.import_module(module_name), attribute)
+    except (ImportError, AttributeError, ValueError):
+        raise ValueError("unknown player factory: {}".format(name))
+
+
+def seatings(lineup, games):
+    """ Generates the seating of each game by cycling through all distinct permutations of the lineup
+    :param lineup: list of factory names
+    :param games: number of games
+    :return: generator of (game number, seating) tuples, where a seating is a tuple of factory names
+    """
+    distinct = sorted(set(permutations(lineup)))
+    for game in range(games):
+        yield game, distinct[game % len(distinct)]
+
+
+def play_game(seating, checkpoint_path=None):
+    """ Plays a complete game with players created by the factories in the given seating
+    :param seating: list of factory names, in turn order
+    :param checkpoint_path: path of the game's checkpoint file, the game continues from the checkpoint if the file
+                            exists and the file is removed when the game is over; None for no checkpoints
+    :return: ranking as a list of [player id, factory name, score] from first to last place
+    """
+    players = [get_factory(name)(idx + 1) for idx, name in enumerate(seating)]
+
+    if checkpoint_path is None:
+        dealer = Dealer()
+        player_ids = dealer.add_external_players(players)
+        dealer.run_game()
+    else:
+        player_ids = [idx + 1 for idx in range(len(players))]
+        with CheckpointWriter(checkpoint_path, CHECKPOINT_EVERY) as checkpoints:
+            if os.path.exists(checkpoint_path):
+                dealer = Dealer.load_checkpoint(checkpoint_path, players)
+                dealer.resume_game(checkpoints)
+            else:
+                dealer = Dealer()
+                dealer.add_external_players(players)
+                dealer.run_game(checkpoints)
+        if os.path.exists(checkpoint_path):
+            os.remove(checkpoint_path)
+
+    names = {idx: name for idx, name in zip(player_ids, seating)}
+    return [[idx, names[idx], score] for idx, score in dealer.ranking()]
+
+
+def checkpoint_path(checkpoint_dir, game):
+    """ Returns the path of the checkpoint file of the given game, or None without a checkpoint directory """
+    return os.path.join(checkpoint_dir, "game-{}.ckpt".format(game)) if checkpoint_dir is not None else None
+
+
+def play_batch(batch, checkpoint_dir=None):
+    """ Plays the given games, used as a task of a worker process
+    :param batch: list of (game number, seating) tuples
+    :param checkpoint_dir: directory of the checkpoint files of the games, or None
+    :return: list of game results as written to the results file
+    """
+    return [{"game": game, "seating": list(seating),
+             "ranking": play_game(seating, checkpoint_path(checkpoint_dir, game))}
+            for game, seating in batch]
+
+
+def batches(iterable, size):
+    """ Splits the given iterable into lists of at most size elements """
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class TournamentStatistics:
+    """ Aggregates the results of games by player factory """
+
+    def __init__(self):
+        self.games = 0
+        self.seats = Counter()
+        self.wins = Counter()
+        self.scores = {}
+
+    def add(self, result):
+        """ Adds the result of a single game. Ties for the first place share the win.
+        :param result: game result as written to the results file
+        """
+        self.games += 1
+        self.seats.update(result["seating"])
+
+        ranking = result["ranking"]
+        if ranking:
+            best = ranking[0][2]
+            winners = [name for _, name, score in ranking if score == best]
+            for name in winners:
+                self.wins[name] += 1 / len(winners)
+
+        for _, name, score in ranking:
+            self.scores.setdefault(name, Counter())[score] += 1
+
+    def win_rate(self, name):
+        """ Returns the fraction of seats of the given factory that won their game """
+        return self.wins[name] / self.seats[name] if self.seats[name] else 0
+
+    def mean_score(self, name):
+        """ Returns the mean score of the given factory over all its seats that finished the game """
+        scores = self.scores.get(name, Counter())
+        finished = sum(scores.values())
+        return sum(score * count for score, count in scores.items()) / finished if finished else 0
+
+    def summary(self):
+        """ Returns a JSON-compatible summary of the tournament
+        :return: {factory: {"seats", "wins", "win-rate", "mean-score", "scores"}}
+        """
+        return {
+            name: {
+                "seats": self.seats[name],
+                "wins": self.wins[name],
+                "win-rate": self.win_rate(name),
+                "mean-score": self.mean_score(name),
+                "scores": {str(score): count for score, count in sorted(self.scores.get(name, {}).items())},
+            }
+            for name in sorted(self.seats)
+        }
+
+
+def run_tournament(lineup, games, output, workers=None, batch_size=BATCH_SIZE, checkpoint_dir=None, finished=None):
+    """ Runs a tournament and streams the result of each game to the given file
+    :param lineup: list of factory names, PLAYERS_MIN to PLAYERS_MAX long
+    :param games: number of games to play
+    :param output: writable text file for the game results
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :param batch_size: number of games per task
+    :param checkpoint_dir: directory for the checkpoints of the games in progress, or None
+    :param finished: list of results of games that were already played, these games are not played again
+    :return: TournamentStatistics
+    """
+    assert len(lineup) in range(PLAYERS_MIN, PLAYERS_MAX + 1), "invalid number of players"
+    for name in lineup:
+        get_factory(name)
+
+    statistics = TournamentStatistics()
+    finished_games = set()
+    for result in finished or []:
+        statistics.add(result)
+        finished_games.add(result["game"])
+
+    remaining = ((game, seating) for game, seating in seatings(lineup, games) if game not in finished_games)
+    with ProcessPoolExecutor(workers) as executor:
+        tasks = [executor.submit(play_batch, batch, checkpoint_dir) for batch in batches(remaining, batch_size)]
+        for task in as_completed(tasks):
+            for result in task.result():
+                output.write(json.dumps(result) + "\n")
+                statistics.add(result)
+            output.flush()
+
+    return statistics
+
+
+def read_results(path):
+    """ Reads the results of the games in the given results file, ignoring a last line that was not completely
+      written
+    :param path: path of the results file
+    :return: list of game results
+    """
+    results = []
+    with open(path) as f:
+        for line in f:
+            try:
+                results.append(json.loads(line))
+            except ValueError:
+                break
+    return results
+
+
+def main(lineup, games, output_path, workers=None, checkpoint_dir=None, resume=False):
+    """ Runs a tournament and prints the statistics of each player factory
+    :param lineup: list of factory names
+    :param games: number of games to play
+    :param output_path: path of the results file
+    :param workers: number of worker processes
+    :param checkpoint_dir: directory for the checkpoints of the games in progress, or None
+    :param resume: if true, continues the tournament in the results file and the checkpoint directory
+    """
+    finished = read_results(output_path) if resume and os.path.exists(output_path) else []
+    if checkpoint_dir is not None:
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+    with open(output_path, "w") as output:
+        for result in finished:
+            output.write(json.dumps(result) + "\n")
+        output.flush()
+        statistics = run_tournament(lineup, games, output, workers, checkpoint_dir=checkpoint_dir, finished=finished)
+
+    print("Games: {}".format(statistics.games))
+    for name, stats in statistics.summary().items():
+        print("{}\tseats: {}\twin rate: {:.3f}\tmean score: {:.2f}".format(
+            name, stats["seats"], stats["win-rate"], stats["mean-score"]))
+
+
+if __name__ == "__main__":
+
+    parser = ArgumentParser(description="Simulates a tournament of Evolution games")
+    parser.add_argument("lineup", nargs="+",
+                        help="player factories, one per seat: {} or package.module:Name".format(", ".join(FACTORIES)))
+    parser.add_argument("-n", "--games", type=int, default=1000, help="number of games to play")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("-o", "--output", default="tournament.jsonl", help="file to write the game results to")
+    parser.add_argument("-c", "--checkpoints", default=None, help="directory for checkpoints of the games in progress")
+    parser.add_argument("-r", "--resume", action="store_true",
+                        help="continue the tournament in the results file instead of starting over")
+    args = parser.parse_args()
+
+    main(args.lineup, args.games, args.output, args.workers, args.checkpoints, args.resume)